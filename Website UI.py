@@ -1,47 +1,132 @@
 import streamlit as st
 import pyodbc
 import pandas as pd
+from db_pool import ConnectionPool, build_conn_str
+from query_cache import QueryCache
+from query_metrics import QueryStats, StatsPublisher, frame_bytes
+from availability import AvailabilityEngine
+from catalog_replica import CatalogReplicator, CatalogSnapshot
+from inquiry_spool import InquirySpool, InquiryWriter
+from datetime import date, timedelta
 
 # --- 1. DATABASE CONFIGURATION ---
 SERVER = 'DESKTOP-HL2SR3H'
 DATABASE = 'grand_perl'
 
+# Catalog data changes maybe weekly; TTLs are a backstop, admin writes invalidate sooner
+ROOMS_TTL = 600
+OUTLETS_TTL = 3600
+SPA_TTL = 3600
+# Availability older than this (seconds) is labelled with its age
+STALE_AFTER = 300
+
+@st.cache_resource
+def get_pool():
+    # Shared across all visitors; the public site never sets session context
+    return ConnectionPool(lambda: pyodbc.connect(build_conn_str(SERVER, DATABASE)), max_size=4)
+
+@st.cache_resource
+def get_query_stats():
+    # Published to logs/ for the admin Performance page; this process has no page of its own
+    stats = QueryStats(app='website')
+    StatsPublisher(stats).start()
+    return stats
+
 # Updated function to support both SELECT and INSERT commands
 def run_query(query, params=None, is_select=True):
     try:
-        conn_str = (
-            f"Driver={{ODBC Driver 18 for SQL Server}};"
-            f"Server={SERVER};"
-            f"Database={DATABASE};"
-            f"Trusted_Connection=yes;"
-            f"Encrypt=yes;"
-            f"TrustServerCertificate=yes;"
-            f"MultipleActiveResultSets=True;"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
+        with get_query_stats().timed(query) as info, get_pool().connection() as conn:
+            cursor = conn.cursor()
             
-        if is_select:
-            df = pd.DataFrame.from_records(cursor.fetchall(), 
-                                           columns=[c[0] for c in cursor.description])
-            conn.close()
-            return df
-        else:
-            conn.commit()
-            conn.close()
-            return True
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+                
+            if is_select:
+                df = pd.DataFrame.from_records(cursor.fetchall(), 
+                                               columns=[c[0] for c in cursor.description])
+                info['rows'], info['bytes'] = len(df), frame_bytes(df)
+                return df
+            else:
+                info['rows'] = cursor.rowcount
+                conn.commit()
+                return True
     except Exception as e:
         st.error(f"Database Error: {e}")
         return None
 
+@st.cache_resource
+def get_cache():
+    return QueryCache(max_entries=64)
+
+# Read-through cache for the catalog queries; `tables` drives invalidation
+def cached_query(query, tables, ttl):
+    return get_cache().get_or_load(query, lambda: run_query(query), ttl, tables)
+
+@st.cache_resource(show_spinner="Loading rooms and availability...")
+def get_replicator():
+    # Copies the catalog and room calendar into the local snapshot in the background.
+    # With no snapshot on disk yet (first start), the first copy is made here,
+    # before the first page is drawn, so visitors are served from it from the start
+    replicator = CatalogReplicator(get_pool())
+    if replicator.digest is None:
+        try:
+            replicator.run_once()
+        except Exception as e:
+            # SQL Server unreachable at startup: the background thread keeps trying
+            replicator.last_error = e
+    return replicator.start()
+
+@st.cache_resource
+def get_snapshot():
+    return CatalogSnapshot()
+
+# Page views read the local snapshot.
+# LIVE FALLBACK: only if no snapshot could be built yet (SQL Server was down at
+# first start, or replica/ is not writable) does a page view query SQL Server,
+# through the read-through cache below.
+def catalog(table, query, ttl):
+    df = get_snapshot().table(table)
+    return df if df is not None else cached_query(query, [table], ttl)
+
+@st.cache_resource
+def get_availability():
+    return AvailabilityEngine(get_pool())
+
+# Free rooms of a type from the snapshot (LIVE FALLBACK: the calendar in SQL Server);
+# None if neither can be loaded
+def rooms_free(type_name, check_in, check_out):
+    free = get_snapshot().free_rooms(type_name, check_in, check_out)
+    if free is not None:
+        return free
+    try:
+        return len(get_availability().ensure_fresh().free_rooms(type_name, check_in, check_out))
+    except Exception:
+        return None
+
+@st.cache_resource
+def get_inquiry_writer():
+    # Inquiries land in a local spool first; this thread batches them into Booking_Inquiries
+    return InquiryWriter(InquirySpool(), get_pool()).start()
+
+# Durably records the inquiry and returns at once; False only if even the spool failed
+def submit_inquiry(service, phone, name):
+    writer = get_inquiry_writer()
+    try:
+        writer.spool.append(service, phone, name)
+    except OSError:
+        # Local disk trouble: fall back to writing straight to the database
+        return bool(run_query("INSERT INTO Booking_Inquiries (ServiceName, GuestPhone, FullName) VALUES (?, ?, ?)",
+                              (service, phone, name), is_select=False))
+    writer.wake()
+    return True
+
 # --- 2. 5-STAR UI STYLING (CSS) ---
 st.set_page_config(page_title="The Grand Pearl | Faisalabad", layout="wide")
 
+get_replicator()
+
 st.markdown("""
     <link href="https://fonts.googleapis.com/css2?family=Playfair+Display:wght@700&family=Poppins:wght@300;400;600&display=swap" rel="stylesheet">
     <style>
@@ -105,7 +190,7 @@ st.divider()
 
 # Rooms Section
 st.header("💎 Signature Suites & Rooms")
-rooms_df = run_query("SELECT TypeName, BasePrice, Description FROM Room_Types")
+rooms_df = catalog("Room_Types", "SELECT TypeName, BasePrice, Description FROM Room_Types", ROOMS_TTL)
 
 if rooms_df is not None and not rooms_df.empty:
     for index, row in rooms_df.iterrows():
@@ -128,14 +213,26 @@ if rooms_df is not None and not rooms_df.empty:
             
             # Form to capture Inquiry including Full Name
             with st.expander(f"Reserve {row['TypeName']}"):
+                today = date.today()
+                stay = st.date_input("Stay Dates", [today, today + timedelta(days=1)], min_value=today, key=f"stay_{index}")
+                if len(stay) == 2 and stay[1] > stay[0]:
+                    free = rooms_free(row['TypeName'], stay[0], stay[1])
+                    if free is None:
+                        st.caption("Live availability is not available right now.")
+                    elif free:
+                        st.success(f"✅ {free} room(s) available for these dates")
+                    else:
+                        st.error("Fully booked for these dates. Leave an inquiry and our staff will try to accommodate you.")
+                    age = get_snapshot().age()
+                    if free is not None and age is not None and age > STALE_AFTER:
+                        st.caption(f"Availability as of {age / 60:.0f} minutes ago.")
+
                 guest_name = st.text_input("Your Full Name", key=f"name_{index}")
                 phone = st.text_input("Mobile Number", key=f"phone_{index}", placeholder="e.g. 03001234567")
                 
                 if st.button("Confirm Booking Inquiry", key=f"btn_{index}"):
                     if guest_name and phone:
-                        # Updated SQL logic to include FullName
-                        insert_query = "INSERT INTO Booking_Inquiries (ServiceName, GuestPhone, FullName) VALUES (?, ?, ?)"
-                        success = run_query(insert_query, (row['TypeName'], phone, guest_name), is_select=False)
+                        success = submit_inquiry(row['TypeName'], phone, guest_name)
                         
                         if success:
                             st.balloons()
@@ -154,14 +251,14 @@ s_col1, s_col2 = st.columns(2)
 with s_col1:
     st.subheader("🍴 Fine Dining")
     # FIXED: Only selecting OutletName to avoid the 'Location' column error
-    rests = run_query("SELECT OutletName FROM Restaurant_Outlets")
+    rests = catalog("Restaurant_Outlets", "SELECT OutletName FROM Restaurant_Outlets", OUTLETS_TTL)
     if rests is not None:
         for _, r in rests.iterrows():
             st.markdown(f"⭐ **{r['OutletName']}**")
 
 with s_col2:
     st.subheader("💆 Spa & Wellness")
-    spas = run_query("SELECT ServiceName, Price FROM Spa_Services")
+    spas = catalog("Spa_Services", "SELECT ServiceName, Price FROM Spa_Services", SPA_TTL)
     if spas is not None:
         for _, s in spas.iterrows():
             st.markdown(f"✨ **{s['ServiceName']}** - PKR {s['Price']:,.0f}")
\ No newline at end of file
@@ -0,0 +1,208 @@
+import streamlit as st
+import pyodbc
+import pandas as pd
+import hashlib
+import os
+import tempfile
+from db_pool import ConnectionPool, build_conn_str
+from auth import SessionStore
+from bulk_io import export_query, parquet_available
+from schema_catalog import SchemaCatalog
+from query_metrics import QueryStats, frame_bytes
+
+# Shared by `databse UI.py` and every module in admin_pages/.
+# Everything behind st.cache_resource lives once per server process, so a page
+# module imported later still finds the pool and catalog the first session
+# started. Engines and background jobs only one page uses (search, rollups,
+# kitchen feed, inventory, audit archive, payroll, console) are imported and
+# cached in that page's module, so the login screen loads none of them.
+
+# --- 1. DATABASE CONFIGURATION ---
+SERVER = 'DESKTOP-HL2SR3H'
+DATABASE = 'grand_perl'
+
+def get_conn():
+    return pyodbc.connect(build_conn_str(SERVER, DATABASE))
+
+@st.cache_resource
+def get_pool():
+    # One pool per server process, shared by every session and rerun
+    return ConnectionPool(get_conn, max_size=8)
+
+def session_context():
+    # FIX: Get the actual logged-in ID. If not logged in, use a 'System' ID (e.g., 0)
+    # Avoid defaulting to 1 if 1 is a real user like 'ahthackes'.
+    # The audit triggers record 0, like no context at all, as UserID NULL (migrations/010)
+    current_uid = st.session_state.get('user_id')
+    
+    if current_uid is None:
+        # If someone is not logged in (like during a failed login), use ID 0
+        current_uid = 0 
+    return {'UserID': current_uid}
+
+@st.cache_resource
+def get_sessions():
+    return SessionStore(get_pool())
+
+@st.cache_resource
+def get_query_stats():
+    return QueryStats(app='admin')
+
+def run_query(query, params=None, is_select=True):
+    try:
+        # Timing covers the pool checkout too, so it is the wall time the page waits
+        with get_query_stats().timed(query) as info:
+            # The pool only re-sends sp_set_session_context when the pooled
+            # connection was last used under a different UserID
+            with get_pool().connection(session_context()) as conn:
+                cursor = conn.cursor()
+                
+                if params: cursor.execute(query, params)
+                else: cursor.execute(query)
+                
+                if is_select:
+                    df = pd.DataFrame.from_records(cursor.fetchall(), 
+                                                   columns=[c[0] for c in cursor.description])
+                    info['rows'], info['bytes'] = len(df), frame_bytes(df)
+                    return df
+                
+                info['rows'] = cursor.rowcount
+                conn.commit()
+                return True
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        return None
+
+# Like run_query, for helpers that drive the cursor themselves (paging, streaming).
+# `label` names the call on the Performance page; keep it short and free of
+# values that change per call, or every call becomes its own entry there
+def run_with_conn(fn, *args, label, **kwargs):
+    try:
+        with get_query_stats().timed(label) as info:
+            with get_pool().connection(session_context()) as conn:
+                res = fn(conn, *args, **kwargs)
+            if isinstance(res, pd.DataFrame):
+                info['rows'], info['bytes'] = len(res), frame_bytes(res)
+            return res
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        return None
+
+FILE_KINDS = ["csv", "parquet"] if parquet_available() else ["csv"]
+
+# Streamlit hands a download to the browser from memory, in one piece, so a
+# prepared export bigger than this is refused instead of offered
+EXPORT_LIMIT_MB = 200
+
+@st.fragment
+def export_download(query, params, name, key):
+    # Streams the result to a temp file batch by batch, then offers it for download.
+    # A fragment, so picking a format or preparing the file leaves the page above alone
+    fmt = st.radio("Format", FILE_KINDS, horizontal=True, key=f"fmt_{key}")
+    if st.button("Prepare Export", key=f"export_{key}"):
+        out = tempfile.TemporaryFile()
+        status = st.empty()
+        n = run_with_conn(export_query, query, params, out, fmt, label=f"export {name}",
+                          on_progress=lambda done: status.caption(f"{done:,} rows written..."))
+        if n is None:
+            out.close()
+            return
+        size = os.fstat(out.fileno()).st_size
+        if size > EXPORT_LIMIT_MB * 1024 * 1024:
+            out.close()
+            status.error(f"{n:,} rows come to {size / 1048576:,.0f} MB, over the {EXPORT_LIMIT_MB} MB a download "
+                         f"can hold. Export fewer columns or a shorter range.")
+            return
+        status.caption(f"{n:,} rows ready ({size / 1048576:,.1f} MB).")
+
+        def read():
+            # Called when the button is clicked, so the file is only read into
+            # memory if someone actually downloads it
+            out.seek(0)
+            return out.read()
+        mime = "text/csv" if fmt == "csv" else "application/octet-stream"
+        st.download_button(f"⬇️ Download {name}.{fmt}", read, file_name=f"{name}.{fmt}", mime=mime, key=f"dl_{key}")
+
+@st.fragment
+def frame_download(df, name, key):
+    # For a frame the page already holds in memory (an engine's snapshot): no query
+    fmt = st.radio("Format", FILE_KINDS, horizontal=True, key=f"fmt_{key}")
+
+    def serialize():
+        # Only on click, not on every rerun that draws the button
+        if fmt == "csv":
+            return df.to_csv(index=False).encode("utf-8")
+        return df.to_parquet(index=False)
+    mime = "text/csv" if fmt == "csv" else "application/octet-stream"
+    st.download_button(f"⬇️ Download {name}.{fmt}", serialize, file_name=f"{name}.{fmt}", mime=mime, key=f"dl_{key}")
+
+# Explorer metadata (tables, columns, keys, row estimates) without a data query
+@st.cache_resource
+def get_catalog():
+    return SchemaCatalog(get_pool())
+
+def catalog_call(method, *args):
+    try:
+        return getattr(get_catalog(), method)(*args)
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        return None
+
+INT_TYPES = ('tinyint', 'smallint', 'int', 'bigint')
+
+def field_input(col, table, label, key):
+    # Foreign keys into small tables get a dropdown; blank means NULL where allowed
+    options = catalog_call('lookup', table, col['name'])
+    if options:
+        choices = ([(None, "(none)")] if col['nullable'] else []) + options
+        return st.selectbox(label, choices, format_func=lambda o: o[1], key=key)[0]
+    value = st.text_input(label, key=key)
+    return None if value == "" and col['nullable'] else value
+
+def key_inputs(entry, action, key):
+    # One input per primary-key column
+    values = []
+    for name in entry['pk']:
+        col = next(c for c in entry['columns'] if c['name'] == name)
+        label = f"{name} of the Row to {action}"
+        if col['type'] in INT_TYPES:
+            values.append(st.number_input(label, step=1, key=f"{key}_{name}"))
+        else:
+            values.append(st.text_input(label, key=f"{key}_{name}"))
+    return values
+
+SEARCH_PAGE = 25
+
+def fetch_by_ids(sql, ids):
+    # IN list padded to the page size, so every page reuses one cached plan
+    ids = list(ids) + [ids[0]] * (SEARCH_PAGE - len(ids))
+    return run_query(sql.format(ids=", ".join("?" * SEARCH_PAGE)), ids)
+
+# Small lists behind dropdowns (departments, roles, outlets, usernames).
+# Shared by every session for a few minutes, so a widget change reruns without
+# asking the database again; pages that write these tables call clear_lookups().
+@st.cache_data(ttl=300, show_spinner=False)
+def _lookup(query):
+    with get_query_stats().timed(query) as info:
+        with get_pool().connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            df = pd.DataFrame.from_records(cursor.fetchall(), columns=[c[0] for c in cursor.description])
+            info['rows'], info['bytes'] = len(df), frame_bytes(df)
+            return df
+
+def lookup(query):
+    # Errors are shown, not cached, so the next rerun tries again
+    try:
+        return _lookup(query)
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        return None
+
+USERS = "SELECT Username FROM System_Users ORDER BY Username"
+
+def clear_lookups():
+    _lookup.clear()
+
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
@@ -0,0 +1,31 @@
+import importlib
+
+# Pages of the admin app, one module each.
+# `databse UI.py` only draws the login and the sidebar; the chosen page's
+# module is imported the first time someone opens it and stays in sys.modules
+# after that, so a rerun pays for neither the other pages' imports nor their
+# queries. Every module has render().
+
+PAGES = {
+    "📁 Table Explorer": "table_explorer",
+    "📊 Quick Insights": "quick_insights",
+    "🍳 Kitchen Display": "kitchen_display",
+    "📞 Guest Inquiries": "guest_inquiries",
+    "👤 User Management": "user_management",
+    "📈 Executive Dashboard": "executive_dashboard",
+    "🛡️ Security Logs": "security_logs",
+    "💰 Payroll": "payroll",
+    "🛠️ SQL Console": "console",
+    "⏱️ Performance": "performance",
+}
+
+# Everyone else sees only these
+STAFF_PAGES = ["📁 Table Explorer", "📊 Quick Insights", "🍳 Kitchen Display"]
+
+
+def nav_options(role):
+    return list(PAGES) if role == "SuperAdmin" else list(STAFF_PAGES)
+
+
+def render(choice):
+    importlib.import_module(f"{__name__}.{PAGES[choice]}").render()
@@ -0,0 +1,93 @@
+import streamlit as st
+import pandas as pd
+import pyodbc
+from admin_common import DATABASE, SERVER, get_catalog, get_query_stats
+from db_pool import build_conn_str
+from sql_console import MAX_ROWS, STATEMENT_TIMEOUT, ConsoleRunner, console_conn_str, is_ddl
+
+
+@st.cache_resource
+def get_console():
+    # SQL Console commands run here, each on its own connection, never on the script thread
+    return ConsoleRunner(lambda: pyodbc.connect(console_conn_str(build_conn_str(SERVER, DATABASE))),
+                         workers=4, stats=get_query_stats())
+
+
+def render():
+    st.title("🛠️ SQL Console")
+    console = get_console()
+    cmd = st.text_area("Command", key="console_sql")
+    timeout = st.number_input("Timeout (seconds)", min_value=5, max_value=3600, value=STATEMENT_TIMEOUT, step=5)
+    st.caption(f"Results stop at {MAX_ROWS:,} rows; the rest of the command is cancelled and all of it rolled back.")
+    b1, b2, _ = st.columns([1, 1, 4])
+
+    if b1.button("🔍 Estimate Plan", disabled=not cmd.strip()):
+        try:
+            statements, operators = console.estimate(cmd, timeout)
+            c1, c2 = st.columns(2)
+            c1.metric("Estimated Cost", f"{sum(x['cost'] for x in statements):,.2f}")
+            c2.metric("Estimated Rows", f"{sum(x['rows'] for x in statements):,.0f}")
+            st.dataframe(pd.DataFrame(statements), use_container_width=True, hide_index=True)
+            if operators:
+                st.caption("Costliest operators")
+                st.dataframe(pd.DataFrame(operators).sort_values('cost', ascending=False).head(15),
+                             use_container_width=True, hide_index=True)
+        except Exception as e:
+            st.error(f"⚠️ Database Error: {e}")
+
+    if b2.button("▶️ Run", type="primary", disabled=not cmd.strip()):
+        job = console.submit(cmd, st.session_state.user, st.session_state.get('user_id'), timeout)
+        st.session_state.console_job = job.id
+
+    current = console.job(st.session_state.get('console_job'))
+
+    @st.fragment(run_every=1 if current is not None and current.active else None)
+    def console_job():
+        # Rows so far while it runs; the page reruns once when it finishes
+        job = console.job(st.session_state.get('console_job'))
+        if job is None:
+            return
+        st.markdown(f"**Job #{job.id}** · `{job.status}` · {job.rows:,} rows · {job.elapsed():.1f} s"
+                    + (f" · session {job.spid}" if job.spid else ""))
+        if job.active and st.button("⏹️ Cancel"):
+            job.cancel()
+        for res in list(job.results):
+            st.dataframe(pd.DataFrame(list(res['rows']), columns=res['columns']), use_container_width=True)
+            if res['truncated']:
+                st.caption(f"Stopped at {MAX_ROWS:,} rows.")
+        if job.status == 'truncated':
+            st.warning("The row cap cut this command short: statements after this result did not run, "
+                       "and the changes of those before it were rolled back.")
+        if job.rowcounts:
+            st.success(f"{sum(job.rowcounts):,} rows affected.")
+        if job.error is not None:
+            st.error(f"⚠️ {job.status.capitalize()}: {job.error}")
+        if not job.active and st.session_state.get('console_done') != job.id:
+            st.session_state.console_done = job.id
+            if job.status == 'done' and is_ddl(job.sql):
+                get_catalog().invalidate()
+            st.rerun()
+
+    console_job()
+
+    with st.expander("🖥️ Database Sessions"):
+        session_list(console)
+
+
+@st.fragment
+def session_list(console):
+    # Showing, picking and killing sessions reruns only this list
+    if st.checkbox("Show running sessions"):
+        try:
+            columns, rows = console.sessions()
+            sessions = pd.DataFrame.from_records(rows, columns=columns)
+            st.dataframe(sessions, use_container_width=True, hide_index=True)
+            if not sessions.empty:
+                labels = {r.session_id: f"{r.session_id} · {r.login_name} · {r.program_name or ''}"
+                          for r in sessions.itertuples()}
+                victim = st.selectbox("Session", list(labels), format_func=labels.get)
+                if st.button("💀 Kill Session", type="primary"):
+                    console.kill(victim)
+                    st.warning(f"Session {victim} killed; its open transaction is rolled back.")
+        except Exception as e:
+            st.error(f"⚠️ Database Error: {e}")
@@ -0,0 +1,64 @@
+import streamlit as st
+import pandas as pd
+from admin_common import get_pool
+from dashboard_snapshot import DashboardSnapshot
+from rollups import RollupJob
+
+
+@st.cache_resource
+def get_rollup_job():
+    # Keeps the Daily_* rollup tables current for the dashboard and sales reports
+    return RollupJob(get_pool(), every=60).start()
+
+
+@st.cache_resource
+def get_dashboard():
+    # KPIs are refreshed on a background thread; page renders read the last snapshot
+    get_rollup_job()
+    return DashboardSnapshot(get_pool(), refresh_every=30).start()
+
+
+def render():
+    st.title("📈 Executive Analytics")
+    dash = get_dashboard()
+    try:
+        snap = dash.latest()
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        st.stop()
+    if dash.last_error is not None:
+        st.warning(f"Showing the last good snapshot; refresh failed: {dash.last_error}")
+    rollup = get_rollup_job()
+    if rollup.last_error is not None:
+        st.warning(f"Daily rollups are not refreshing; past days may be stale: {rollup.last_error}")
+    st.caption(f"Snapshot as of {snap['as_of']:%H:%M:%S}")
+    m1, m2, m3, m4 = st.columns(4)
+
+    m1.metric("Total Revenue", f"PKR {snap['revenue']:,.0f}",
+              help="Check-outs count on their ActualCheckOut date; one without an ActualCheckOut is not counted.")
+
+    rate = (snap['rooms_occupied'] / snap['rooms_total']) * 100 if snap['rooms_total'] else 0
+    m2.metric("Occupancy", f"{rate:.1f}%")
+
+    m3.metric("Total Guests", snap['guests'])
+    m4.metric("Pending Tasks", snap['pending_tasks'])
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader("Food Sales (Top 5)")
+        food = pd.DataFrame(snap['food_top5'], columns=['ItemName', 'Sales'])
+        if not food.empty: st.bar_chart(food.set_index('ItemName'))
+    with c2:
+        st.subheader("Revenue by Outlet")
+        out = pd.DataFrame(snap['outlet_revenue'], columns=['OutletName', 'Rev'])
+        if not out.empty: st.area_chart(out.set_index('OutletName'))
+
+    c3, c4 = st.columns(2)
+    with c3:
+        st.subheader("Sales by Menu Category")
+        cat = pd.DataFrame(snap['category_sales'], columns=['CategoryName', 'Sales'])
+        if not cat.empty: st.bar_chart(cat.set_index('CategoryName'))
+    with c4:
+        st.subheader("Room Revenue by Type")
+        rooms = pd.DataFrame(snap['room_type_revenue'], columns=['TypeName', 'Rev'])
+        if not rooms.empty: st.bar_chart(rooms.set_index('TypeName'))
@@ -0,0 +1,66 @@
+import streamlit as st
+import pandas as pd
+from admin_common import SEARCH_PAGE, catalog_call, fetch_by_ids, get_pool, run_query
+from search_index import GUEST, INQUIRY, SOURCE_NAMES, SearchIndex, SearchSync
+
+
+@st.cache_resource
+def get_search():
+    # Guest / lead search index, filled and kept current on a background thread
+    return SearchSync(SearchIndex(), get_pool(), every=5).start()
+
+
+def render():
+    st.title("📞 Guest Booking Inquiries")
+    st.subheader("Manage leads captured from the Faisalabad public website")
+
+    sync = get_search()
+    if sync.last_error is not None:
+        st.warning(f"Search index is not updating: {sync.last_error}")
+    elif not sync.loaded:
+        st.info(f"Search index is still loading ({len(sync.index):,} records so far); results may be incomplete.")
+    leads = catalog_call('table', 'Booking_Inquiries')
+    st.metric("Total Active Leads", f"{leads['rows']:,}" if leads else "-")
+    lead_search(sync)
+
+
+@st.fragment
+def lead_search(sync):
+    # Indexed search over inquiries and guests; only the shown page is read from SQL.
+    # Typing a search or turning a page reruns just this fragment.
+    search = st.text_input("🔍 Search by Name, Phone, Email or ID Number")
+    scope = st.radio("Search in", ["Inquiries", "Guests", "Both"], horizontal=True)
+    page_no = st.number_input("Page", min_value=1, value=1, step=1, key=f"lead_page_{search}_{scope}")
+    offset = (page_no - 1) * SEARCH_PAGE
+
+    if search:
+        source = {"Inquiries": INQUIRY, "Guests": GUEST}.get(scope)
+        total, hits = sync.index.search(search, limit=SEARCH_PAGE, offset=offset, source=source)
+        st.caption(f"{total:,} matches · page {page_no} of {max(1, -(-total // SEARCH_PAGE))}")
+        rows = {}
+        inq_ids = [i for src, i, _ in hits if src == INQUIRY]
+        guest_ids = [i for src, i, _ in hits if src == GUEST]
+        if inq_ids:
+            df = fetch_by_ids("SELECT InquiryID, FullName, GuestPhone, ServiceName, BookingDate "
+                              "FROM Booking_Inquiries WHERE InquiryID IN ({ids})", inq_ids)
+            for r in (df.itertuples(index=False) if df is not None else []):
+                rows[(INQUIRY, r.InquiryID)] = (r.FullName, r.GuestPhone, None, None, r.ServiceName, r.BookingDate)
+        if guest_ids:
+            df = fetch_by_ids("SELECT GuestID, FirstName, LastName, Phone, Email, Identity_No "
+                              "FROM Guests WHERE GuestID IN ({ids})", guest_ids)
+            for r in (df.itertuples(index=False) if df is not None else []):
+                rows[(GUEST, r.GuestID)] = (f"{r.FirstName} {r.LastName}", r.Phone, r.Email, r.Identity_No, None, None)
+        found = [(SOURCE_NAMES[src], i) + rows[(src, i)] for src, i, _ in hits if (src, i) in rows]
+        if found:
+            st.dataframe(pd.DataFrame(found, columns=['Source', 'ID', 'Name', 'Phone', 'Email', 'Identity_No', 'Service', 'BookingDate']),
+                         use_container_width=True, hide_index=True)
+        else:
+            st.info("No matching guests or inquiries.")
+    else:
+        query = """SELECT InquiryID, FullName, GuestPhone, ServiceName, BookingDate FROM Booking_Inquiries
+                   ORDER BY BookingDate DESC, InquiryID DESC OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"""
+        df_inquiry = run_query(query, (offset, SEARCH_PAGE))
+        if df_inquiry is not None and not df_inquiry.empty:
+            st.dataframe(df_inquiry, use_container_width=True)
+        else:
+            st.info("No guest inquiries found in the database yet.")
@@ -0,0 +1,60 @@
+import streamlit as st
+import pandas as pd
+from admin_common import get_pool, lookup
+from kitchen_feed import KitchenFeed
+
+
+@st.cache_resource
+def get_kitchen_feed():
+    # One delta poller per process, shared by every kitchen screen
+    return KitchenFeed(get_pool(), every=3).start()
+
+
+def render():
+    st.title("🍳 Kitchen Display")
+    feed = get_kitchen_feed()
+    try:
+        feed.ensure_loaded()
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        st.stop()
+    outlets = lookup("SELECT OutletName FROM Restaurant_Outlets ORDER BY OutletName")
+    outlet = st.selectbox("Outlet", ["All Outlets"] + (outlets['OutletName'].tolist() if outlets is not None else []))
+
+    @st.fragment(run_every=3)
+    def kitchen_board():
+        # Reads the shared in-memory board; only the poller thread touches the database
+        version, lines = feed.board(None if outlet == "All Outlets" else outlet)
+        seen = st.session_state.get('kitchen_version')
+        if seen != version:
+            # Orders changed since this screen last drew stay highlighted until the next change
+            fresh = feed.changed_since(seen) if seen is not None else set()
+            st.session_state.kitchen_new = fresh or set()
+            st.session_state.kitchen_version = version
+        new = st.session_state.get('kitchen_new', set())
+
+        if feed.last_error is not None:
+            st.warning(f"Showing the last good board; refresh failed: {feed.last_error}")
+        k1, k2, k3 = st.columns(3)
+        k1.metric("Open Orders", len({l['OrderID'] for l in lines}))
+        k2.metric("Items", sum(l['Qty'] for l in lines))
+        k3.metric("Oldest (min)", max((l['Minutes_Elapsed'] for l in lines), default=0))
+        if not lines:
+            st.info("No open tickets.")
+            return
+
+        cols = ['OrderID', 'OutletName', 'TableNo', 'ItemName', 'Qty', 'CookingStatus', 'Minutes_Elapsed']
+        df = pd.DataFrame(lines, columns=cols)
+        if outlet != "All Outlets":
+            df = df.drop(columns='OutletName')
+
+        def mark(row):
+            style = []
+            if row['OrderID'] in new:
+                style.append('background-color: #fff3b0')
+            if row['Minutes_Elapsed'] > 20:
+                style.append('color: #c0392b; font-weight: bold')
+            return ['; '.join(style)] * len(row)
+        st.dataframe(df.style.apply(mark, axis=1), use_container_width=True, hide_index=True)
+
+    kitchen_board()
@@ -0,0 +1,62 @@
+import streamlit as st
+from datetime import date
+from admin_common import get_catalog, get_pool, session_context
+from payroll import Payroll
+
+
+@st.cache_resource
+def get_payroll():
+    # Month-close payroll; large staffs are computed over a process pool
+    return Payroll(get_pool())
+
+
+def months(count=12):
+    # 'YYYY-MM' for this month and the ones before it, newest first
+    today = date.today()
+    return [f"{(today.year * 12 + today.month - 1 - i) // 12}-{(today.month - 1 - i) % 12 + 1:02d}" for i in range(count)]
+
+
+def totals(slips):
+    p1, p2, p3, p4 = st.columns(4)
+    p1.metric("Employees", len(slips))
+    p2.metric("Net Pay", f"{slips['NetPay'].astype(float).sum():,.2f}")
+    p3.metric("Deductions", f"{slips['Deductions'].astype(float).fillna(0).sum():,.2f}")
+    p4.metric("Overtime Pay", f"{slips['OvertimePay'].astype(float).fillna(0).sum():,.2f}")
+
+
+def render():
+    st.title("💰 Payroll")
+    payroll = get_payroll()
+    month = st.selectbox("Month", months())
+    c1, c2 = st.columns(2)
+    preview = c1.button("Preview")
+    run = c2.button("Run Payroll", type="primary")
+
+    try:
+        if preview:
+            slips = payroll.preview(month)
+            st.info("Preview only; nothing was written.")
+            totals(slips)
+            st.dataframe(slips, use_container_width=True, hide_index=True)
+            return
+        if run:
+            with st.spinner("Computing slips..."):
+                slips, counts = payroll.run(month, session_context())
+            get_catalog().changed('Salary_Slips')
+            st.success(f"✅ {month}: {counts['inserted']} slips added, {counts['updated']} updated, {counts['removed']} removed.")
+            if counts['skipped']:
+                st.warning(f"{counts['skipped']} employee(s) already have a hand-entered slip for {month}; "
+                           "those slips were left as they are.")
+
+        slips = payroll.slips(month)
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        return
+    if slips.empty:
+        st.info(f"No salary slips for {month} yet.")
+        return
+    totals(slips)
+    hand = int(slips['GeneratedAt'].isna().sum())
+    if hand:
+        st.caption(f"{hand} slip(s) were entered by hand and are not changed by a run.")
+    st.dataframe(slips, use_container_width=True, hide_index=True)
@@ -0,0 +1,38 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from admin_common import get_pool, get_query_stats
+from query_metrics import read_published
+
+COLUMNS = ['fingerprint', 'calls', 'errors', 'total_ms', 'avg_ms', 'p95_ms', 'max_ms', 'rows', 'bytes']
+
+
+def render():
+    st.title("⏱️ Query Performance")
+    stats = get_query_stats()
+    st.caption(f"Since this server process started. Statements over {stats.slow_ms:.0f} ms are also written to logs/slow_queries.log")
+
+    pool = get_pool().stats()
+    p1, p2, p3, p4 = st.columns(4)
+    p1.metric("Pool Connections", f"{pool['in_use']} busy / {pool['size']}")
+    p2.metric("Pool Hit Ratio", f"{pool['hit_ratio'] * 100:.1f}%")
+    p3.metric("Avg Checkout Wait", f"{pool['wait_avg'] * 1000:.2f} ms")
+    p4.metric("Checkout Timeouts", pool['timeouts'])
+
+    st.subheader("Top Queries by Total Time")
+    st.dataframe(pd.DataFrame(stats.top('total_ms'), columns=COLUMNS), use_container_width=True)
+    st.subheader("Top Queries by p95")
+    st.dataframe(pd.DataFrame(stats.top('p95_ms'), columns=COLUMNS), use_container_width=True)
+    if st.button("Reset Statistics"):
+        stats.reset()
+        st.rerun()
+
+    # The website is another process; it publishes its own stats every few seconds
+    st.subheader("Public Website")
+    published, rows = read_published('website')
+    if published is None:
+        st.info("The website has not published any statistics yet.")
+        return
+    st.caption(f"Since the website process started, as of {datetime.fromtimestamp(published):%Y-%m-%d %H:%M:%S}")
+    site = pd.DataFrame(rows, columns=COLUMNS)
+    st.dataframe(site.sort_values('total_ms', ascending=False).head(20), use_container_width=True)
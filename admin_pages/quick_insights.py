@@ -0,0 +1,151 @@
+import streamlit as st
+import pandas as pd
+from datetime import timedelta
+from admin_common import export_download, frame_download, get_catalog, get_pool, lookup, run_query
+from availability import AvailabilityEngine
+from inventory_engine import InventoryEngine
+from reports import DEPARTMENTS, QUICK_INSIGHTS, bind_report
+
+
+@st.cache_resource
+def get_inventory():
+    # In-memory stock ledger; low-stock alerts are kept current between page views
+    return InventoryEngine(get_pool(), every=5).start()
+
+
+@st.cache_resource
+def get_availability():
+    # Reservations as interval arrays: free rooms and double bookings without an overlap query
+    return AvailabilityEngine(get_pool())
+
+
+def render():
+    st.title("📊 Strategic Relational Insights")
+
+    # --- SIDEBAR FILTERS FOR INSIGHTS ---
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("🎯 Report Filters")
+
+    # Date Filter
+    picked = st.sidebar.date_input(
+        "Select Date Range",
+        [pd.to_datetime('2025-01-01'), pd.to_datetime('2026-12-31')]
+    )
+
+    # Department Filter (a cached list, so changing a filter asks the database nothing extra)
+    dept_df = lookup(DEPARTMENTS)
+    all_depts = ["All Departments"] + (dept_df['DeptName'].tolist() if dept_df is not None else [])
+    sel_dept = st.sidebar.selectbox("Filter by Department", all_depts)
+
+    # The picker reruns on the first click of a range, before the end date exists
+    if len(picked) != 2:
+        st.info("Pick the last day of the range too.")
+        return
+    start_date, end_date = picked
+    report(start_date, end_date, sel_dept)
+
+
+@st.fragment
+def report(start_date, end_date, sel_dept):
+    # Switching reports reruns only this fragment; the filters around it stay put
+    insight = st.selectbox("Select Report Category", list(QUICK_INSIGHTS))
+
+    # Dates for the headings only; the SQL gets them as parameters
+    d1, d2 = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+    q, q_params = bind_report(insight, start_date, end_date, sel_dept)
+
+    if insight == "Current Occupancy":
+        st.subheader(f"🛌 Occupancy from {d1} to {d2}")
+        st.dataframe(run_query(q, q_params), use_container_width=True)
+        room_availability(start_date, end_date)
+
+    elif insight == "Guest Service & Preference History":
+        st.subheader("💎 Guest Profile & Service Usage")
+        st.dataframe(run_query(q, q_params), use_container_width=True)
+
+    elif insight == "Room Maintenance & Housekeeping Status":
+        st.subheader(f"🧹 Maintenance Tasks for {sel_dept}")
+        st.dataframe(run_query(q, q_params), use_container_width=True)
+
+    elif insight == "Detailed Restaurant Order Breakdown":
+        st.subheader(f"🍴 Item-wise Sales from {d1} to {d2}")
+        st.caption("Totals per item, outlet and category for the whole range. "
+                   "For each order line with its time, pick Restaurant Order Lines.")
+        st.dataframe(run_query(q, q_params), use_container_width=True)
+
+    elif insight == "Restaurant Order Lines":
+        st.subheader(f"🧾 Order Lines from {d1} to {d2}")
+        st.dataframe(run_query(q, q_params), use_container_width=True)
+
+    elif insight == "Staff Directory & Payroll":
+        st.subheader(f"👥 Employee Hierarchy in {sel_dept}")
+        st.dataframe(run_query(q, q_params), use_container_width=True)
+
+    elif insight == "Low Stock Alerts":
+        low_stock()
+        return
+
+    with st.expander("📤 Export this report"):
+        export_download(q, q_params, insight.replace(" ", "_").replace("&", "and"), key="insight")
+
+
+def room_availability(start_date, end_date):
+    try:
+        engine = get_availability().ensure_fresh()
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        return
+    c1, c2 = st.columns(2)
+    # Every night from the first day through the last
+    free = engine.free_count_by_type(start_date, end_date + timedelta(days=1))
+    c1.caption("Rooms free for every night of the range")
+    c1.dataframe(pd.DataFrame(sorted(free.items()), columns=['TypeName', 'Free Rooms']), hide_index=True)
+    # Current and future stays only; the engine does not hold ones that have ended
+    clashes = engine.overbookings()
+    if clashes:
+        c2.error(f"{len(clashes)} reservations overlap another one on the same room.")
+        c2.dataframe(pd.DataFrame(clashes, columns=['RoomID', 'Holding ResID', 'Overlapping ResID']),
+                     hide_index=True)
+    else:
+        c2.success("No room is booked twice for the same night.")
+
+
+def low_stock():
+    st.subheader("🚨 Inventory Reorder List")
+    inventory = get_inventory()
+    try:
+        inventory.ensure_loaded()
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+    stock = inventory.summary()
+    s1, s2, s3 = st.columns(3)
+    s1.metric("Items Below Minimum", f"{stock['low']:,}", help=f"of {stock['items']:,} stock items")
+    s2.metric("Already on a Draft PO", f"{stock['drafted']:,}")
+    s3.metric("No Purchase History", f"{stock['no_vendor']:,}")
+    data = pd.DataFrame(inventory.alerts(), columns=['StockID', 'ItemName', 'CatName', 'Qty', 'MinQty',
+                                                     'Needed', 'OrderQty', 'Vendor', 'Drafted'])
+    if not data.empty:
+        st.warning("Warning: Stock levels below minimum threshold!")
+    st.dataframe(data, use_container_width=True, hide_index=True)
+    if inventory.last_error:
+        st.caption(f"⚠️ Showing stock as of the last good update: {inventory.last_error}")
+
+    # One draft purchase order per vendor, from each item's most recent supplier
+    if st.button("📝 Draft Purchase Orders", disabled=stock['low'] == stock['drafted']):
+        try:
+            drafted = inventory.draft_orders()
+            if drafted:
+                st.success(f"Drafted {len(drafted)} purchase orders for "
+                           f"{sum(lines for _, lines in drafted.values())} items.")
+                st.dataframe(pd.DataFrame([(v, po, n) for v, (po, n) in sorted(drafted.items())],
+                                          columns=['Vendor', 'PO_ID', 'Items']), hide_index=True)
+                get_catalog().changed('Purchase_Orders', 'PO_Details')
+            else:
+                st.info("Every low item is already on a draft or has no vendor to order from.")
+        except Exception as e:
+            st.error(f"⚠️ Database Error: {e}")
+
+    # The list exactly as shown, from the same snapshot; no query
+    with st.expander("📤 Export this report"):
+        frame_download(data, "Low_Stock_Alerts", key="insight")
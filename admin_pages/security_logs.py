@@ -0,0 +1,76 @@
+import streamlit as st
+from datetime import date, datetime, timedelta
+from admin_common import USERS, catalog_call, get_pool, lookup, run_query
+from audit_archive import AuditArchiver, AuditStore
+from reports import bind_security_log
+
+
+@st.cache_resource
+def get_audit_archiver():
+    # Moves Audit_Logs months older than a year to compressed files, once a day
+    return AuditArchiver(get_pool(), keep_months=12).start()
+
+
+@st.cache_resource
+def get_audit_store():
+    get_audit_archiver()
+    return AuditStore(get_pool())
+
+
+def render():
+    st.title("🛡️ Audit Center")
+
+    # Always a bounded range, so only those months' partitions are read
+    today = date.today()
+    f1, f2, f3 = st.columns(3)
+    picked = f1.date_input("Date Range", [today - timedelta(days=6), today], key="audit_range")
+    users_df = lookup(USERS)
+    user = f2.selectbox("User", ["All Users"] + (users_df['Username'].tolist() if users_df is not None else []))
+    table = f3.selectbox("Table", ["All Tables"] + (catalog_call('tables') or []))
+    user = None if user == "All Users" else user
+    table = None if table == "All Tables" else table
+
+    if len(picked) != 2:
+        st.info("Pick the last day of the range too.")
+    else:
+        start = datetime.combine(picked[0], datetime.min.time())
+        end = datetime.combine(picked[1] + timedelta(days=1), datetime.min.time())
+        tab1, tab2 = st.tabs(["Failed Logins", "Audit Trail"])
+        with tab1:
+            st.table(run_query(*bind_security_log("Failed Logins", start, end)))
+        with tab2:
+            audit_trail(start, end, user, table)
+
+    archive = get_audit_archiver().status()
+    if archive['months']:
+        st.caption(f"🗄️ {archive['rows']:,} older entries archived ({archive['oldest']} to {archive['newest']}); "
+                   "searched automatically when the range reaches them.")
+    if archive['last_error']:
+        st.warning(f"Audit archiving failed on its last run: {archive['last_error']}")
+
+
+@st.fragment
+def audit_trail(start, end, user, table):
+    # One cursor per page shown, so Newer goes back without OFFSET.
+    # Newer / Older rerun only this list, not the failed logins beside it.
+    filters = (start, end, user, table)
+    if st.session_state.get('audit_filters') != filters:
+        st.session_state.audit_filters = filters
+        st.session_state.audit_cursors = [None]
+    cursors = st.session_state.audit_cursors
+    try:
+        page, next_cursor = get_audit_store().page(start, end, cursors[-1], user, table)
+        # No UserID: written by a background job, not a person (migrations/010)
+        page['Username'] = page['Username'].fillna("(system)").replace("", "(system)")
+        st.dataframe(page, use_container_width=True, hide_index=True)
+    except Exception as e:
+        st.error(f"⚠️ Database Error: {e}")
+        next_cursor = None
+    p1, p2, p3 = st.columns([1, 1, 4])
+    if p1.button("⬅️ Newer", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun(scope="fragment")
+    if p2.button("Older ➡️", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun(scope="fragment")
+    p3.caption(f"Page {len(cursors)}")
@@ -0,0 +1,186 @@
+import streamlit as st
+import pandas as pd
+from admin_common import (FILE_KINDS, catalog_call, export_download, field_input, get_catalog, key_inputs,
+                          run_query, run_with_conn)
+from bulk_io import count_rows, import_file, table_export_sql
+from query_cache import signal_change
+from table_pager import fetch_page
+
+FORBIDDEN = ['Audit_Logs', 'Failed_Logins', 'System_Users', 'User_Roles_Security']
+
+
+def render():
+    st.header("📁 Database Table Explorer")
+    search_query = st.text_input("🔍 Search for a table...")
+    all_tables = catalog_call('tables')
+    if all_tables is None:
+        return
+
+    if str(st.session_state.role).strip() != "SuperAdmin":
+        all_tables = [t for t in all_tables if t not in FORBIDDEN]
+    if search_query:
+        all_tables = [t for t in all_tables if search_query.lower() in t.lower()]
+
+    selected_table = st.selectbox("Select Table", all_tables)
+    if not selected_table:
+        return
+    entry = catalog_call('table', selected_table)
+    if not entry:
+        st.stop()
+    all_cols = [c['name'] for c in entry['columns']]
+    shown_cols = st.multiselect("Columns", all_cols, default=all_cols, key=f"cols_{selected_table}")
+    table_grid(selected_table, entry, shown_cols)
+
+    t_add, t_edit, t_del, t_import, t_export = st.tabs(
+        ["➕ Add Record", "📝 Edit Record", "🗑️ Delete Record", "📥 Bulk Import", "📤 Export"])
+
+    editable = {c['name']: c for c in catalog_call('editable_columns', selected_table) or []}
+    # Each form is its own fragment: typing in one reruns that form, not the grid or the others
+    with t_add:
+        add_record(selected_table, editable)
+    with t_edit:
+        edit_record(selected_table, entry, editable)
+    with t_del:
+        delete_record(selected_table, entry)
+    with t_import:
+        bulk_import(selected_table, editable)
+    with t_export:
+        st.subheader(f"Export {selected_table}")
+        st.caption("All rows of the selected columns.")
+        export_download(table_export_sql(selected_table, shown_cols), None, selected_table, key=selected_table)
+
+
+def saved(selected_table):
+    signal_change(selected_table)
+    get_catalog().changed(selected_table)
+
+
+@st.fragment
+def table_grid(selected_table, entry, shown_cols):
+    all_cols = [c['name'] for c in entry['columns']]
+    pk = entry['pk']
+    # Keyset paging needs a one-column key; anything else pages by OFFSET
+    page_key = pk[0] if pk else all_cols[0]
+    keyset = len(pk) == 1
+    est_rows = entry['rows']
+
+    v1, v2, v3, v4 = st.columns([1, 1, 1, 2])
+    page_size = v1.selectbox("Rows per page", [25, 50, 100, 500], index=1)
+
+    # Paging state survives reruns, so typing in the forms below never refetches
+    view = (selected_table, tuple(shown_cols), page_size)
+    pager = st.session_state.get('pager')
+    if pager is None or pager['view'] != view:
+        pager = {'view': view, 'page': 0, 'starts': {0: None}, 'df': None, 'df_page': None}
+        st.session_state.pager = pager
+    total_pages = max(1, -(-est_rows // page_size))
+
+    def move(step):
+        # Runs before the rerun, so the page below is already the new one
+        pager['page'] += step
+
+    jump = v4.number_input(f"Page (of ~{total_pages})", min_value=1, value=pager['page'] + 1, step=1)
+    if jump - 1 != pager['page']:
+        pager['page'] = int(jump) - 1
+
+    page = pager['page']
+    if pager['df_page'] != page:
+        # Keyset when we know where this page starts, OFFSET-FETCH for jumps
+        after = pager['starts'].get(page)
+        if page == 0 or (keyset and after is not None):
+            df = run_with_conn(fetch_page, selected_table, page_key, shown_cols, page_size, after=after,
+                               label=f"table page {selected_table} (keyset)")
+        else:
+            df = run_with_conn(fetch_page, selected_table, page_key, shown_cols, page_size, offset=page * page_size,
+                               label=f"table page {selected_table} (offset)")
+        pager['df'], pager['df_page'] = df, page
+        if keyset and df is not None and not df.empty:
+            pager['starts'][page + 1] = df[page_key].tolist()[-1]
+    df = pager['df']
+    # A short page is the last one, whatever the metadata estimate says
+    last = df is not None and len(df) < page_size
+    v2.button("◀ Prev", disabled=page == 0, on_click=move, args=(-1,), use_container_width=True)
+    v3.button("Next ▶", disabled=last, on_click=move, args=(1,), use_container_width=True)
+
+    st.caption(f"Page {page + 1} · about {est_rows:,} rows (from metadata)")
+    st.dataframe(df, use_container_width=True)
+
+
+@st.fragment
+def add_record(selected_table, editable):
+    st.subheader("Add New Record")
+    form_payload = {c: field_input(col, selected_table, f"Enter {c}", f"add_{selected_table}_{c}")
+                    for c, col in editable.items()}
+    if st.button("Save Record"):
+        cols = ", ".join([f"[{k}]" for k in form_payload.keys()])
+        params = ", ".join(["?" for _ in form_payload])
+        if run_query(f"INSERT INTO [{selected_table}] ({cols}) VALUES ({params})", list(form_payload.values()), False):
+            saved(selected_table)
+            st.session_state.pop('pager', None)
+            st.success("✅ Record Added Successfully!")
+            st.rerun()
+
+
+@st.fragment
+def edit_record(selected_table, entry, editable):
+    st.subheader("Update Existing Record")
+    pk = entry['pk']
+    up_cols = [c for c in editable if c not in pk]
+    if not pk or not up_cols:
+        st.info(f"{selected_table} has no primary key or no editable columns; use the SQL Console.")
+        return
+    up_key = key_inputs(entry, "Update", f"up_{selected_table}")
+    up_col = st.selectbox("Select Column", up_cols)
+    up_val = field_input(editable[up_col], selected_table, "New Value", f"up_val_{selected_table}_{up_col}")
+    if st.button("Apply Update"):
+        where_pk = " AND ".join(f"[{c}] = ?" for c in pk)
+        if run_query(f"UPDATE [{selected_table}] SET [{up_col}] = ? WHERE {where_pk}", (up_val, *up_key), False):
+            saved(selected_table)
+            st.session_state.pop('pager', None)
+            st.success("✅ Record Updated!")
+            st.rerun()
+
+
+@st.fragment
+def delete_record(selected_table, entry):
+    st.subheader("Delete Record")
+    pk = entry['pk']
+    if not pk:
+        st.info(f"{selected_table} has no primary key; use the SQL Console.")
+        return
+    d_key = key_inputs(entry, "Remove", f"del_{selected_table}")
+    if st.button("Permanently Delete", type="primary"):
+        where_pk = " AND ".join(f"[{c}] = ?" for c in pk)
+        if run_query(f"DELETE FROM [{selected_table}] WHERE {where_pk}", tuple(d_key), False):
+            saved(selected_table)
+            st.session_state.pop('pager', None)
+            st.warning("🗑️ Record Deleted.")
+            st.rerun()
+
+
+@st.fragment
+def bulk_import(selected_table, editable):
+    st.subheader("Bulk Import")
+    st.caption("Header row required; columns are matched to the table by name and identity columns are skipped.")
+    upload = st.file_uploader("Data file", type=FILE_KINDS, key=f"import_{selected_table}")
+    if upload is not None and st.button("Import Rows"):
+        total = count_rows(upload, upload.name)
+        bar = st.progress(0.0, text="Importing...")
+
+        def show_progress(r):
+            done = min(r['rows'] / total, 1.0) if total else 0.0
+            bar.progress(done, text=f"{r['rows']:,} rows read · {r['inserted']:,} inserted · {r['error_count']:,} rejected")
+
+        res = run_with_conn(import_file, selected_table, upload, upload.name, label=f"bulk import {selected_table}",
+                            columns=list(editable.values()), on_progress=show_progress)
+        if res is not None:
+            if res['inserted']:
+                saved(selected_table)
+                st.session_state.pop('pager', None)
+            st.success(f"✅ Imported {res['inserted']:,} of {res['rows']:,} rows into {selected_table}.")
+            if res['ignored']:
+                st.info(f"Columns not in {selected_table}, ignored: {', '.join(map(str, res['ignored']))}")
+            if res['error_count']:
+                shown = f" (first {len(res['errors']):,} listed)" if len(res['errors']) < res['error_count'] else ""
+                st.warning(f"{res['error_count']:,} rows were not imported{shown}.")
+                st.dataframe(pd.DataFrame(res['errors'], columns=['Line', 'Error']), use_container_width=True, hide_index=True)
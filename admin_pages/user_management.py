@@ -0,0 +1,84 @@
+import streamlit as st
+from admin_common import USERS, clear_lookups, get_sessions, hash_password, lookup, run_query
+from auth import CHANGE_PASSWORD_SQL, DELETE_USER_SQL
+
+EMPLOYEES = "SELECT EmpID, FullName FROM Employees"
+ROLES = "SELECT SecRoleID, RoleName FROM User_Roles_Security"
+
+
+def render():
+    st.title("👤 System User Administration")
+    # One section at a time: st.tabs would run every tab's queries on each rerun
+    section = st.radio("Section", ["List Users", "Create User", "Change Password", "Delete User"],
+                       horizontal=True, label_visibility="collapsed", key="user_admin_section")
+    {"List Users": list_users, "Create User": create_user,
+     "Change Password": change_password, "Delete User": delete_user}[section]()
+
+
+def list_users():
+    q = "SELECT U.UserID, U.Username, R.RoleName, E.FullName FROM System_Users U JOIN User_Roles_Security R ON U.RoleID = R.SecRoleID JOIN Employees E ON U.EmpID = E.EmpID"
+    st.dataframe(run_query(q), use_container_width=True)
+
+
+@st.fragment
+def create_user():
+    st.subheader("Register New Staff Access")
+    u_name = st.text_input("New Username", key="new_user_input")
+    u_pass = st.text_input("Temporary Password", type="password", key="new_pass_input")
+
+    emp_df = lookup(EMPLOYEES)
+    role_df = lookup(ROLES)
+
+    if emp_df is not None and role_df is not None:
+        e_id_label = st.selectbox("Link to Employee Profile", emp_df['FullName'])
+        r_id_label = st.selectbox("Assign System Role", role_df['RoleName'])
+
+        if st.button("Register User Account"):
+            eid = emp_df[emp_df['FullName'] == e_id_label]['EmpID'].iloc[0]
+            rid = role_df[role_df['RoleName'] == r_id_label]['SecRoleID'].iloc[0]
+            # Hashing password before storage
+            run_query("INSERT INTO System_Users (EmpID, Username, PasswordHash, RoleID) VALUES (?,?,?,?)",
+                      (int(eid), u_name, hash_password(u_pass), int(rid)), False)
+            clear_lookups()
+            st.success(f"✅ Account created for {u_name}")
+            st.rerun()
+
+
+@st.fragment
+def change_password():
+    st.subheader("Reset User Password")
+    user_list = lookup(USERS)
+    if user_list is not None:
+        target_user = st.selectbox("Select User Account", user_list['Username'], key="pass_reset_user")
+        new_pass = st.text_input("Enter New Password", type="password", key="reset_pass_val")
+        confirm_pass = st.text_input("Confirm New Password", type="password", key="reset_pass_conf")
+
+        if st.button("Update Password"):
+            if new_pass == confirm_pass:
+                h_pass = hash_password(new_pass)
+                # New hash and the end of every session of that user, in one transaction
+                if run_query(CHANGE_PASSWORD_SQL, (h_pass, target_user, target_user), is_select=False):
+                    get_sessions().forget_user(target_user)
+                    st.success(f"✅ Password updated for {target_user}; their open sessions were signed out.")
+            else:
+                st.error("❌ Passwords do not match!")
+
+
+@st.fragment
+def delete_user():
+    st.subheader("Terminate User Access")
+    user_list_del = lookup(USERS)
+    if user_list_del is not None:
+        user_to_del = st.selectbox("Select User to Remove", user_list_del['Username'], key="del_user_box")
+        st.warning(f"⚠️ Are you sure you want to permanently delete `{user_to_del}`?")
+
+        if st.button("Confirm Permanent Deletion", type="primary"):
+            # Protection logic to prevent self-deletion
+            if user_to_del == st.session_state.user:
+                st.error("❌ Error: You cannot delete your own account while logged in!")
+            else:
+                if run_query(DELETE_USER_SQL, (user_to_del, user_to_del), is_select=False):
+                    get_sessions().forget_user(user_to_del)
+                    clear_lookups()
+                    st.error(f"🗑️ User account `{user_to_del}` removed.")
+                    st.rerun()
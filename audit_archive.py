@@ -0,0 +1,236 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+import pandas as pd
+
+from reports import AUDIT_PAGE, bind_security_log
+
+# Archival for the month-partitioned Audit_Logs (migrations/007_audit_partitioning.sql).
+# Once a day AuditArchiver makes sure partitions exist for the coming months,
+# then writes every month older than `keep_months` to a gzip CSV in the
+# archive directory (temp file, fsync, rename), records its row count and
+# sha256 in manifest.json, and only then asks sp_Audit_Drop_Month to remove
+# the month. The procedure refuses if the month no longer has exactly the rows
+# written, so nothing is dropped that is not in a file.
+# AuditStore serves the Security Logs page from both: the live table first,
+# then the archived months in the range, newest first, one page at a time.
+
+ARCHIVE_DIR = os.environ.get(
+    'HMS_AUDIT_ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'audit_archive'))
+
+ARCHIVE_COLUMNS = ['LogID', 'UserID', 'Username', 'Action', 'TableAffected', 'LogTime']
+PAGE_COLUMNS = ['LogID', 'LogTime', 'Username', 'Action', 'TableAffected']
+FETCH_BATCH = 5000
+
+COLD_MONTHS_SQL = """SELECT DATEFROMPARTS(YEAR(LogTime), MONTH(LogTime), 1) AS Month, COUNT(*) AS Rows
+FROM Audit_Logs WHERE LogTime < ?
+GROUP BY DATEFROMPARTS(YEAR(LogTime), MONTH(LogTime), 1)
+ORDER BY Month"""
+
+MONTH_SQL = """SELECT a.LogID, a.UserID, u.Username, a.Action, a.TableAffected, a.LogTime
+FROM Audit_Logs a LEFT JOIN System_Users u ON a.UserID = u.UserID
+WHERE a.LogTime >= ? AND a.LogTime < ?
+ORDER BY a.LogTime, a.LogID"""
+
+
+def month_start(d):
+    return date(d.year, d.month, 1)
+
+
+def add_months(d, n):
+    m = d.year * 12 + d.month - 1 + n
+    return date(m // 12, m % 12 + 1, 1)
+
+
+def month_key(d):
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def replace_file(path, data):
+    # Written next to the target and renamed over it, so readers see old or new, never half
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class AuditArchiver:
+    def __init__(self, pool, keep_months=12, directory=ARCHIVE_DIR, every=86400):
+        self.pool = pool
+        self.keep_months = keep_months
+        self.directory = directory
+        self.every = every
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.last_run = None
+        self.last_error = None
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'audit-{key}.csv.gz')
+
+    def cutoff(self, today=None):
+        # First day of the oldest month kept in the table
+        return add_months(month_start(today or date.today()), -self.keep_months)
+
+    def run_once(self, today=None):
+        # -> {month: rows} archived and dropped on this pass
+        done = {}
+        with self._lock, self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("EXEC sp_Audit_Maintain_Partitions")
+            conn.commit()
+            cur.execute(COLD_MONTHS_SQL, (datetime.combine(self.cutoff(today), datetime.min.time()),))
+            months = [(month_start(r[0]), r[1]) for r in cur.fetchall()]
+            for month, _ in months:
+                rows, digest = self._export(cur, month)
+                self._record(month, rows, digest)
+                cur.execute("EXEC sp_Audit_Drop_Month ?, ?", (month, rows))
+                conn.commit()
+                done[month_key(month)] = rows
+        self.last_run = datetime.now()
+        return done
+
+    def _export(self, cur, month):
+        path = self._path(month_key(month))
+        tmp = path + '.tmp'
+        sha = hashlib.sha256()
+        rows = 0
+        cur.execute(MONTH_SQL, (datetime.combine(month, datetime.min.time()),
+                                datetime.combine(add_months(month, 1), datetime.min.time())))
+        with open(tmp, 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as gz:
+                text = io.TextIOWrapper(gz, encoding='utf-8', newline='')
+                writer = csv.writer(text)
+                writer.writerow(ARCHIVE_COLUMNS)
+                while True:
+                    batch = cur.fetchmany(FETCH_BATCH)
+                    if not batch:
+                        break
+                    writer.writerows((r[0], r[1], r[2], r[3], r[4], r[5].isoformat(sep=' ')) for r in batch)
+                    rows += len(batch)
+                text.flush()
+                text.detach()
+            raw.flush()
+            os.fsync(raw.fileno())
+        with open(tmp, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        os.replace(tmp, path)
+        return rows, sha.hexdigest()
+
+    def _record(self, month, rows, digest):
+        manifest = read_manifest(self.directory)
+        manifest[month_key(month)] = {'file': os.path.basename(self._path(month_key(month))),
+                                      'rows': rows, 'sha256': digest,
+                                      'archived_at': datetime.now().isoformat(timespec='seconds')}
+        replace_file(os.path.join(self.directory, 'manifest.json'),
+                     json.dumps(manifest, indent=1, sort_keys=True).encode())
+
+    def status(self):
+        manifest = read_manifest(self.directory)
+        return {'months': len(manifest), 'rows': sum(m['rows'] for m in manifest.values()),
+                'oldest': min(manifest) if manifest else None, 'newest': max(manifest) if manifest else None,
+                'last_run': self.last_run, 'last_error': self.last_error}
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-archiver", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+                self.last_error = None
+            except Exception as e:
+                # A month that failed stays in the table and is retried next time
+                self.last_error = e
+            self._stop.wait(self.every)
+
+
+class AuditStore:
+    def __init__(self, pool, directory=ARCHIVE_DIR, cached_months=4):
+        self.pool = pool
+        self.directory = directory
+        self.cached_months = cached_months
+        self._lock = threading.Lock()
+        self._months = OrderedDict()        # (key, sha256) -> DataFrame, newest first
+
+    def page(self, start, end, before=None, user=None, table=None, limit=AUDIT_PAGE):
+        # -> (DataFrame of PAGE_COLUMNS, cursor for the next page or None)
+        sql, params = bind_security_log("Audit Trail", start, end, before, user, table, limit)
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            rows = [tuple(r) for r in cur.fetchall()]
+        if len(rows) < limit:
+            last = (rows[-1][1], rows[-1][0]) if rows else before
+            rows += self._archived(start, end, last, user, table, limit - len(rows))
+        frame = pd.DataFrame.from_records(rows, columns=PAGE_COLUMNS)
+        more = len(rows) == limit
+        return frame, ((rows[-1][1], rows[-1][0]) if more else None)
+
+    def _archived(self, start, end, before, user, table, limit):
+        manifest = read_manifest(self.directory)
+        out = []
+        for key in sorted(manifest, reverse=True):
+            first = datetime.strptime(key, '%Y-%m')
+            if first >= end or datetime.combine(add_months(first.date(), 1), datetime.min.time()) <= start:
+                continue
+            if before is not None and first > before[0]:
+                continue
+            df = self._month(key, manifest[key])
+            keep = (df['LogTime'] >= start) & (df['LogTime'] < end)
+            if before is not None:
+                keep &= (df['LogTime'] < before[0]) | ((df['LogTime'] == before[0]) & (df['LogID'] < before[1]))
+            if user:
+                keep &= df['Username'] == user
+            if table:
+                keep &= df['TableAffected'] == table
+            hits = df[keep].head(limit - len(out))
+            out += list(hits[PAGE_COLUMNS].itertuples(index=False, name=None))
+            if len(out) >= limit:
+                break
+        return out
+
+    def _month(self, key, entry):
+        # Parsed once and kept for the next few pages, newest first by (LogTime, LogID)
+        cache_key = (key, entry.get('sha256'))
+        with self._lock:
+            if cache_key in self._months:
+                self._months.move_to_end(cache_key)
+                return self._months[cache_key]
+        df = pd.read_csv(os.path.join(self.directory, entry['file']), compression='gzip',
+                         dtype={'Username': str, 'Action': str, 'TableAffected': str},
+                         keep_default_na=False, na_values={'UserID': ['']}, parse_dates=['LogTime'])
+        df = df.sort_values(['LogTime', 'LogID'], ascending=False, ignore_index=True)
+        with self._lock:
+            self._months[cache_key] = df
+            while len(self._months) > self.cached_months:
+                self._months.popitem(last=False)
+        return df
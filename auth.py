@@ -0,0 +1,276 @@
+import hashlib
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Login throttling, session tokens and failed-login logging for the admin gateway.
+# LoginThrottle turns away repeated attempts per username and per IP before
+# they reach the database. SessionStore issues tokens kept in Session_Tokens
+# (only their SHA-256 is stored; the token itself lives only in the browser
+# session's st.session_state) and caches token -> (user, role) in process,
+# so reruns do not repeat the System_Users / User_Roles_Security join; a token
+# revoked from another process stops working within `cache_ttl`.
+# FailedLoginLog buffers failures and writes them in batches, capped per
+# username / IP, so a credential-stuffing burst is not a burst of INSERTs.
+
+
+class TokenBucket:
+    def __init__(self, capacity, refill_per_sec, max_keys=50_000):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.max_keys = max_keys
+        self._buckets = {}              # key -> (tokens, last refill)
+        self._lock = threading.Lock()
+
+    def _level(self, key, now):
+        tokens, last = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - last) * self.refill_per_sec)
+
+    def wait(self, key):
+        # -> 0 if take() would succeed, else seconds until it would; takes nothing
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._level(key, now)
+        return 0 if tokens >= 1 else (1 - tokens) / self.refill_per_sec
+
+    def take(self, key):
+        # -> 0 if allowed, else seconds until the next attempt would be
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._level(key, now)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / self.refill_per_sec
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return 0
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def _prune(self, now):
+        # Full buckets carry no state worth keeping
+        self._buckets = {k: v for k, v in self._buckets.items() if self._level(k, now) < self.capacity}
+
+
+class LoginThrottle:
+    def __init__(self, per_user=(5, 1 / 60), per_ip=(20, 1 / 15)):
+        # (burst, attempts regained per second)
+        self.users = TokenBucket(*per_user)
+        self.ips = TokenBucket(*per_ip)
+        self.rejected = 0
+
+    def check(self, username, ip):
+        # -> 0 if the attempt may go to the database, else seconds to wait.
+        # Only an allowed attempt is charged, so a rejected one never costs
+        # the other bucket (someone else's username, or a shared IP) a token.
+        user = username.strip().lower()
+        wait = max(self.ips.wait(ip), self.users.wait(user))
+        if not wait:
+            wait = max(self.ips.take(ip), self.users.take(user))
+        if wait:
+            self.rejected += 1
+        return wait
+
+    def succeeded(self, username):
+        self.users.reset(username.strip().lower())
+
+
+# Reverse proxies whose X-Forwarded-For is believed, comma-separated (e.g.
+# "127.0.0.1,10.0.0.5"). Anyone can send that header, so from any other peer
+# it is ignored and the throttle keys on the socket address.
+TRUSTED_PROXIES = frozenset(
+    p.strip() for p in os.environ.get('HMS_TRUSTED_PROXIES', '').split(',') if p.strip())
+
+
+def client_address(peer, forwarded, trusted=TRUSTED_PROXIES):
+    # peer: the socket address (None when local); forwarded: the raw header.
+    # A trusted proxy appends the address it saw, so only the rightmost hop is
+    # its own; everything to the left came from the client and can be forged.
+    peer = peer or "127.0.0.1"
+    if peer in trusted:
+        hops = [h.strip() for h in forwarded.split(",") if h.strip()]
+        if hops:
+            return hops[-1]
+    return peer
+
+
+# --- SESSION TOKENS ---
+LOOKUP_SQL = """SELECT U.UserID, U.Username, R.RoleName, DATEDIFF(SECOND, GETDATE(), S.Expiry) AS TTL
+FROM Session_Tokens S
+JOIN System_Users U ON S.UserID = U.UserID
+JOIN User_Roles_Security R ON U.RoleID = R.SecRoleID
+WHERE S.Token = ? AND S.Expiry > GETDATE()"""
+
+ISSUE_SQL = "INSERT INTO Session_Tokens (UserID, Token, Expiry) VALUES (?, ?, DATEADD(SECOND, ?, GETDATE()))"
+
+REVOKE_SQL = "DELETE FROM Session_Tokens WHERE Token = ?"
+
+# Every user's expired tokens; run at most once per SessionStore.purge_every
+PURGE_SQL = "DELETE FROM Session_Tokens WHERE Expiry <= GETDATE()"
+
+# User Management writes. A password change or a deleted account ends every
+# session of that user, in the same transaction as the write (and the
+# Session_Tokens foreign key would refuse the delete otherwise).
+CHANGE_PASSWORD_SQL = """SET NOCOUNT ON;
+UPDATE System_Users SET PasswordHash = ? WHERE Username = ?;
+DELETE FROM Session_Tokens WHERE UserID IN (SELECT UserID FROM System_Users WHERE Username = ?);"""
+
+DELETE_USER_SQL = """SET NOCOUNT ON;
+DELETE FROM Session_Tokens WHERE UserID IN (SELECT UserID FROM System_Users WHERE Username = ?);
+DELETE FROM System_Users WHERE Username = ?;"""
+
+
+def token_hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class SessionStore:
+    def __init__(self, pool, ttl=8 * 3600, cache_ttl=60, max_cached=10_000, purge_every=3600):
+        self.pool = pool
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._purged_at = float('-inf')
+        self.cache_ttl = cache_ttl
+        self.max_cached = max_cached
+        self._cache = {}                # token hash -> (user_id, username, role, expires, checked)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def issue(self, user_id, username, role):
+        token = secrets.token_urlsafe(32)
+        h = token_hash(token)
+        now = time.monotonic()
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(ISSUE_SQL, (user_id, h, self.ttl))
+            if now - self._purged_at >= self.purge_every:
+                self._purged_at = now
+                cur.execute(PURGE_SQL)
+            conn.commit()
+        self._remember(h, (user_id, username, role, now + self.ttl, now))
+        return token
+
+    def resolve(self, token):
+        # -> (user_id, username, role), or None if unknown, expired or revoked
+        if not token:
+            return None
+        h = token_hash(token)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(h)
+        if hit and now < hit[3] and now - hit[4] < self.cache_ttl:
+            self.hits += 1
+            return hit[:3]
+        self.misses += 1
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(LOOKUP_SQL, (h,))
+            row = cur.fetchone()
+        if row is None:
+            with self._lock:
+                self._cache.pop(h, None)
+            return None
+        self._remember(h, (row.UserID, row.Username, row.RoleName, now + row.TTL, now))
+        return row.UserID, row.Username, row.RoleName
+
+    def revoke(self, token):
+        h = token_hash(token)
+        with self._lock:
+            self._cache.pop(h, None)
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(REVOKE_SQL, (h,))
+            conn.commit()
+
+    def forget_user(self, username):
+        # Drop this process's cached sessions of a user whose tokens were just deleted
+        with self._lock:
+            self._cache = {k: v for k, v in self._cache.items() if v[1] != username}
+
+    def _remember(self, h, entry):
+        with self._lock:
+            if len(self._cache) >= self.max_cached:
+                now = time.monotonic()
+                self._cache = {k: v for k, v in self._cache.items()
+                               if now < v[3] and now - v[4] < self.cache_ttl}
+            self._cache[h] = entry
+
+
+# --- FAILED LOGINS ---
+FAILED_LOGIN_SQL = "INSERT INTO Failed_Logins (Username, IP_Address, AttemptTime) VALUES (?, ?, ?)"
+
+
+class FailedLoginLog:
+    def __init__(self, pool, every=5.0, per_key=10, max_buffer=5000):
+        self.pool = pool
+        self.every = every
+        # Rows kept per (username, IP) per flush; the rest are only counted
+        self.per_key = per_key
+        self.max_buffer = max_buffer
+        self._buffer = deque()
+        self._per_key = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.written = 0
+        self.suppressed = 0
+        self.last_error = None
+
+    def record(self, username, ip):
+        key = (username[:50], ip[:45])
+        with self._lock:
+            n = self._per_key.get(key, 0)
+            if n >= self.per_key or len(self._buffer) >= self.max_buffer:
+                self.suppressed += 1
+                return
+            self._per_key[key] = n + 1
+            self._buffer.append(key + (datetime.now().replace(microsecond=0),))
+
+    def flush(self):
+        with self._lock:
+            rows = list(self._buffer)
+            self._buffer.clear()
+            self._per_key = {}
+        if not rows:
+            return 0
+        try:
+            with self.pool.connection() as conn:
+                cur = conn.cursor()
+                cur.fast_executemany = True
+                cur.executemany(FAILED_LOGIN_SQL, rows)
+                conn.commit()
+        except Exception:
+            # Put them back for the next pass, still within the buffer cap
+            with self._lock:
+                room = self.max_buffer - len(self._buffer)
+                self._buffer.extendleft(reversed(rows[:room]))
+                self.suppressed += max(len(rows) - room, 0)
+            raise
+        self.written += len(rows)
+        return len(rows)
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="failed-logins", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.every):
+            try:
+                self.flush()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
@@ -0,0 +1,216 @@
+import threading
+import time
+
+import numpy as np
+
+# Room availability over Reservations held as flat NumPy interval arrays.
+# Dates are stored as day numbers, stays as half-open [CheckIn, CheckOut), so
+# a room is busy for a search if any of its reservations has
+#     start < search_end and end > search_start
+# which is one vectorised comparison over every reservation. New bookings are
+# picked up by a cheap ResID > watermark delta; a periodic full reload catches
+# cancellations and edits to existing rows.
+
+# Reservations in these states no longer hold a room
+RELEASED_STATUSES = {'Cancelled', 'Canceled', 'No-Show', 'NoShow'}
+# Rooms in these states cannot be sold whatever the calendar says
+UNSELLABLE_ROOM_STATUSES = {'Maintenance', 'Out of Order', 'Out of Service'}
+
+
+def to_day(d):
+    return int(np.datetime64(d, 'D').astype(np.int64))
+
+
+class AvailabilityEngine:
+    def __init__(self, pool=None, sync_every=15, reload_every=600):
+        self.pool = pool
+        self.sync_every = sync_every
+        self.reload_every = reload_every
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._synced_at = self._loaded_at = float('-inf')
+        self._clear()
+
+    def _clear(self):
+        self.room_ids = np.empty(0, np.int32)
+        self.room_type = np.empty(0, np.int32)
+        self.room_sellable = np.empty(0, bool)
+        self.type_ids = {}             # TypeName -> TypeID
+        self._room_pos = {}            # RoomID -> index into the room arrays
+        self._res_pos = {}             # ResID -> index into the reservation arrays
+        self._res_id = np.empty(0, np.int32)
+        self._res_room = np.empty(0, np.int32)
+        self._start = np.empty(0, np.int32)
+        self._end = np.empty(0, np.int32)
+        self._n = 0
+        self.watermark = 0
+
+    # --- LOADING ---
+    def load_rooms(self, rooms, types=()):
+        # rooms: (RoomID, TypeID, Status) rows, types: (TypeID, TypeName) rows
+        with self._lock:
+            rooms = sorted(rooms)
+            self.room_ids = np.array([r[0] for r in rooms], np.int32)
+            self.room_type = np.array([r[1] if r[1] is not None else -1 for r in rooms], np.int32)
+            self.room_sellable = np.array([r[2] not in UNSELLABLE_ROOM_STATUSES for r in rooms], bool)
+            self._room_pos = {int(r): i for i, r in enumerate(self.room_ids)}
+            self.type_ids = {name: tid for tid, name in types}
+
+    def load_reservations(self, rows):
+        # rows: (ResID, RoomID, CheckInDate, CheckOutDate, Status); replaces everything held
+        with self._lock:
+            rows = [r for r in rows if r[1] in self._room_pos and r[2] is not None and r[3] is not None]
+            n = len(rows)
+            self._n = 0
+            self._reserve(n)
+            if n:
+                ids = np.fromiter((r[0] for r in rows), np.int32, n)
+                start = np.array([r[2] for r in rows], 'datetime64[D]').astype(np.int32)
+                end = np.array([r[3] for r in rows], 'datetime64[D]').astype(np.int32)
+                released = np.fromiter((r[4] in RELEASED_STATUSES for r in rows), bool, n)
+                self._res_id[:n] = ids
+                self._res_room[:n] = np.fromiter((self._room_pos[r[1]] for r in rows), np.int32, n)
+                self._start[:n] = start
+                self._end[:n] = np.where(released, start, end)
+                self.watermark = max(self.watermark, int(ids.max()))
+            self._n = n
+            self._res_pos = dict(zip(self._res_id[:n].tolist(), range(n)))
+
+    def add_reservations(self, rows):
+        with self._lock:
+            for res_id, room_id, check_in, check_out, status in rows:
+                self.add_reservation(res_id, room_id, check_in, check_out, status)
+
+    def add_reservation(self, res_id, room_id, check_in, check_out, status=None):
+        with self._lock:
+            pos = self._room_pos.get(room_id)
+            if pos is None or check_in is None or check_out is None:
+                return
+            start, end = to_day(check_in), to_day(check_out)
+            if status in RELEASED_STATUSES:
+                end = start                     # empty interval, never overlaps
+            i = self._res_pos.get(res_id)
+            if i is None:
+                self._reserve(self._n + 1)
+                i = self._n
+                self._n += 1
+                self._res_pos[res_id] = i
+                self._res_id[i] = res_id
+            self._res_room[i] = pos
+            self._start[i] = start
+            self._end[i] = end
+            self.watermark = max(self.watermark, res_id)
+
+    def release(self, res_id):
+        with self._lock:
+            i = self._res_pos.get(res_id)
+            if i is not None:
+                self._end[i] = self._start[i]
+
+    def _reserve(self, size):
+        # Amortised growth so incremental inserts stay O(1)
+        cap = len(self._res_id)
+        if size <= cap:
+            return
+        new_cap = max(size, cap * 2, 1024)
+        for name in ('_res_id', '_res_room', '_start', '_end'):
+            old = getattr(self, name)
+            grown = np.zeros(new_cap, np.int32)
+            grown[:self._n] = old[:self._n]
+            setattr(self, name, grown)
+
+    # --- DATABASE SYNC ---
+    def reload(self):
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT TypeID, TypeName FROM Room_Types")
+            types = [tuple(r) for r in cur.fetchall()]
+            cur.execute("SELECT RoomID, TypeID, Status FROM Rooms")
+            rooms = [tuple(r) for r in cur.fetchall()]
+            # Stays that ended before yesterday can never block a search
+            cur.execute("""SELECT ResID, RoomID, CheckInDate, CheckOutDate, Status FROM Reservations
+                           WHERE CheckOutDate >= DATEADD(DAY, -1, CAST(GETDATE() AS DATE))""")
+            res = [tuple(r) for r in cur.fetchall()]
+            cur.execute("SELECT ISNULL(MAX(ResID), 0) FROM Reservations")
+            top = cur.fetchone()[0]
+        with self._lock:
+            self.load_rooms(rooms, types)
+            self.load_reservations(res)
+            self.watermark = max(self.watermark, top)
+            self._loaded_at = self._synced_at = time.monotonic()
+
+    def sync(self):
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""SELECT ResID, RoomID, CheckInDate, CheckOutDate, Status FROM Reservations
+                           WHERE ResID > ? ORDER BY ResID""", (self.watermark,))
+            rows = [tuple(r) for r in cur.fetchall()]
+        with self._lock:
+            self.add_reservations(rows)
+            self._synced_at = time.monotonic()
+        return len(rows)
+
+    def ensure_fresh(self):
+        # Only one caller syncs; the rest answer from what is already loaded
+        first = self._loaded_at == float('-inf')
+        if not self._sync_lock.acquire(blocking=first):
+            return self
+        try:
+            now = time.monotonic()
+            if now - self._loaded_at >= self.reload_every:
+                self.reload()
+            elif now - self._synced_at >= self.sync_every:
+                self.sync()
+        finally:
+            self._sync_lock.release()
+        return self
+
+    # --- QUERIES ---
+    def _busy_rooms(self, start, end):
+        n = self._n
+        start_, end_ = self._start[:n], self._end[:n]
+        # A released stay is an empty interval; inside the range it would still pass both tests
+        hit = (start_ < end) & (end_ > start) & (end_ > start_)
+        busy = np.zeros(len(self.room_ids), bool)
+        busy[self._res_room[:n][hit]] = True
+        return busy
+
+    def free_rooms(self, room_type, check_in, check_out):
+        # room_type may be a TypeID or a TypeName; an unknown name has no rooms
+        with self._lock:
+            if isinstance(room_type, str):
+                if room_type not in self.type_ids:
+                    return self.room_ids[:0]
+                room_type = self.type_ids[room_type]
+            type_id = room_type
+            free = ~self._busy_rooms(to_day(check_in), to_day(check_out))
+            free &= self.room_sellable & (self.room_type == type_id)
+            return self.room_ids[free]
+
+    def free_count_by_type(self, check_in, check_out):
+        with self._lock:
+            free = ~self._busy_rooms(to_day(check_in), to_day(check_out)) & self.room_sellable
+            # Rooms without a type (-1) are not counted under any name
+            counts = np.bincount(self.room_type[free & (self.room_type >= 0)], minlength=1)
+            return {name: int(counts[tid]) if tid < len(counts) else 0
+                    for name, tid in self.type_ids.items()}
+
+    def overbookings(self):
+        # Pairs of live reservations that overlap on the same room
+        with self._lock:
+            n = self._n
+            live = self._end[:n] > self._start[:n]
+            ids, room = self._res_id[:n][live], self._res_room[:n][live].astype(np.int64)
+            start, end = self._start[:n][live].astype(np.int64), self._end[:n][live].astype(np.int64)
+            if len(ids) < 2:
+                return []
+            order = np.lexsort((start, room))
+            ids, room, start, end = ids[order], room[order], start[order], end[order]
+            # Offset each room's days so one running max never crosses rooms
+            span = int(end.max() - start.min()) + 1
+            shift = (room - room.min()) * span
+            reach = np.maximum.accumulate(end + shift)
+            clash = np.nonzero((room[1:] == room[:-1]) & (start[1:] + shift[1:] < reach[:-1]))[0] + 1
+            # Report each clash against the reservation still holding the room
+            holder = np.maximum.accumulate(np.where(end + shift == reach, np.arange(len(ids)), 0))
+            return [(int(self.room_ids[room[i]]), int(ids[holder[i - 1]]), int(ids[i])) for i in clash]
@@ -0,0 +1,204 @@
+import argparse
+import re
+import sqlite3
+import time
+from datetime import timedelta
+
+from benchmarks.run_benchmarks import D2, percentile, report_cases
+from benchmarks.sqlite_compat import bind, connect
+from catalog_replica import EXPORTS
+from index_advisor import (TARGET, app_queries, covered_by, existing_indexes, load_schema, propose, shipped,
+                           sqlite_row_counts)
+from payroll import ATTENDANCE_SQL, LEAVES_SQL, SLIPS_SQL, month_range
+from reports import QUICK_INSIGHTS, bind_report
+
+# Read benefit vs write cost of each index the advisor proposes, measured on
+# the SQLite stand-in built by benchmarks.generate_data.
+#   python -m benchmarks.bench_indexes --db bench.sqlite
+#
+# The proposals are the advisor's for the same --min-rows, before any --skip,
+# less those another migration's index already serves. A statement counts for
+# a proposal when the advisor, given that statement alone, asks for the same
+# index (or a key prefix of it); statements with parameters are bound to
+# values in the dataset's last month (PARAMETERIZED).
+# For every proposal: the statements it serves are timed without and with the
+# index (SQLite has no INCLUDE, so the included columns are appended to the
+# key, which makes it covering the same way). SQLite keeps no histograms, so
+# on a range it often keeps scanning in key order to save a sort where SQL
+# Server would seek; "with" is the faster of SQLite's own plan and one forced
+# onto the index with INDEXED BY. Indexes an earlier 001 created that the
+# advisor no longer proposes are set aside for the run, so "without" really
+# is without. Then a batch of inserts into the
+# table is timed without and with it inside a rolled-back transaction. The
+# last column is how many inserted rows it takes to eat one query's saving.
+# Date-filtered reports are run over the last --window days, which is what
+# the pages are used for day to day.
+
+
+def norm(sql):
+    return re.sub(r"\s+", " ", sql).strip().lower()
+
+
+def parameterized():
+    # (statement text it starts with, params) for app statements that take markers
+    month = D2.replace(day=1).strftime("%Y-%m")
+    first, after = month_range(month)
+    reservations = dict(EXPORTS)["Reservations"]
+    return [
+        (ATTENDANCE_SQL, (first, after)),
+        (LEAVES_SQL, (after, first)),
+        (SLIPS_SQL, (month,)),
+        (reservations, (D2 - timedelta(days=1),)),
+        ("SELECT InquiryID, FullName, GuestPhone, ServiceName, BookingDate FROM Booking_Inquiries ORDER BY", (0, 50)),
+    ]
+
+
+def runnable_cases(conn, window):
+    # Report cases with their real parameters, the app's parameterless
+    # statements, and the parameterized ones bound to the dataset's dates
+    cases = {norm(sql): (sql, params) for _, sql, params in report_cases(conn)}
+    for name in QUICK_INSIGHTS:
+        sql, params = bind_report(name, D2 - timedelta(days=window), D2, "All Departments")
+        cases[norm(sql)] = (sql, params)
+    bound = [(norm(prefix), params) for prefix, params in parameterized()]
+    for _, sql in app_queries():
+        if "?" not in sql and "@" not in sql:
+            cases.setdefault(norm(sql), (sql, ()))
+            continue
+        for prefix, params in bound:
+            if norm(sql).startswith(prefix):
+                cases.setdefault(norm(sql), (sql, params))
+    runnable = []
+    for sql, params in cases.values():
+        try:
+            sql, params = bind(sql, params)
+            conn.execute("EXPLAIN " + sql, params)
+            runnable.append((sql, params))
+        except (ValueError, sqlite3.Error):
+            pass                            # T-SQL the SQLite stand-in cannot run
+    return runnable
+
+
+def serves(p, sql, schema):
+    # Would the advisor ask for this index (or a key prefix of it) for this statement alone?
+    return any(q["table"] == p["table"] and p["key"][:len(q["key"])] == q["key"]
+               for q in propose([(sql, sql)], schema))
+
+
+def forced(sql, p):
+    # The statement with every reference to the table made to use the index
+    keywords = "JOIN|LEFT|RIGHT|INNER|OUTER|CROSS|WHERE|ON|ORDER|GROUP|HAVING|UNION|LIMIT"
+    pattern = rf"\b(FROM|JOIN)(\s+{p['table']})(\s+(?:AS\s+)?(?!(?:{keywords})\b)\w+)?"
+    return re.sub(pattern, lambda m: m.group(0) + f" INDEXED BY {p['name']}", sql, flags=re.I)
+
+
+def time_with(conn, sql, params, repeat, p):
+    best = time_read(conn, sql, params, repeat)
+    hinted = forced(sql, p)
+    if hinted != sql:
+        # A forced plan that is already slower than SQLite's own is abandoned
+        # rather than run to the end (on a joined table it can be quadratic)
+        deadline = time.perf_counter() + best / 1000
+        conn.set_progress_handler(lambda: time.perf_counter() > deadline, 10000)
+        try:
+            conn.execute(hinted, params).fetchall()
+        except sqlite3.Error:
+            return best                     # cannot use the index, or slower
+        finally:
+            conn.set_progress_handler(None, 0)
+        best = min(best, time_read(conn, hinted, params, repeat))
+    return best
+
+
+def time_read(conn, sql, params, repeat):
+    conn.execute(sql, params).fetchall()
+    timings = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - t) * 1000)
+    return percentile(timings, 50)
+
+
+def time_writes(conn, table, info, rows):
+    # Re-insert existing rows under new keys, then throw them away
+    cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})") if r[1] not in info["pk"]]
+    values = [f"{c} || '~' || rowid" if c in info["unique"] else c for c in cols]
+    conn.execute("BEGIN")
+    t = time.perf_counter()
+    conn.execute(f"INSERT INTO {table} ({', '.join(cols)}) SELECT {', '.join(values)} FROM {table} LIMIT {rows}")
+    ms = (time.perf_counter() - t) * 1000
+    conn.execute("ROLLBACK")
+    return ms
+
+
+def create_index(conn, p):
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {p['name']} ON {p['table']} ({', '.join(p['key'] + p['include'])})")
+
+
+def bench(db, repeat, rows, window, min_rows):
+    conn = connect(db)
+    schema = load_schema()
+    elsewhere = existing_indexes(exclude=TARGET)
+    proposals = [p for p in propose([(sql, sql) for _, sql in app_queries()], schema,
+                                    sqlite_row_counts(db, schema), min_rows)
+                 if not covered_by(p, elsewhere)]
+    cases = runnable_cases(conn, window)
+    names = {p["name"] for p in proposals} | {ix["name"] for ix in elsewhere}
+    retired = conn.execute(
+        f"SELECT sql FROM sqlite_master WHERE type = 'index' AND name IN ({', '.join('?' * len(shipped(TARGET)))})",
+        list(shipped(TARGET))).fetchall()
+    retired = [sql for (sql,) in retired if re.search(r"INDEX\s+(\w+)", sql).group(1) not in names]
+    for sql in retired:
+        conn.execute("DROP INDEX " + re.search(r"INDEX\s+(\w+)", sql).group(1))
+    # Each index is measured against all the others being in place, so the
+    # numbers are its marginal worth in the shipped set
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    for p in proposals:
+        create_index(conn, p)
+    conn.execute("ANALYZE")
+    print(f"{'index':<36} {'rows':>8} {'build ms':>9} {'read ms':>17} {'insert us/row':>15} {'rows/read':>10}")
+    for p in proposals:
+        table, info = p["table"], schema[p["table"]]
+        served = [(sql, params) for sql, params in cases if serves(p, sql, schema)]
+        if not served:
+            print(f"{p['name']:<36} (no statement runnable on SQLite)")
+            continue
+        size = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        n = min(rows, size)
+
+        conn.execute(f"DROP INDEX {p['name']}")
+        before = sum(time_read(conn, sql, params, repeat) for sql, params in served)
+        w_before = time_writes(conn, table, info, n)
+        t = time.perf_counter()
+        create_index(conn, p)
+        build = (time.perf_counter() - t) * 1000
+        after = sum(time_with(conn, sql, params, repeat, p) for sql, params in served)
+        w_after = time_writes(conn, table, info, n)
+
+        extra_us = max((w_after - w_before) * 1000 / n, 0.001) if n else 0.0
+        saved = before - after
+        breakeven = f"{saved * 1000 / extra_us:10,.0f}" if saved > 0 and n else f"{'never':>10}"
+        print(f"{p['name']:<36} {size:>8,} {build:9.1f} {before:8.2f} -> {after:6.2f} "
+              f"{w_before * 1000 / max(n, 1):6.1f} -> {w_after * 1000 / max(n, 1):5.1f} {breakeven}")
+    for p in proposals:
+        if p["name"] not in existing:
+            conn.execute(f"DROP INDEX IF EXISTS {p['name']}")
+    for sql in retired:
+        conn.execute(sql)
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Read benefit and write cost of the advised indexes")
+    ap.add_argument("--db", default="bench.sqlite")
+    ap.add_argument("--repeat", type=int, default=9)
+    ap.add_argument("--rows", type=int, default=5000, help="rows inserted per write measurement")
+    ap.add_argument("--window", type=int, default=30, help="days covered by the date-filtered reports")
+    ap.add_argument("--min-rows", type=int, default=1000, help="as index_advisor.py --min-rows")
+    args = ap.parse_args()
+    bench(args.db, args.repeat, args.rows, args.window, args.min_rows)
+
+
+if __name__ == "__main__":
+    main()
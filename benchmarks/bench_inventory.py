@@ -0,0 +1,97 @@
+import argparse
+import random
+import time
+
+from benchmarks.run_benchmarks import percentile
+from benchmarks.sqlite_compat import connect
+from inventory_engine import InventoryEngine
+from reports import QUICK_INSIGHTS
+
+# Low-stock alerts: the in-memory ledger against re-running the report join,
+# on the SQLite stand-in built by benchmarks.generate_data.
+#   python -m benchmarks.bench_inventory --db bench.sqlite --copies 3
+#
+# Quantity changes are drawn at random and applied in batches of --batch
+# items, the way a poll delivers them. --copies loads the items that many
+# times over (under new IDs); the SQL baseline runs on the tables as they are.
+
+VENDOR_SQL = """SELECT StockID, VendorID, VendorName FROM (
+    SELECT PD.StockID, P.VendorID, V.VendorName,
+           ROW_NUMBER() OVER (PARTITION BY PD.StockID ORDER BY P.PO_ID DESC) AS rn
+    FROM PO_Details PD JOIN Purchase_Orders P ON PD.PO_ID = P.PO_ID
+    JOIN Vendors V ON P.VendorID = V.VendorID) WHERE rn = 1"""
+
+
+def load(conn, copies):
+    engine = InventoryEngine(pool=None)
+    step = conn.execute("SELECT MAX(StockID) FROM Stock_Items").fetchone()[0] or 0
+    t = time.perf_counter()
+    items, quantities = [], []
+    for c in range(copies):
+        items += conn.execute(f"SELECT S.StockID + {c * step}, S.ItemName, IC.CatName, S.MinQty FROM Stock_Items S "
+                              "LEFT JOIN Inventory_Cats IC ON S.InvCatID = IC.InvCatID").fetchall()
+        quantities += conn.execute(f"SELECT StockID + {c * step}, SUM(Qty) FROM Current_Inventory "
+                                   "GROUP BY StockID").fetchall()
+        engine._vendors.update((r[0] + c * step, (r[1], r[2])) for r in conn.execute(VENDOR_SQL))
+    with engine._lock:
+        engine._apply(items, quantities, set())
+    return engine, items, time.perf_counter() - t
+
+
+def bench(db, copies, events, batch, repeat, seed):
+    conn = connect(db)
+    engine, items, load_s = load(conn, copies)
+    rng = random.Random(seed)
+    print(f"loaded {len(items):,} items in {load_s:.2f} s; {engine.summary()['low']:,} at or below minimum")
+
+    # Poll-sized batches of changed items, each followed by a page read
+    qty = dict(engine._qty)
+    apply_ms, read_ms = [], []
+    for _ in range(events // batch):
+        changed = []
+        for stock_id in rng.sample(list(qty), batch):
+            qty[stock_id] = max(qty[stock_id] + rng.randrange(-30, 31), 0)
+            changed.append((stock_id, qty[stock_id]))
+        t = time.perf_counter()
+        with engine._lock:
+            engine._apply([], changed, set())
+        apply_ms.append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        engine.alerts()
+        read_ms.append((time.perf_counter() - t) * 1000)
+    # Reads with nothing changed in between, which is most page views
+    cached = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        engine.alerts()
+        cached.append((time.perf_counter() - t) * 1000)
+
+    # The same list in SQL (reports.py), on the tables as they are
+    sql = QUICK_INSIGHTS["Low Stock Alerts"].sql
+    scan = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        conn.execute(sql).fetchall()
+        scan.append((time.perf_counter() - t) * 1000)
+
+    print(f"{'step':<28} {'n':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, ms in ((f"apply {batch} changes", apply_ms), ("alerts after a change", read_ms),
+                     ("alerts, unchanged", cached), ("report join (SQL)", scan)):
+        print(f"{name:<28} {len(ms):>6} {percentile(ms, 50):8.3f} {percentile(ms, 95):8.3f}")
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="In-memory low-stock alerts against the report join")
+    ap.add_argument("--db", default="bench.sqlite")
+    ap.add_argument("--copies", type=int, default=1, help="load the items this many times over")
+    ap.add_argument("--events", type=int, default=20000, help="stock changes to apply")
+    ap.add_argument("--batch", type=int, default=50, help="changed items per poll")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+    bench(args.db, args.copies, args.events, args.batch, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.run_benchmarks import percentile
+from benchmarks.sqlite_compat import connect
+from payroll import SLIP_COLUMNS, compute, load_month
+
+# Month-close payroll on the SQLite stand-in built by benchmarks.generate_data.
+#   python -m benchmarks.bench_payroll --db bench.sqlite --copies 20
+#
+# The month's employees, attendance and leave are loaded once and repeated
+# --copies times over under new EmpIDs (scale 1 has 2,000 employees). Each
+# run computes every slip serially and then over a process pool by
+# department, and builds the rows the batched write sends. The slips go into
+# a SQLite table in one executemany, which stands in for the table-valued
+# parameter call on SQL Server.
+
+
+def scaled(frames, copies):
+    employees, attendance, leaves, shifts = frames
+    step = int(employees['EmpID'].max() or 0)
+    grow = lambda df: pd.concat([df.assign(EmpID=df['EmpID'] + c * step) for c in range(copies)], ignore_index=True)
+    return grow(employees), grow(attendance), grow(leaves), shifts
+
+
+def bench(db, month, copies, workers, repeat):
+    conn = connect(db)
+    t = time.perf_counter()
+    frames = load_month(conn, month)
+    load_s = time.perf_counter() - t
+    employees, attendance, leaves, shifts = frames = scaled(frames, copies)
+    print(f"{month}: {len(employees):,} employees, {len(attendance):,} attendance rows, "
+          f"{len(leaves):,} approved leaves (loaded in {load_s * 1000:.0f} ms before scaling)")
+
+    serial, pooled, rows_ms, write_ms = [], [], [], []
+    conn.execute("CREATE TEMP TABLE bench_slips (EmpID INTEGER PRIMARY KEY, BasicPay, DaysDeducted, Deductions, "
+                 "OvertimeHours, OvertimePay, NetPay)")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        slips = compute(month, *frames, workers=1)
+        serial.append((time.perf_counter() - t) * 1000)
+
+        t = time.perf_counter()
+        parallel = compute(month, *frames, workers=workers, parallel_from=0)
+        pooled.append((time.perf_counter() - t) * 1000)
+        assert parallel[SLIP_COLUMNS].equals(slips[SLIP_COLUMNS]), "pool and serial runs disagree"
+
+        t = time.perf_counter()
+        rows = [(int(emp_id),) + tuple(map(float, pay)) for emp_id, *pay in slips[SLIP_COLUMNS].itertuples(index=False)]
+        rows_ms.append((time.perf_counter() - t) * 1000)
+
+        t = time.perf_counter()
+        conn.execute("BEGIN")
+        conn.execute("DELETE FROM bench_slips")
+        conn.executemany("INSERT INTO bench_slips VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.execute("COMMIT")
+        write_ms.append((time.perf_counter() - t) * 1000)
+
+    print(f"{'step':<30} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, ms in (("compute, serial", serial), (f"compute, {workers} processes", pooled),
+                     ("build write rows", rows_ms), ("batched insert (SQLite)", write_ms)):
+        print(f"{name:<30} {percentile(ms, 50):9.1f} {percentile(ms, 95):9.1f}")
+    print(f"net pay {slips['NetPay'].sum():,.2f} · deductions {slips['Deductions'].sum():,.2f} · "
+          f"overtime {slips['OvertimePay'].sum():,.2f}")
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Month-close payroll, serial and over a process pool")
+    ap.add_argument("--db", default="bench.sqlite")
+    ap.add_argument("--month", default="2026-11", help="YYYY-MM; generate_data's attendance ends in December 2026")
+    ap.add_argument("--copies", type=int, default=1, help="repeat the staff this many times over")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    bench(args.db, args.month, args.copies, args.workers, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
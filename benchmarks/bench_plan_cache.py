@@ -0,0 +1,133 @@
+import argparse
+import re
+import time
+from datetime import date, datetime, timedelta
+
+from benchmarks.sqlite_compat import connect, translate
+from reports import QUICK_INSIGHTS, bind_report
+
+# Compile vs execute time for the Quick Insights reports, before and after
+# they were parameterized.
+#   "before": the filter values are inlined as literals, as the old f-string
+#             reports did, so every filter change is a new statement text
+#   "after":  the registry's fixed SQL with ? markers and bound parameters
+#
+#   python -m benchmarks.bench_plan_cache --db bench.sqlite
+#   python -m benchmarks.bench_plan_cache --odbc "Driver={ODBC Driver 18 for SQL Server};..."
+#
+# On SQLite, compile time is the cost of preparing each new statement text
+# (timed with EXPLAIN); the parameterized text is prepared once and then
+# served from the connection's statement cache. On SQL Server the numbers
+# come from SET STATISTICS TIME, and the plan cache is counted in
+# sys.dm_exec_cached_plans.
+
+TAG = "plan-bench"
+
+
+def literal(v):
+    if isinstance(v, datetime):
+        return f"'{v:%Y-%m-%d %H:%M:%S}'"
+    if isinstance(v, date):
+        return f"'{v:%Y-%m-%d}'"
+    if isinstance(v, str):
+        return "'" + v.replace("'", "''") + "'"
+    return str(v)
+
+
+def inline(sql, params):
+    values = iter(params)
+    return re.sub(r"\?", lambda m: literal(next(values)), sql)
+
+
+def filter_sets(depts, n):
+    # Sliding 90-day windows and a rotating department, like an analyst clicking through
+    for i in range(n):
+        start = date(2025, 1, 1) + timedelta(days=7 * i)
+        yield start, start + timedelta(days=90), depts[i % len(depts)]
+
+
+def cases(depts, n):
+    for name in QUICK_INSIGHTS:
+        runs = [bind_report(name, s, e, d) for s, e, d in filter_sets(depts, n)]
+        if any(p for _, p in runs):
+            yield name, runs
+
+
+# --- SQLITE ---
+def bench_sqlite(db, n):
+    conn = connect(db)
+    depts = [r[0] for r in conn.execute("SELECT DeptName FROM Departments")]
+    print(f"{'report':<42} {'mode':<7} {'texts':>6} {'compile ms':>11} {'exec ms':>9}")
+    for name, runs in cases(depts, n):
+        for mode in ("before", "after"):
+            texts, compile_ms, exec_ms = set(), 0.0, 0.0
+            for sql, params in runs:
+                if mode == "before":
+                    sql, params = inline(sql, params), ()
+                sql = translate(sql)
+                if sql not in texts:
+                    # A statement text not seen before has to be prepared
+                    t = time.perf_counter()
+                    conn.execute("EXPLAIN " + sql, params)
+                    compile_ms += (time.perf_counter() - t) * 1000
+                    texts.add(sql)
+                t = time.perf_counter()
+                conn.execute(sql, params).fetchall()
+                exec_ms += (time.perf_counter() - t) * 1000
+            print(f"{name:<42} {mode:<7} {len(texts):>6} {compile_ms:11.2f} {exec_ms:9.1f}")
+    conn.close()
+
+
+# --- SQL SERVER ---
+COMPILE_RE = re.compile(r"parse and compile time:\s*CPU time = (\d+) ms, elapsed time = (\d+) ms", re.I)
+EXEC_RE = re.compile(r"Execution Times:\s*CPU time = (\d+) ms, elapsed time = (\d+) ms", re.I)
+
+
+def bench_sqlserver(conn_str, n):
+    import pyodbc
+
+    conn = pyodbc.connect(conn_str, autocommit=True)
+    cur = conn.cursor()
+    depts = [r[0] for r in cur.execute("SELECT DeptName FROM Departments").fetchall()]
+    cur.execute("SET STATISTICS TIME ON")
+    print(f"{'report':<42} {'mode':<7} {'texts':>6} {'plans':>6} {'compile ms':>11} {'exec ms':>9}")
+    for name, runs in cases(depts, n):
+        for mode in ("before", "after"):
+            tag = f"/* {TAG}:{mode}:{name} */ "
+            texts, compile_ms, exec_ms = set(), 0, 0
+            for sql, params in runs:
+                if mode == "before":
+                    sql, params = inline(sql, params), ()
+                sql = tag + sql
+                texts.add(sql)
+                cur.execute(sql, *params) if params else cur.execute(sql)
+                while True:
+                    if cur.description:
+                        cur.fetchall()
+                    if not cur.nextset():
+                        break
+                for _, msg in cur.messages:
+                    compile_ms += sum(int(m.group(2)) for m in COMPILE_RE.finditer(msg))
+                    exec_ms += sum(int(m.group(2)) for m in EXEC_RE.finditer(msg))
+            plans = cur.execute("""SELECT COUNT(*) FROM sys.dm_exec_cached_plans cp
+                                   CROSS APPLY sys.dm_exec_sql_text(cp.plan_handle) t
+                                   WHERE t.text LIKE ?""", (f"%{tag.strip()}%",)).fetchone()[0]
+            print(f"{name:<42} {mode:<7} {len(texts):>6} {plans:>6} {compile_ms:11d} {exec_ms:9d}")
+    cur.execute("SET STATISTICS TIME OFF")
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compile/execute time of literal vs parameterized reports")
+    ap.add_argument("--db", default="bench.sqlite")
+    ap.add_argument("--odbc", help="SQL Server ODBC connection string; overrides --db")
+    ap.add_argument("--changes", type=int, default=20, help="filter changes per report")
+    args = ap.parse_args()
+    if args.odbc:
+        bench_sqlserver(args.odbc, args.changes)
+    else:
+        bench_sqlite(args.db, args.changes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmarks.run_benchmarks import percentile
+from benchmarks.sqlite_compat import connect
+from catalog_replica import CatalogReplicator, CatalogSnapshot
+from db_pool import ConnectionPool
+
+# Public website page data: the local catalog snapshot against asking the
+# database on every view, on the SQLite stand-in built by
+# benchmarks.generate_data.
+#   python -m benchmarks.bench_replica --db bench.sqlite --latency 2
+#
+# A view reads the three catalog lists and the free rooms of each room type
+# for one stay. The live side sends the catalog queries plus one count per
+# room type, each after --latency ms of simulated round trip. The snapshot
+# side reads from memory after one stat() of the file. A replication pass,
+# with and without changed rows, and a reader's reload are timed as well.
+
+CATALOG = ("SELECT TypeName, BasePrice, Description FROM Room_Types",
+           "SELECT OutletName FROM Restaurant_Outlets",
+           "SELECT ServiceName, Price FROM Spa_Services")
+FREE_SQL = """SELECT COUNT(*) FROM Rooms R JOIN Room_Types T ON R.TypeID = T.TypeID
+WHERE T.TypeName = ? AND R.Status NOT IN ('Maintenance', 'Out of Order', 'Out of Service')
+  AND NOT EXISTS (SELECT 1 FROM Reservations X WHERE X.RoomID = R.RoomID
+                  AND X.CheckInDate < ? AND X.CheckOutDate > ?
+                  AND X.Status NOT IN ('Cancelled', 'Canceled', 'No-Show', 'NoShow'))"""
+
+
+def live_view(conn, types, check_in, check_out, latency):
+    for sql in CATALOG:
+        time.sleep(latency)
+        conn.execute(sql).fetchall()
+    for name in types:
+        time.sleep(latency)
+        conn.execute(FREE_SQL, (name, check_out, check_in)).fetchone()
+
+
+def snapshot_view(snapshot, types, check_in, check_out):
+    for name in ("Room_Types", "Restaurant_Outlets", "Spa_Services"):
+        snapshot.table(name)
+    for name in types:
+        snapshot.free_rooms(name, check_in, check_out)
+
+
+def bench(db, latency, views, repeat):
+    conn = connect(db)
+    pool = ConnectionPool(lambda: connect(db), max_size=1)
+    path = os.path.join(tempfile.mkdtemp(prefix="replica_"), "catalog.sqlite")
+    replicator = CatalogReplicator(pool, path=path)
+    types = [r[0] for r in conn.execute("SELECT TypeName FROM Room_Types")]
+    check_in = date.today() + timedelta(days=14)
+    check_out = check_in + timedelta(days=3)
+
+    written, unchanged, reload_ms = [], [], []
+    for _ in range(repeat):
+        replicator.digest = None
+        t = time.perf_counter()
+        replicator.run_once()
+        written.append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        replicator.run_once()
+        unchanged.append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        CatalogSnapshot(path).current()
+        reload_ms.append((time.perf_counter() - t) * 1000)
+    snapshot = CatalogSnapshot(path, check_every=0)
+    data = snapshot.current()
+    print(f"snapshot: {os.path.getsize(path) / 1024:,.0f} KB, {len(data['engine'].room_ids):,} rooms, "
+          f"{data['engine']._n:,} current reservations")
+
+    live_ms, snap_ms = [], []
+    for _ in range(views):
+        t = time.perf_counter()
+        live_view(conn, types, check_in, check_out, latency)
+        live_ms.append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        snapshot_view(snapshot, types, check_in, check_out)
+        snap_ms.append((time.perf_counter() - t) * 1000)
+
+    print(f"{'step':<34} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, ms in (("replication pass, rows changed", written), ("replication pass, unchanged", unchanged),
+                     ("reader reload", reload_ms), ("page data, live queries", live_ms),
+                     ("page data, snapshot", snap_ms)):
+        print(f"{name:<34} {percentile(ms, 50):9.2f} {percentile(ms, 95):9.2f}")
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Website page data from the local snapshot vs live queries")
+    ap.add_argument("--db", default="bench.sqlite")
+    ap.add_argument("--latency", type=float, default=1.0, help="simulated round trip per live query, ms")
+    ap.add_argument("--views", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    bench(args.db, args.latency / 1000, args.views, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from collections import Counter
+from datetime import date
+
+from benchmarks.run_benchmarks import percentile
+from benchmarks.sqlite_compat import ROOT, bind, connect
+
+# Startup and rerun cost of the admin app, per interaction: statements sent
+# to the database from the script thread and wall time of the rerun.
+#   python -m benchmarks.bench_reruns --db bench.sqlite
+#   python -m benchmarks.bench_reruns --db bench.sqlite --baseline <rev>
+#
+# The app runs under streamlit.testing (AppTest) with pyodbc replaced by a
+# driver over the SQLite stand-in; --latency adds a network round trip to
+# every statement. Statements SQLite cannot run (catalog views, T-SQL
+# batches) answer with an empty result, so pages that need them show an
+# error in both layouts alike. --baseline also runs `databse UI.py` as it was
+# at that git revision, for a before/after table. Each layout runs in its own
+# process, so "startup" includes its imports.
+#
+# AppTest reruns the whole script for every interaction, including widgets
+# that sit inside a fragment; for those the numbers are an upper bound, since
+# the browser reruns only the fragment.
+
+SCRIPT = os.path.join(ROOT, "databse UI.py")
+SCRIPT_THREAD = "ScriptRunner.scriptThread"
+
+
+# --- STAND-IN DRIVER ---
+def select_columns(sql):
+    # Output column names of the first SELECT, for statements SQLite cannot run
+    m = re.search(r"\bSELECT\s+(?:DISTINCT\s+)?(?:TOP\s*\(?\s*[\w?]+\s*\)?\s+)?(.*?)\s+FROM\b", sql, re.I | re.S)
+    if not m:
+        return []
+    parts, depth, start = [], 0, 0
+    text = m.group(1)
+    for i, ch in enumerate(text):
+        depth += ch == '('
+        depth -= ch == ')'
+        if ch == ',' and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    names = []
+    for part in parts:
+        name = re.search(r"\[?(\w+)\]?\s*$", part.strip())
+        names.append(name.group(1) if name else part.strip())
+    return names
+
+
+class Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self.rowcount = -1
+        self.fast_executemany = False
+        self._rows = []
+
+    def execute(self, sql, *params):
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = tuple(params[0])
+        self.conn.driver.count(sql)
+        time.sleep(self.conn.driver.latency)
+        self.description, self.rowcount, self._rows = None, -1, []
+        try:
+            cur = self.conn.db.execute(*bind(sql, params))
+            self.description, self.rowcount = cur.description, cur.rowcount
+            self._rows = cur.fetchall() if cur.description else []
+        except Exception:
+            if not re.match(r"\s*(SELECT|WITH)\b", sql, re.I):
+                return self
+            self.description = [(name,) + (None,) * 6 for name in select_columns(sql)] or None
+        return self
+
+    def executemany(self, sql, seq):
+        for params in seq:
+            self.execute(sql, params)
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, n=1):
+        rows, self._rows = self._rows[:n], self._rows[n:]
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def nextset(self):
+        return False
+
+    def cancel(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class Connection:
+    def __init__(self, driver):
+        self.driver = driver
+        self.db = connect(driver.db)
+        self.timeout = 0
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.db.close()
+
+
+class Driver:
+    def __init__(self, db, latency):
+        self.db = db
+        self.latency = latency
+        self.statements = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, sql):
+        # Background jobs (search index, rollups, ...) poll on their own threads
+        if threading.current_thread().name == SCRIPT_THREAD:
+            with self._lock:
+                self.statements[re.sub(r"\s+", " ", sql).strip()[:80]] += 1
+
+    def module(self):
+        mod = types.ModuleType("pyodbc")
+        mod.connect = lambda *a, **k: Connection(self)
+        mod.Error = Exception
+        return mod
+
+
+# --- INTERACTIONS ---
+def widget(at, kind, label=None, key=None):
+    for w in getattr(at, kind):
+        if (key is not None and w.key == key) or (label is not None and w.label == label):
+            return w
+    return None
+
+
+def pick(at, kind, label, index=1):
+    w = widget(at, kind, label)
+    if w is None or len(w.options) <= index:
+        return None
+    return w.set_value(w.options[index])
+
+
+def set_section(at, section):
+    # Only the page-module layout has a section picker; st.tabs switch in the browser
+    w = widget(at, "radio", key="user_admin_section")
+    return w.set_value(section) if w is not None else None
+
+
+def nav(label):
+    return lambda at: at.sidebar.radio[0].set_value(label)
+
+
+def typed(kind, text, label=None, key=None):
+    def step(at):
+        w = widget(at, kind, label, key)
+        return w.input(text) if w is not None else None
+    return step
+
+
+STEPS = [
+    ("open Quick Insights", nav("📊 Quick Insights")),
+    ("  change date range", lambda at: widget(at, "date_input", "Select Date Range").set_value(
+        (date(2025, 3, 1), date(2025, 6, 30)))),
+    ("  change department", lambda at: pick(at, "selectbox", "Filter by Department")),
+    ("  switch report", lambda at: pick(at, "selectbox", "Select Report Category", 4)),
+    ("  export format", lambda at: pick(at, "radio", "Format", -1)),
+    ("open User Management", nav("👤 User Management")),
+    ("  show Create User", lambda at: set_section(at, "Create User")),
+    ("  type a username", typed("text_input", "night.audit", key="new_user_input")),
+    ("open Security Logs", nav("🛡️ Security Logs")),
+    ("  filter by user", lambda at: pick(at, "selectbox", "User")),
+    ("open Guest Inquiries", nav("📞 Guest Inquiries")),
+    ("  search", typed("text_input", "ali", label="🔍 Search by Name, Phone, Email or ID Number")),
+    ("open Table Explorer", nav("📁 Table Explorer")),
+]
+
+
+def session(script, timeout):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.abspath(script), default_timeout=timeout)
+    # Signed in already; the login itself is not what is measured
+    for key, value in {'logged_in': True, 'user': 'bench', 'user_id': 1, 'role': 'SuperAdmin', 'token': None}.items():
+        at.session_state[key] = value
+    return at
+
+
+def timed_run(at, driver):
+    driver.statements.clear()
+    t = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - t) * 1000
+    failed = [e.value for e in at.exception]
+    return ms, sum(driver.statements.values()), len(at.error), failed
+
+
+def child(script, db, latency, repeat, timeout):
+    # One layout in this process -> {step: {ms: [...], queries: [...], errors}}
+    from streamlit.testing.v1 import local_script_runner
+    driver = Driver(db, latency)
+    sys.modules["pyodbc"] = driver.module()
+    # A server compiles the script once and reuses the bytecode on every rerun;
+    # AppTest makes a new script cache per run, which would charge each rerun
+    # for compiling it again
+    shared = local_script_runner.ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared
+    results = {}
+
+    def record(name, run):
+        ms, queries, errors, failed = run
+        r = results.setdefault(name, {'ms': [], 'queries': [], 'errors': errors, 'failed': failed})
+        r['ms'].append(ms)
+        r['queries'].append(queries)
+
+    for i in range(repeat):
+        at = session(script, timeout)
+        record("startup (first page)" if i == 0 else "login, warm process", timed_run(at, driver))
+        for name, step in STEPS:
+            if step(at) is None:
+                # Nothing to do in this layout (e.g. a tab switch, which never reaches the server)
+                results.setdefault(name, {'ms': [], 'queries': [], 'errors': 0, 'failed': []})
+                continue
+            record(name, timed_run(at, driver))
+    return results
+
+
+# --- REPORT ---
+def run_layout(script, args):
+    cmd = [sys.executable, "-m", "benchmarks.bench_reruns", "--child", script, "--db", args.db,
+           "--latency", str(args.latency), "--repeat", str(args.repeat), "--timeout", str(args.timeout)]
+    out = subprocess.run(cmd, cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def baseline_script(rev):
+    src = subprocess.run(["git", "show", f"{rev}:databse UI.py"], cwd=ROOT, check=True,
+                         capture_output=True).stdout
+    f = tempfile.NamedTemporaryFile("wb", suffix=".py", prefix="admin_baseline_", delete=False)
+    f.write(src)
+    f.close()
+    return f.name
+
+
+def cell(r):
+    if r is None or not r['ms']:
+        return f"{'-':>7} {'-':>9}"
+    return f"{percentile(r['queries'], 50):7.0f} {percentile(r['ms'], 50):9.1f}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Queries and wall time per admin app interaction")
+    ap.add_argument("--db", default="bench.sqlite")
+    ap.add_argument("--latency", type=float, default=1.0, help="simulated round trip per statement, ms")
+    ap.add_argument("--repeat", type=int, default=3, help="sessions per layout; the first one starts cold")
+    ap.add_argument("--baseline", help="git revision whose `databse UI.py` to compare against")
+    ap.add_argument("--timeout", type=float, default=120)
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.db, args.latency / 1000, args.repeat, args.timeout)))
+        return
+
+    layouts = [("current", run_layout(SCRIPT, args))]
+    if args.baseline:
+        path = baseline_script(args.baseline)
+        try:
+            layouts.insert(0, (args.baseline, run_layout(path, args)))
+        finally:
+            os.unlink(path)
+
+    steps = ["startup (first page)", "login, warm process"] + [name for name, _ in STEPS]
+    header = "".join(f" {name[:17]:>17}" for name, _ in layouts)
+    print(f"{'':<26}{header}")
+    print(f"{'interaction':<26}" + "".join(f" {'queries':>7} {'p50 ms':>9}" for _ in layouts) + "  errors")
+    for step in steps:
+        rows = [results.get(step) for _, results in layouts]
+        errors = "/".join(str(r['errors']) if r else "-" for r in rows)
+        print(f"{step:<26}" + "".join(f" {cell(r)}" for r in rows) + f"  {errors}")
+    for name, results in layouts:
+        for step, r in results.items():
+            for failure in r['failed'][:1]:
+                print(f"{name}: {step}: uncaught exception: {failure[:200]}")
+
+
+if __name__ == "__main__":
+    main()
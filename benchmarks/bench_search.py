@@ -0,0 +1,98 @@
+import argparse
+import random
+import time
+
+from benchmarks.run_benchmarks import percentile
+from benchmarks.sqlite_compat import connect
+from search_index import GUEST, INQUIRY, SearchIndex, index_guests, index_inquiries
+
+# Guest / lead search: the in-memory index against LIKE scans, on the SQLite
+# stand-in built by benchmarks.generate_data.
+#   python -m benchmarks.bench_search --db bench.sqlite --copies 3
+#
+# --copies indexes the tables that many times over (under new IDs) to reach a
+# given size without regenerating the dataset; the LIKE baseline always runs
+# on the tables as they are, so it is a lower bound at that size.
+
+LIKE_SQL = """SELECT 'I', InquiryID FROM Booking_Inquiries WHERE FullName LIKE ? OR GuestPhone LIKE ?
+UNION ALL
+SELECT 'G', GuestID FROM Guests
+WHERE FirstName || ' ' || LastName LIKE ? OR Phone LIKE ? OR Email LIKE ? OR Identity_No LIKE ?"""
+
+
+def sample_queries(conn, rng, n):
+    guests = conn.execute("SELECT FirstName, LastName, Phone, Email, Identity_No FROM Guests "
+                          "ORDER BY RANDOM() LIMIT ?", (n,)).fetchall()
+    queries = []
+    for first, last, phone, email, ident in guests:
+        queries += [("full name", f"{first} {last}"),
+                    ("name prefix", f"{first[:3]} {last[:2]}"),
+                    ("phone fragment", phone[-7:]),
+                    ("email", email.split("@")[0]),
+                    ("ID number", ident.split("-")[1])]
+    rng.shuffle(queries)
+    return queries
+
+
+def build(conn, copies):
+    index = SearchIndex()
+    step = max(conn.execute("SELECT MAX(InquiryID) FROM Booking_Inquiries").fetchone()[0] or 0,
+               conn.execute("SELECT MAX(GuestID) FROM Guests").fetchone()[0] or 0)
+    t = time.perf_counter()
+    for c in range(copies):
+        cur = conn.execute(f"SELECT InquiryID + {c * step}, FullName, GuestPhone FROM Booking_Inquiries")
+        while rows := cur.fetchmany(5000):
+            index_inquiries(index, rows)
+        cur = conn.execute(f"SELECT GuestID + {c * step}, FirstName, LastName, Phone, Email, Identity_No FROM Guests")
+        while rows := cur.fetchmany(5000):
+            index_guests(index, rows)
+    return index, time.perf_counter() - t
+
+
+def bench(db, copies, samples, repeat, seed):
+    conn = connect(db)
+    index, build_s = build(conn, copies)
+    print(f"indexed {len(index):,} records ({index.count(INQUIRY):,} inquiries, "
+          f"{index.count(GUEST):,} guests) in {build_s:.1f} s")
+
+    by_kind = {}
+    for kind, q in sample_queries(conn, random.Random(seed), samples):
+        timings = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            total, hits = index.search(q, limit=25)
+            timings.append((time.perf_counter() - t) * 1000)
+        by_kind.setdefault(kind, []).append((percentile(timings, 50), total, q))
+
+    print(f"{'query kind':<16} {'n':>4} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'avg hits':>9}")
+    for kind, runs in sorted(by_kind.items()):
+        ms = [r[0] for r in runs]
+        print(f"{kind:<16} {len(runs):>4} {percentile(ms, 50):8.2f} {percentile(ms, 95):8.2f} "
+              f"{max(ms):8.2f} {sum(r[1] for r in runs) / len(runs):9.0f}")
+
+    # Baseline: the same searches as LIKE '%...%' scans, a few per kind
+    print(f"\n{'LIKE scan':<16} {'n':>4} {'p50 ms':>8}")
+    for kind, runs in sorted(by_kind.items()):
+        ms = []
+        for _, _, q in runs[:3]:
+            pattern = f"%{q.replace(' ', '%')}%"
+            t = time.perf_counter()
+            conn.execute(LIKE_SQL, (pattern,) * 6).fetchall()
+            ms.append((time.perf_counter() - t) * 1000)
+        print(f"{kind:<16} {len(ms):>4} {percentile(ms, 50):8.2f}")
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Guest / lead search index against LIKE scans")
+    ap.add_argument("--db", default="bench.sqlite")
+    ap.add_argument("--copies", type=int, default=1, help="index the tables this many times over")
+    ap.add_argument("--samples", type=int, default=40, help="guests to draw queries from")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+    bench(args.db, args.copies, args.samples, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import subprocess
+import time
+from datetime import date, datetime, timedelta
+
+from benchmarks.sqlite_compat import bind, connect
+from dashboard_snapshot import HISTORY_QUERIES, TODAY_QUERIES
+from reports import DEPARTMENTS, QUICK_INSIGHTS, SECURITY_LOGS, bind_report, bind_security_log
+
+# Times every report the admin app runs, against the SQLite stand-in built by
+# benchmarks.generate_data.
+#   python -m benchmarks.run_benchmarks --db bench.sqlite --repeat 5
+# Each run appends p50/p95 per report to benchmarks/results/history.jsonl and
+# prints them next to the previous run on the same database.
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "history.jsonl")
+
+# The Quick Insights page defaults
+D1, D2 = date(2025, 1, 1), date(2026, 12, 31)
+DEPT = "Kitchen"
+
+SIZE_TABLES = ["Guests", "Reservations", "Orders", "Order_Details", "Audit_Logs", "Booking_Inquiries"]
+
+
+def report_cases(conn):
+    # (name, sql, params)
+    yield "Quick Insights / Departments filter", DEPARTMENTS, ()
+    for name, report in QUICK_INSIGHTS.items():
+        yield (f"Quick Insights / {name}", *bind_report(name, D1, D2, "All Departments"))
+        if report.dept_sql:
+            yield (f"Quick Insights / {name} [{DEPT}]", *bind_report(name, D1, D2, DEPT))
+
+    # "Today" is the last day in the dataset, so the raw part covers one day
+    today = conn.execute("SELECT MAX(DATE(OrderTime)) FROM Orders").fetchone()[0]
+    for name, sql in HISTORY_QUERIES:
+        yield f"Executive Dashboard / {name} (history)", sql, {"today": today}
+    for name, sql in TODAY_QUERIES:
+        yield f"Executive Dashboard / {name} (today)", sql, {"today": today}
+
+    # The page's default: the last week
+    week = (datetime.combine(D2 - timedelta(days=6), datetime.min.time()),
+            datetime.combine(D2 + timedelta(days=1), datetime.min.time()))
+    for name in SECURITY_LOGS:
+        yield (f"Security Logs / {name}", *bind_security_log(name, *week))
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def time_case(conn, sql, params, repeat):
+    sql, params = bind(sql, params)
+    rows = len(conn.execute(sql, params).fetchall())      # warm-up, not timed
+    timings = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - t) * 1000)
+    return {"rows": rows, "p50": percentile(timings, 50), "p95": percentile(timings, 95)}
+
+
+def previous_run(db):
+    if not os.path.exists(RESULTS):
+        return None
+    last = None
+    with open(RESULTS, encoding="utf-8") as f:
+        for line in f:
+            rec = json.loads(line)
+            if rec.get("db") == db:
+                last = rec
+    return last
+
+
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(db, repeat=5, cases=report_cases, record=True):
+    conn = connect(db)
+    prev = previous_run(os.path.abspath(db))
+    results = {}
+    print(f"{'report':<66} {'rows':>9} {'p50 ms':>9} {'p95 ms':>9} {'prev p50':>9}")
+    for name, sql, params in cases(conn):
+        r = time_case(conn, sql, params, repeat)
+        results[name] = r
+        before = prev["results"].get(name, {}).get("p50") if prev else None
+        shown = f"{before:9.1f}" if before is not None else f"{'-':>9}"
+        print(f"{name:<66} {r['rows']:>9,} {r['p50']:9.1f} {r['p95']:9.1f} {shown}")
+
+    if record:
+        sizes = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in SIZE_TABLES}
+        os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+        with open(RESULTS, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": datetime.now().isoformat(timespec="seconds"), "git": git_rev(),
+                                "db": os.path.abspath(db), "sizes": sizes, "repeat": repeat,
+                                "results": results}) + "\n")
+    conn.close()
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Time the admin app's reports on a SQLite dataset")
+    ap.add_argument("--db", default="bench.sqlite")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--no-record", action="store_true", help="do not append to the results history")
+    args = ap.parse_args()
+    run(args.db, args.repeat, record=not args.no_record)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import glob
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+
+# Local SQLite stand-in for the grand_perl SQL Server database.
+# The schema is read straight from `Hotel managment system.sql` and the few
+# T-SQL constructs the app queries use are rewritten so the same statement
+# text can be timed without a SQL Server instance.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_FILE = os.path.join(ROOT, "Hotel managment system.sql")
+MIGRATIONS = os.path.join(ROOT, "migrations")
+
+# Store dates the way SQL Server prints them so BETWEEN '... 00:00:00' works
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda d: d.strftime("%Y-%m-%d %H:%M:%S"))
+
+def schema_ddl(path=SCHEMA_FILE):
+    # Tables from the schema script, then any the migrations add
+    text = ""
+    for name in [path] + sorted(glob.glob(os.path.join(MIGRATIONS, "*.sql"))):
+        with open(name, encoding="utf-8") as f:
+            text += f.read() + "\n"
+    # Columns the migrations ALTER in go after the table's own columns
+    added = {}
+    for name, col, ctype in re.findall(r"ALTER TABLE\s+(\w+)\s+ADD\s+(\w+)\s+([^;]+);", text, re.I):
+        # ADD CONSTRAINT is a key or index, not a column
+        if col.upper() != "CONSTRAINT":
+            added.setdefault(name, []).append((col, ctype.strip()))
+    ddl = []
+    for name, body in re.findall(r"CREATE TABLE\s+(\w+)\s*\((.*?)\);", text, re.S | re.I):
+        for col, ctype in added.get(name, []):
+            if not re.search(rf"^\s*{col}\b", body, re.M | re.I):
+                m = re.search(r",\s*(FOREIGN KEY|PRIMARY KEY|UNIQUE|CHECK)\b", body, re.I)
+                at = m.start() if m else len(body)
+                body = body[:at] + f",\n{col} {ctype}" + body[at:]
+        body = re.sub(r"\bINT\s+PRIMARY\s+KEY\s+IDENTITY\s*\(\s*1\s*,\s*1\s*\)", "INTEGER PRIMARY KEY", body, flags=re.I)
+        body = re.sub(r"\bROWVERSION\b", "BLOB", body, flags=re.I)
+        body = re.sub(r"DEFAULT\s+GETDATE\(\)", "DEFAULT CURRENT_TIMESTAMP", body, flags=re.I)
+        ddl.append(f"CREATE TABLE {name} ({body})")
+    return ddl
+
+
+def index_ddl():
+    # CREATE NONCLUSTERED INDEX ... INCLUDE (...) from the migrations; SQLite has
+    # no INCLUDE, so those columns go on the end of the key (still covering)
+    ddl = []
+    for name in sorted(glob.glob(os.path.join(MIGRATIONS, "*.sql"))):
+        with open(name, encoding="utf-8") as f:
+            text = f.read()
+        for ix, table, key, inc in re.findall(
+                r"CREATE\s+(?:NONCLUSTERED\s+)?INDEX\s+(\w+)\s+ON\s+(?:dbo\.)?(\w+)\s*\(([^)]*)\)(?:\s*INCLUDE\s*\(([^)]*)\))?",
+                text, re.I):
+            cols = ", ".join(c for c in (key, inc) if c)
+            ddl.append(f"CREATE INDEX IF NOT EXISTS {ix} ON {table} ({cols})")
+    return ddl
+
+
+def bind(sql, params):
+    # translate() for a statement with its parameters: OFFSET ? ROWS FETCH NEXT ? ROWS
+    # ONLY becomes LIMIT ? OFFSET ?, which takes the two markers the other way round,
+    # and the marker of a leading TOP (?) moves to the LIMIT at the end
+    m = re.search(r"OFFSET\s+\?\s+ROWS\s+FETCH\s+NEXT\s+\?\s+ROWS\s+ONLY", sql, re.I)
+    if m and isinstance(params, (list, tuple)):
+        sql = sql[:m.start()] + "LIMIT ? OFFSET ?" + sql[m.end():]
+        params = tuple(params[:-2]) + (params[-1], params[-2])
+    if re.match(r"\s*SELECT\s+TOP\s*\(\s*\?\s*\)", sql, re.I) and isinstance(params, (list, tuple)):
+        params = tuple(params[1:]) + (params[0],)
+    return translate(sql), params
+
+
+def translate(sql):
+    # String concatenation next to a literal: A + ' ' + B  ->  A || ' ' || B
+    sql = re.sub(r"\+\s*(?=')", "|| ", sql)
+    sql = re.sub(r"(?<=')\s*\+", " ||", sql)
+    sql = re.sub(r"\bISNULL\s*\(", "IFNULL(", sql, flags=re.I)
+    sql = re.sub(r"\bGETDATE\(\)", "CURRENT_TIMESTAMP", sql, flags=re.I)
+    # OFFSET ? ROWS FETCH NEXT ? ROWS ONLY  ->  LIMIT ? OFFSET ? (parameters swap)
+    if re.search(r"OFFSET\s+\?\s+ROWS\s+FETCH\s+NEXT\s+\?\s+ROWS\s+ONLY", sql, re.I):
+        raise ValueError("OFFSET/FETCH with markers needs its parameters swapped; rewrite by hand")
+    # SELECT TOP (n) ... -> SELECT ... LIMIT n  (single statement only)
+    m = re.match(r"(\s*SELECT\s+)TOP\s*\(?\s*(\d+|\?)\s*\)?\s+", sql, re.I)
+    if m:
+        sql = m.group(1) + sql[m.end():].rstrip().rstrip(";") + f" LIMIT {m.group(2)}"
+    return sql
+
+
+def connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False,
+                           detect_types=0, isolation_level=None)
+    conn.create_function("GETDATE", 0, lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    return conn
+
+
+def create_schema(conn):
+    for stmt in schema_ddl():
+        conn.execute(stmt)
+
+
+def create_indexes(conn):
+    for stmt in index_ddl():
+        conn.execute(stmt)
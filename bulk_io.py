@@ -0,0 +1,290 @@
+import csv
+import decimal
+import io
+from datetime import date, datetime, time
+
+import pandas as pd
+
+from table_pager import quote_ident
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:             # Parquet is optional; CSV works without it
+    pa = pq = None
+
+# Bulk import / export for the Table Explorer.
+# Imports read the file in chunks, convert each value to the type of the
+# target column and insert a chunk at a time with fast_executemany in its own
+# transaction. A chunk the server refuses is retried row by row, so one bad
+# row costs only itself and comes back with its line number and error.
+# Exports pull rows with fetchmany and append each batch to the CSV / Parquet
+# output, so memory stays at one batch whatever the size of the table.
+
+IMPORT_CHUNK = 1000
+EXPORT_BATCH = 5000
+MAX_ERRORS = 1000
+
+INT_TYPES = {'tinyint', 'smallint', 'int', 'bigint'}
+NUMERIC_TYPES = {'decimal', 'numeric', 'money', 'smallmoney', 'float', 'real'}
+DATE_TYPES = {'date', 'datetime', 'datetime2', 'smalldatetime', 'datetimeoffset'}
+TEXT_TYPES = {'char', 'varchar', 'nchar', 'nvarchar', 'text', 'ntext'}
+# Filled in by the server, never from a file
+SKIPPED_TYPES = {'timestamp', 'rowversion'}
+TRUE_WORDS = {'1', 'true', 't', 'yes', 'y'}
+FALSE_WORDS = {'0', 'false', 'f', 'no', 'n'}
+
+
+def parquet_available():
+    return pq is not None
+
+
+def import_columns(conn, table):
+    # -> [{name, type, nullable, max_len, has_default}] for the columns a file can fill
+    cur = conn.cursor()
+    cur.execute("""SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, CHARACTER_MAXIMUM_LENGTH,
+                          CASE WHEN COLUMN_DEFAULT IS NULL THEN 0 ELSE 1 END,
+                          COLUMNPROPERTY(OBJECT_ID(TABLE_SCHEMA + '.' + TABLE_NAME), COLUMN_NAME, 'IsIdentity'),
+                          COLUMNPROPERTY(OBJECT_ID(TABLE_SCHEMA + '.' + TABLE_NAME), COLUMN_NAME, 'IsComputed')
+                   FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = ? ORDER BY ORDINAL_POSITION""", (table,))
+    cols = []
+    for name, dtype, nullable, max_len, has_default, identity, computed in cur.fetchall():
+        if identity or computed or dtype in SKIPPED_TYPES:
+            continue
+        cols.append({'name': name, 'type': dtype, 'nullable': nullable == 'YES',
+                     'max_len': max_len if max_len and max_len > 0 else None,
+                     'has_default': bool(has_default)})
+    return cols
+
+
+# --- READING FILES ---
+def read_chunks(file, name, chunk_rows=IMPORT_CHUNK):
+    # -> DataFrames of strings (CSV) or typed values (Parquet), chunk_rows at a time
+    if name.lower().endswith('.parquet'):
+        if pq is None:
+            raise ValueError("Parquet import needs pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file, dtype=str, keep_default_na=False, chunksize=chunk_rows,
+                               encoding='utf-8-sig')
+
+
+def count_rows(file, name):
+    # For the progress bar; CSV is counted by lines, so quoted newlines overcount
+    if name.lower().endswith('.parquet'):
+        return pq.ParquetFile(file).metadata.num_rows if pq is not None else None
+    pos = file.tell()
+    n = sum(block.count(b'\n') for block in iter(lambda: file.read(1 << 20), b''))
+    file.seek(pos)
+    return max(n - 1, 0)
+
+
+def map_columns(frame_cols, target):
+    # File columns matched to table columns by name, ignoring case and spaces
+    key = lambda c: str(c).strip().lower().replace(' ', '_')
+    by_key = {key(c['name']): c for c in target}
+    mapping, ignored = [], []
+    for fc in frame_cols:
+        col = by_key.get(key(fc))
+        if col is not None and col not in [m[1] for m in mapping]:
+            mapping.append((fc, col))
+        else:
+            ignored.append(fc)
+    missing = [c['name'] for c in target
+               if not c['nullable'] and not c['has_default'] and c not in [m[1] for m in mapping]]
+    return mapping, ignored, missing
+
+
+def to_decimal(text):
+    try:
+        return decimal.Decimal(text.replace(',', ''))
+    except decimal.InvalidOperation:
+        raise ValueError(f"{text!r} is not a number")
+
+
+def convert(value, col):
+    # One file value -> the Python value pyodbc binds for the column's type
+    if value is None or (not isinstance(value, (str, bytes)) and pd.isna(value)):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value == '':
+            return None
+    t = col['type']
+    if t in INT_TYPES:
+        if isinstance(value, str):
+            d = to_decimal(value)
+            if d != d.to_integral_value():
+                raise ValueError(f"{value!r} is not a whole number")
+            return int(d)
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{value!r} is not a whole number")
+        return int(value)
+    if t in NUMERIC_TYPES:
+        value = to_decimal(value if isinstance(value, str) else str(value))
+        return float(value) if t in ('float', 'real') else value
+    if t == 'bit':
+        if isinstance(value, str):
+            v = value.lower()
+            if v in TRUE_WORDS:
+                return True
+            if v in FALSE_WORDS:
+                return False
+            raise ValueError(f"{value!r} is not a yes/no value")
+        return bool(value)
+    if t in DATE_TYPES:
+        if isinstance(value, str):
+            value = pd.Timestamp(value)
+        if isinstance(value, pd.Timestamp):
+            value = value.to_pydatetime()
+        return value.date() if t == 'date' and isinstance(value, datetime) else value
+    if t == 'time':
+        return value if isinstance(value, time) else pd.Timestamp(str(value)).time()
+    value = value if isinstance(value, str) else str(value)
+    if t in TEXT_TYPES and col['max_len'] and len(value) > col['max_len']:
+        raise ValueError(f"longer than {col['max_len']} characters")
+    return value
+
+
+def convert_chunk(df, mapping, first_line):
+    # -> (rows, line numbers, errors); a row with any bad value is left out
+    rows, lines, errors = [], [], []
+    for i, record in enumerate(df[[fc for fc, _ in mapping]].itertuples(index=False, name=None)):
+        line = first_line + i
+        out = []
+        try:
+            for value, (fc, col) in zip(record, mapping):
+                try:
+                    v = convert(value, col)
+                except (ValueError, TypeError, ArithmeticError) as e:
+                    raise ValueError(f"{fc}: {e}")
+                if v is None and not col['nullable'] and not col['has_default']:
+                    raise ValueError(f"{fc}: a value is required")
+                out.append(v)
+        except ValueError as e:
+            errors.append((line, str(e)))
+            continue
+        rows.append(tuple(out))
+        lines.append(line)
+    return rows, lines, errors
+
+
+# --- IMPORT ---
+def insert_rows(conn, sql, rows, lines):
+    # -> (inserted, errors). Whole chunk first; row by row only if it is refused.
+    cur = conn.cursor()
+    try:
+        cur.fast_executemany = True
+        cur.executemany(sql, rows)
+        conn.commit()
+        return len(rows), []
+    except Exception:
+        conn.rollback()
+    inserted, errors = 0, []
+    cur = conn.cursor()
+    for row, line in zip(rows, lines):
+        try:
+            cur.execute(sql, row)
+            conn.commit()
+            inserted += 1
+        except Exception as e:
+            conn.rollback()
+            errors.append((line, str(e)))
+    return inserted, errors
+
+
+def import_file(conn, table, file, name, columns=None, chunk_rows=IMPORT_CHUNK, on_progress=None):
+    # `columns` as import_columns returns them, when the caller already has the metadata
+    target = columns if columns is not None else import_columns(conn, table)
+    result = {'rows': 0, 'inserted': 0, 'errors': [], 'error_count': 0,
+              'ignored': [], 'missing': []}
+    sql = None
+    # Line numbers as a spreadsheet shows them: header is line 1
+    line = 2
+    for df in read_chunks(file, name, chunk_rows):
+        if sql is None:
+            mapping, result['ignored'], result['missing'] = map_columns(list(df.columns), target)
+            if result['missing']:
+                raise ValueError(f"File has no column for required {', '.join(result['missing'])}")
+            if not mapping:
+                raise ValueError(f"No column in the file matches a column of {table}")
+            cols = ", ".join(quote_ident(col['name']) for _, col in mapping)
+            sql = f"INSERT INTO {quote_ident(table)} ({cols}) VALUES ({', '.join('?' * len(mapping))})"
+        rows, lines, errors = convert_chunk(df, mapping, line)
+        inserted, db_errors = insert_rows(conn, sql, rows, lines) if rows else (0, [])
+        errors += db_errors
+        result['rows'] += len(df)
+        result['inserted'] += inserted
+        result['error_count'] += len(errors)
+        result['errors'] += errors[:MAX_ERRORS - len(result['errors'])]
+        line += len(df)
+        if on_progress:
+            on_progress(result)
+    result['errors'].sort()
+    return result
+
+
+# --- EXPORT ---
+def table_export_sql(table, columns=None):
+    select_list = ", ".join(quote_ident(c) for c in columns) if columns else "*"
+    return f"SELECT {select_list} FROM {quote_ident(table)}"
+
+
+def arrow_type(desc):
+    # Parquet column type from cursor.description, so every batch shares one schema
+    py_type, precision, scale = desc[1], desc[4], desc[5]
+    if py_type is bool:
+        return pa.bool_()
+    if py_type is int:
+        return pa.int64()
+    if py_type is float:
+        return pa.float64()
+    if py_type is decimal.Decimal:
+        return pa.decimal128(precision or 38, scale or 0)
+    if py_type is datetime:
+        return pa.timestamp('ms')
+    if py_type is date:
+        return pa.date32()
+    if py_type is time:
+        return pa.time64('us')
+    if py_type in (bytes, bytearray):
+        return pa.binary()
+    return pa.string()
+
+
+def export_query(conn, sql, params, out, fmt='csv', batch_size=EXPORT_BATCH, on_progress=None):
+    # Writes the result of `sql` to the binary file `out`; -> rows written
+    cur = conn.cursor()
+    cur.execute(sql, params or ())
+    names = [d[0] for d in cur.description]
+    total = 0
+    if fmt == 'parquet':
+        if pq is None:
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+        schema = pa.schema([(d[0], arrow_type(d)) for d in cur.description])
+        with pq.ParquetWriter(out, schema, compression='snappy') as writer:
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                columns = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(list(c), type=f.type) for c, f in zip(columns, schema)], schema=schema))
+                total += len(rows)
+                if on_progress:
+                    on_progress(total)
+        return total
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(names)
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        writer.writerows(rows)
+        total += len(rows)
+        if on_progress:
+            on_progress(total)
+    text.detach()               # leave `out` open for the caller
+    return total
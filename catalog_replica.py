@@ -0,0 +1,270 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pandas as pd
+
+from availability import AvailabilityEngine
+from query_cache import CATALOG_TABLES, last_change
+
+# Local read replica for the public website.
+# CatalogReplicator copies what the site shows (room types, outlets, spa
+# services) and what it needs to answer availability (rooms, and reservations
+# that have not ended) from SQL Server into one SQLite file. It runs on a
+# background thread every `every` seconds, and within a second of a stamp from
+# query_cache.signal_change. Each copy is written to a temp file, fsync'd and
+# swapped in with os.replace, so readers see either the old snapshot or the
+# new one, never half of one. The SHA-256 of the rows is stored inside the
+# file. A pass that finds the same rows only moves CheckedAt, in place.
+#
+# CatalogSnapshot is the reading side. It loads the file into memory once
+# per change, after checking the SHA-256, and keeps serving the last good copy
+# if the file is missing, damaged or SQL Server is down.
+
+REPLICA_PATH = os.environ.get(
+    'HMS_REPLICA_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'replica', 'catalog.sqlite'))
+
+# (snapshot table, query); rows are copied in the query's order
+EXPORTS = (
+    ('Room_Types', "SELECT TypeID, TypeName, BasePrice, Description FROM Room_Types ORDER BY TypeID"),
+    ('Restaurant_Outlets', "SELECT OutletID, OutletName FROM Restaurant_Outlets ORDER BY OutletID"),
+    ('Spa_Services', "SELECT SpaID, ServiceName, Price FROM Spa_Services ORDER BY SpaID"),
+    ('Rooms', "SELECT RoomID, TypeID, Status FROM Rooms ORDER BY RoomID"),
+    # Stays that ended before yesterday can never block a search
+    ('Reservations', """SELECT ResID, RoomID, CheckInDate, CheckOutDate, Status FROM Reservations
+WHERE CheckOutDate >= ? ORDER BY ResID"""),
+)
+FORMAT = '1'
+
+
+def _value(v):
+    # Values as SQLite stores and returns them, so the digest survives the round trip
+    if isinstance(v, Decimal):
+        return float(v)
+    if isinstance(v, (date, datetime)):
+        return v.isoformat()
+    return v
+
+
+def digest(tables):
+    # tables: [(name, columns, rows)] in EXPORTS order
+    sha = hashlib.sha256()
+    for name, columns, rows in tables:
+        sha.update(f"{name}\t{columns!r}\n".encode())
+        for row in rows:
+            sha.update(repr(tuple(row)).encode())
+            sha.update(b'\n')
+    return sha.hexdigest()
+
+
+def read_info(path):
+    # -> {key: value} from the snapshot's Snapshot_Info, {} if there is no readable snapshot
+    try:
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return {}
+    try:
+        return dict(db.execute("SELECT Key, Value FROM Snapshot_Info"))
+    except sqlite3.Error:
+        return {}
+    finally:
+        db.close()
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class CatalogReplicator:
+    def __init__(self, pool, path=REPLICA_PATH, every=30):
+        self.pool = pool
+        self.path = path
+        self.every = every
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.digest = read_info(path).get('Digest')
+        self._thread = None
+        self._stop = threading.Event()
+        self._passed_at = 0.0
+        self.writes = 0
+        self.last_run = None
+        self.last_error = None
+
+    def fetch(self):
+        # -> [(name, columns, rows)], one connection for the whole pass
+        yesterday = date.today() - timedelta(days=1)
+        tables = []
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            for name, sql in EXPORTS:
+                if '?' in sql:
+                    cur.execute(sql, (yesterday,))
+                else:
+                    cur.execute(sql)
+                columns = [c[0] for c in cur.description]
+                tables.append((name, columns, [tuple(_value(v) for v in r) for r in cur.fetchall()]))
+        return tables
+
+    def run_once(self):
+        # -> True if a new snapshot was written
+        t = time.perf_counter()
+        started = time.time()
+        tables = self.fetch()
+        new = digest(tables)
+        now = datetime.now().isoformat(timespec='seconds')
+        wrote = new != self.digest or not self._touch(now)
+        if wrote:
+            self._write(tables, new, now)
+            self.digest = new
+            self.writes += 1
+        self._passed_at = started
+        self.last_run = (datetime.now(), time.perf_counter() - t)
+        self.last_error = None
+        return wrote
+
+    def _write(self, tables, new, now):
+        tmp = f"{self.path}.tmp{os.getpid()}"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        db = sqlite3.connect(tmp)
+        try:
+            db.execute("CREATE TABLE Snapshot_Info (Key TEXT PRIMARY KEY, Value TEXT)")
+            for name, columns, rows in tables:
+                db.execute(f"CREATE TABLE {quote(name)} ({', '.join(quote(c) for c in columns)})")
+                db.executemany(f"INSERT INTO {quote(name)} VALUES ({', '.join('?' * len(columns))})", rows)
+            db.executemany("INSERT INTO Snapshot_Info VALUES (?, ?)",
+                           [('Format', FORMAT), ('Digest', new), ('BuiltAt', now), ('CheckedAt', now)])
+            db.commit()
+        finally:
+            db.close()
+        with open(tmp, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _touch(self, now):
+        # Same rows as the file already holds; only record that they were checked.
+        # False if the file is gone or damaged, so the caller writes it afresh.
+        if read_info(self.path).get('Digest') != self.digest:
+            return False
+        try:
+            db = sqlite3.connect(self.path)
+            try:
+                db.execute("UPDATE Snapshot_Info SET Value = ? WHERE Key = 'CheckedAt'", (now,))
+                db.commit()
+            finally:
+                db.close()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _due(self):
+        if time.time() - self._passed_at >= self.every:
+            return True
+        return any(last_change(t) > self._passed_at for t in CATALOG_TABLES)
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="catalog-replica", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._due():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    # The website keeps reading the last snapshot written
+                    self.last_error = e
+                    self._passed_at = time.time()
+            self._stop.wait(1)
+
+
+class CatalogSnapshot:
+    def __init__(self, path=REPLICA_PATH, check_every=1.0):
+        self.path = path
+        self.check_every = check_every
+        self._lock = threading.Lock()
+        self._file = None           # (inode, mtime, size) of the file last looked at
+        self._checked = float('-inf')
+        self._data = None           # {'tables', 'engine', 'digest', 'built_at', 'checked_at'}
+        self.loads = 0
+        self.last_error = None
+
+    def current(self):
+        # -> the last good snapshot, or None if none could be read yet
+        now = time.monotonic()
+        if now - self._checked >= self.check_every and self._lock.acquire(blocking=self._data is None):
+            try:
+                self._checked = now
+                self._refresh()
+            finally:
+                self._lock.release()
+        return self._data
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key == self._file:
+            return
+        try:
+            self._data = self._load(self._data)
+            self._file = key
+            self.last_error = None
+        except Exception as e:
+            # Damaged or half-copied by hand: keep what was loaded before
+            self.last_error = e
+
+    def _load(self, previous):
+        db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            info = dict(db.execute("SELECT Key, Value FROM Snapshot_Info"))
+            if info.get('Format') != FORMAT:
+                raise ValueError(f"snapshot format {info.get('Format')!r}, expected {FORMAT}")
+            checked_at = datetime.fromisoformat(info['CheckedAt'])
+            if previous is not None and previous['digest'] == info['Digest']:
+                return dict(previous, checked_at=checked_at)
+            tables = []
+            for name, _ in EXPORTS:
+                cur = db.execute(f"SELECT * FROM {quote(name)} ORDER BY rowid")
+                tables.append((name, [c[0] for c in cur.description], cur.fetchall()))
+        finally:
+            db.close()
+        if digest(tables) != info['Digest']:
+            raise ValueError("snapshot checksum mismatch")
+
+        frames = {name: pd.DataFrame.from_records(rows, columns=columns) for name, columns, rows in tables}
+        rows = {name: rows for name, _, rows in tables}
+        engine = AvailabilityEngine()
+        engine.load_rooms(rows['Rooms'], [(r[0], r[1]) for r in rows['Room_Types']])
+        engine.load_reservations(rows['Reservations'])
+        self.loads += 1
+        return {'tables': frames, 'engine': engine, 'digest': info['Digest'],
+                'built_at': datetime.fromisoformat(info['BuiltAt']), 'checked_at': checked_at}
+
+    def table(self, name):
+        data = self.current()
+        return data['tables'][name] if data is not None else None
+
+    def free_rooms(self, type_name, check_in, check_out):
+        data = self.current()
+        if data is None:
+            return None
+        return len(data['engine'].free_rooms(type_name, check_in, check_out))
+
+    def age(self):
+        # Seconds since the replicator last confirmed the snapshot, None without one
+        data = self.current()
+        return (datetime.now() - data['checked_at']).total_seconds() if data is not None else None
@@ -0,0 +1,167 @@
+import threading
+import time
+from datetime import date, datetime
+
+# Executive Dashboard snapshot engine.
+# Revenue and sales are all-time totals split at midnight today (rollups.py):
+#   history - whole days before today, summed from the Daily_* rollup tables.
+#             Only changes when the rollup job rewrites a past day, so it is
+#             re-read every rebuild_every seconds and when the date changes.
+#   today   - today's raw rows plus the live room / task / guest counts, read
+#             on every refresh.
+# Each part is one batch (several result sets, one round-trip).
+
+SNAPSHOT_HEADER = """
+SET NOCOUNT ON;
+DECLARE @today DATETIME = CAST(CAST(GETDATE() AS DATE) AS DATETIME);
+"""
+
+# One result set each, in the order _read() takes them; both lists return the
+# same shapes so the parts can be added together
+HISTORY_QUERIES = [
+    ("revenue", """SELECT (SELECT ISNULL(SUM(Revenue),0) FROM Daily_RoomType_Revenue WHERE SalesDate < @today) AS checkout,
+       (SELECT ISNULL(SUM(Revenue),0) FROM Daily_Outlet_Revenue WHERE SalesDate < @today) AS payments"""),
+    ("outlet_revenue", """SELECT RO.OutletName, SUM(S.Revenue) AS Rev
+FROM Daily_Outlet_Revenue S JOIN Restaurant_Outlets RO ON S.OutletID=RO.OutletID
+WHERE S.SalesDate < @today
+GROUP BY RO.OutletName"""),
+    ("food_sales", """SELECT MI.ItemName, S.Sales
+FROM (SELECT ItemID, SUM(Qty) AS Sales FROM Daily_Item_Sales WHERE SalesDate < @today GROUP BY ItemID) S
+JOIN Menu_Items MI ON S.ItemID = MI.ItemID"""),
+    ("category_sales", """SELECT MC.CategoryName, SUM(S.Sales) AS Sales
+FROM (SELECT CategoryID, SUM(LineTotal) AS Sales FROM Daily_Category_Sales WHERE SalesDate < @today GROUP BY CategoryID) S
+JOIN Menu_Categories MC ON S.CategoryID=MC.CategoryID
+GROUP BY MC.CategoryName"""),
+    ("room_type_revenue", """SELECT RT.TypeName, SUM(S.Revenue) AS Rev
+FROM Daily_RoomType_Revenue S JOIN Room_Types RT ON S.TypeID=RT.TypeID
+WHERE S.SalesDate < @today
+GROUP BY RT.TypeName"""),
+]
+
+TODAY_QUERIES = [
+    ("revenue", """SELECT (SELECT ISNULL(SUM(TotalBill),0) FROM CheckOut_Records WHERE ActualCheckOut >= @today) AS checkout,
+       (SELECT ISNULL(SUM(RP.Amount),0) FROM Restaurant_Payments RP JOIN Orders O ON RP.OrderID=O.OrderID
+        WHERE O.OrderTime >= @today) AS payments"""),
+    ("outlet_revenue", """SELECT RO.OutletName, SUM(RP.Amount) AS Rev
+FROM Restaurant_Payments RP JOIN Orders O ON RP.OrderID=O.OrderID
+JOIN Restaurant_Tables RT ON O.TableID=RT.TableID JOIN Restaurant_Outlets RO ON RT.OutletID=RO.OutletID
+WHERE O.OrderTime >= @today
+GROUP BY RO.OutletName"""),
+    ("food_sales", """SELECT MI.ItemName, SUM(OD.Qty) AS Sales
+FROM Order_Details OD JOIN Orders O ON OD.OrderID=O.OrderID JOIN Menu_Items MI ON OD.ItemID = MI.ItemID
+WHERE O.OrderTime >= @today
+GROUP BY MI.ItemName"""),
+    ("category_sales", """SELECT MC.CategoryName, SUM(OD.Qty * MI.Price) AS Sales
+FROM Order_Details OD JOIN Orders O ON OD.OrderID=O.OrderID JOIN Menu_Items MI ON OD.ItemID=MI.ItemID
+JOIN Menu_Categories MC ON MI.CategoryID=MC.CategoryID
+WHERE O.OrderTime >= @today
+GROUP BY MC.CategoryName"""),
+    ("room_type_revenue", """SELECT RT.TypeName, SUM(CO.TotalBill) AS Rev
+FROM CheckOut_Records CO JOIN CheckIn_Records CI ON CO.CheckInID=CI.CheckInID
+JOIN Reservations Res ON CI.ResID=Res.ResID JOIN Rooms R ON Res.RoomID=R.RoomID
+JOIN Room_Types RT ON R.TypeID=RT.TypeID
+WHERE CO.ActualCheckOut >= @today
+GROUP BY RT.TypeName"""),
+    ("counts", """SELECT (SELECT COUNT(*) FROM Rooms) AS tot,
+       (SELECT COUNT(*) FROM Rooms WHERE Status='Occupied') AS occ,
+       (SELECT COUNT(*) FROM Guests) AS guests,
+       (SELECT COUNT(*) FROM Housekeeping_Tasks WHERE Status != 'Completed') AS pending"""),
+]
+
+
+def _batch(queries):
+    return SNAPSHOT_HEADER + "\n" + ";\n\n".join(q for _, q in queries) + ";\n"
+
+
+HISTORY_BATCH = _batch(HISTORY_QUERIES)
+TODAY_BATCH = _batch(TODAY_QUERIES)
+
+
+def _read(cur):
+    # -> {'checkout', 'payments', 'outlet_revenue', ...}: one entry per result set
+    part = {}
+    revenue = cur.fetchone()
+    part['checkout'], part['payments'] = revenue.checkout, revenue.payments
+    for name in ('outlet_revenue', 'food_sales', 'category_sales', 'room_type_revenue'):
+        cur.nextset()
+        part[name] = {n: v or 0 for n, v in cur.fetchall()}
+    return part
+
+
+def _add(a, b):
+    return {k: a.get(k, 0) + b.get(k, 0) for k in set(a) | set(b)}
+
+
+class DashboardSnapshot:
+    def __init__(self, pool, refresh_every=30, rebuild_every=300):
+        self.pool = pool
+        self.refresh_every = refresh_every
+        self.rebuild_every = rebuild_every
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._history = None
+        self._history_key = None
+        self._snapshot = None
+        self.last_error = None
+
+    # --- REFRESH ---
+    def refresh(self, full=False):
+        with self._refresh_lock:
+            key = (date.today(), int(time.monotonic() // self.rebuild_every))
+            with self.pool.connection() as conn:
+                cur = conn.cursor()
+                if full or self._history is None or key != self._history_key:
+                    cur.execute(HISTORY_BATCH)
+                    self._history, self._history_key = _read(cur), key
+                cur.execute(TODAY_BATCH)
+                today = _read(cur)
+                cur.nextset(); counts = cur.fetchone()
+
+            hist = self._history
+            snapshot = {
+                'as_of': datetime.now(),
+                'revenue': hist['checkout'] + hist['payments'] + today['checkout'] + today['payments'],
+                'rooms_total': counts.tot,
+                'rooms_occupied': counts.occ,
+                'guests': counts.guests,
+                'pending_tasks': counts.pending,
+                'food_top5': sorted(_add(hist['food_sales'], today['food_sales']).items(),
+                                    key=lambda kv: kv[1], reverse=True)[:5],
+                'outlet_revenue': sorted(_add(hist['outlet_revenue'], today['outlet_revenue']).items()),
+                'category_sales': sorted(_add(hist['category_sales'], today['category_sales']).items()),
+                'room_type_revenue': sorted(_add(hist['room_type_revenue'], today['room_type_revenue']).items()),
+            }
+            with self._lock:
+                self._snapshot = snapshot
+                self.last_error = None
+            return snapshot
+
+    def latest(self):
+        with self._lock:
+            snap = self._snapshot
+        # First render before the background thread has finished its first pass
+        return snap if snap is not None else self.refresh()
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dashboard-snapshot", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the previous snapshot; the page shows the error
+                with self._lock:
+                    self.last_error = e
+            self._stop.wait(self.refresh_every)
@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Shared connection pool for the Streamlit apps.
+# `connect` is any zero-argument callable returning a DB-API connection, so the
+# pool runs the same way on pyodbc (SQL Server) and on a local stand-in driver
+# such as sqlite3 (pass context_sql=None there, it has no session context).
+
+
+def build_conn_str(server, database):
+    return (
+        f"Driver={{ODBC Driver 18 for SQL Server}};"
+        f"Server={server};"
+        f"Database={database};"
+        f"Trusted_Connection=yes;"
+        f"Encrypt=yes;"
+        f"TrustServerCertificate=yes;"
+        f"MultipleActiveResultSets=True;"
+    )
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_size=8, checkout_timeout=10.0,
+                 health_query="SELECT 1", health_check_after=30.0,
+                 context_sql="EXEC sp_set_session_context ?, ?"):
+        self._connect = connect
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_query = health_query
+        # Connections idle for longer than this are pinged before reuse.
+        # 0 pings on every checkout.
+        self.health_check_after = health_check_after
+        self.context_sql = context_sql
+
+        self._cond = threading.Condition()
+        self._idle = deque()      # (conn, last_used)
+        self._size = 0            # open connections, idle + checked out
+        self._context = {}        # id(conn) -> session context already applied
+        self._closed = False
+        self._metrics = {
+            'checkouts': 0, 'hits': 0, 'misses': 0, 'timeouts': 0,
+            'health_failures': 0, 'context_sets': 0, 'discarded': 0,
+            'wait_total': 0.0, 'wait_max': 0.0,
+        }
+
+    # --- CHECKOUT / RETURN ---
+    def acquire(self, session_context=None):
+        start = time.perf_counter()
+        deadline = start + self.checkout_timeout
+        while True:
+            conn, last_used = self._reserve(deadline)
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._forget(None)
+                    raise
+                hit = False
+            else:
+                hit = True
+                idle_for = time.monotonic() - last_used
+                if idle_for >= self.health_check_after and not self._is_healthy(conn):
+                    self._count('health_failures')
+                    self._forget(conn)
+                    continue
+            try:
+                self._apply_context(conn, session_context)
+            except Exception:
+                # A failed context call means the link is gone; retry on a fresh one.
+                self._count('health_failures')
+                self._forget(conn)
+                if not hit:
+                    raise
+                continue
+            break
+
+        waited = time.perf_counter() - start
+        with self._cond:
+            m = self._metrics
+            m['checkouts'] += 1
+            m['hits' if hit else 'misses'] += 1
+            m['wait_total'] += waited
+            m['wait_max'] = max(m['wait_max'], waited)
+        return conn
+
+    def release(self, conn, discard=False):
+        if not discard:
+            try:
+                # Never hand an open transaction to the next caller.
+                conn.rollback()
+            except Exception:
+                discard = True
+        if discard or self._closed:
+            self._count('discarded')
+            self._forget(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, session_context=None):
+        conn = self.acquire(session_context)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    # --- METRICS ---
+    def stats(self):
+        with self._cond:
+            s = dict(self._metrics)
+            s['size'] = self._size
+            s['idle'] = len(self._idle)
+            s['in_use'] = self._size - len(self._idle)
+        s['wait_avg'] = s['wait_total'] / s['checkouts'] if s['checkouts'] else 0.0
+        s['hit_ratio'] = s['hits'] / s['checkouts'] if s['checkouts'] else 0.0
+        return s
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._forget(conn)
+
+    # --- INTERNALS ---
+    def _reserve(self, deadline):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                if self._idle:
+                    # LIFO keeps the most recently used connections warm.
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, None
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeout(f"No connection free after {self.checkout_timeout:.1f}s "
+                                      f"(pool size {self.max_size})")
+                self._cond.wait(remaining)
+
+    def _forget(self, conn):
+        if conn is not None:
+            self._context.pop(id(conn), None)
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn):
+        if not self.health_query:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute(self.health_query)
+            cur.fetchall()
+            cur.close()
+            return True
+        except Exception:
+            return False
+
+    def _apply_context(self, conn, session_context):
+        # No context means the system's: keys a previous caller set are reset to
+        # NULL, so a background writer never acts under the last admin's UserID.
+        # The audit triggers log a NULL UserID as no user, "(system)"
+        # (migrations/010_system_audit_identity.sql)
+        if not self.context_sql:
+            return
+        wanted = session_context or {}
+        applied = self._context.setdefault(id(conn), {})
+        changed = {k: v for k, v in wanted.items() if applied.get(k) != v}
+        changed.update({k: None for k, v in applied.items() if k not in wanted and v is not None})
+        if not changed:
+            return
+        cur = conn.cursor()
+        for key, value in changed.items():
+            cur.execute(self.context_sql, (key, value))
+        cur.close()
+        applied.update(changed)
+        self._count('context_sets')
+
+    def _count(self, key):
+        with self._cond:
+            self._metrics[key] += 1
@@ -0,0 +1,419 @@
+import argparse
+import ast
+import glob
+import os
+import re
+from collections import OrderedDict
+
+# Covering-index advisor.
+# Collects the SELECT statements the apps actually issue (string literals in
+# the app modules, the report registry, and optionally the slow-query log),
+# works out per table which columns are filtered, joined, sorted and read,
+# and proposes one nonclustered index per access path:
+#     key     = equality columns, then one range column, then ORDER BY columns
+#     INCLUDE = every other column the statement reads from that table
+# Access paths an index from another migration already serves are left out,
+# as are indexes named with --skip (those the benchmark shows do not pay).
+# The result is written as an idempotent T-SQL migration, headed by the
+# command that produced it; indexes an earlier version of that file created
+# and the advisor no longer proposes are dropped by it.
+#   python index_advisor.py                          # print proposals
+#   python index_advisor.py --write migrations/001_covering_indexes.sql
+#   python index_advisor.py --db bench.sqlite --min-rows 1000
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_FILE = os.path.join(ROOT, "Hotel managment system.sql")
+MIGRATIONS = os.path.join(ROOT, "migrations")
+DEFAULT_SLOW_LOG = os.path.join(ROOT, "logs", "slow_queries.log")
+# The advisor's own migration; its indexes are the ones being re-decided
+TARGET = os.path.join(MIGRATIONS, "001_covering_indexes.sql")
+
+INDEX_RE = re.compile(r"CREATE\s+(?:UNIQUE\s+)?(NONCLUSTERED\s+|CLUSTERED\s+)?INDEX\s+(\w+)\s+ON\s+(?:dbo\.)?(\w+)\s*"
+                      r"\(([^)]*)\)(?:\s*INCLUDE\s*\(([^)]*)\))?", re.I)
+
+# Legacy LOB types cannot be index key or INCLUDE columns
+LOB_TYPES = {"TEXT", "NTEXT", "IMAGE"}
+
+KEYWORDS = {"ON", "WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "FULL", "GROUP",
+            "ORDER", "UNION", "AS", "SET", "WITH"}
+RANGE_OPS = {">", ">=", "<", "<=", "BETWEEN"}
+
+
+# --- SCHEMA ---
+def load_schema(path=SCHEMA_FILE):
+    # Tables from the schema script, then any the migrations add
+    text = ""
+    for name in [path] + sorted(glob.glob(os.path.join(MIGRATIONS, "*.sql"))):
+        with open(name, encoding="utf-8") as f:
+            text += f.read() + "\n"
+    tables = {}
+    for name, body in re.findall(r"CREATE TABLE\s+(\w+)\s*\((.*?)\);", text, re.S | re.I):
+        cols, pk, unique = OrderedDict(), [], set()
+        for line in re.split(r",\s*\n", body):
+            line = line.strip()
+            m = re.match(r"PRIMARY\s+KEY\s*\(([^)]*)\)", line, re.I)
+            if m:
+                pk = [c.strip() for c in m.group(1).split(",")]
+                continue
+            m = re.match(r"(\w+)\s+(\w+)", line)
+            if not m or m.group(1).upper() in ("FOREIGN", "CHECK", "CONSTRAINT"):
+                continue
+            cols[m.group(1)] = m.group(2).upper()
+            if re.search(r"\bPRIMARY\s+KEY\b", line, re.I):
+                pk = [m.group(1)]
+            elif re.search(r"\bUNIQUE\b", line, re.I):
+                unique.add(m.group(1))
+        tables[name] = {"columns": cols, "pk": pk, "unique": unique}
+    return tables
+
+
+def _columns(text):
+    return [re.sub(r"\s+(ASC|DESC)$", "", c.strip(), flags=re.I).strip("[]") for c in (text or "").split(",") if c.strip()]
+
+
+def existing_indexes(exclude=None):
+    # -> [{"name", "table", "key", "include", "clustered", "file"}] created by the
+    # migrations, except the file being regenerated
+    found = []
+    for path in sorted(glob.glob(os.path.join(MIGRATIONS, "*.sql"))):
+        if exclude and os.path.abspath(path) == os.path.abspath(exclude):
+            continue
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        for kind, name, table, key, inc in INDEX_RE.findall(text):
+            found.append({"name": name, "table": table, "key": _columns(key), "include": _columns(inc),
+                          "clustered": kind.strip().upper() == "CLUSTERED", "file": os.path.basename(path)})
+    return found
+
+
+def covered_by(p, existing):
+    # An index on the same leading column that holds every column the proposal
+    # needs (a clustered index holds them all)
+    need = set(p["key"]) | set(p["include"])
+    for ix in existing:
+        if ix["table"] == p["table"] and ix["key"][:1] == p["key"][:1] \
+                and (ix["clustered"] or need <= set(ix["key"]) | set(ix["include"])):
+            return ix
+    return None
+
+
+def shipped(path):
+    # -> {index name: table} an existing version of the migration creates or already drops
+    if not path or not os.path.exists(path):
+        return OrderedDict()
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    found = OrderedDict((m[1], m[2]) for m in INDEX_RE.findall(text))
+    for name, table in re.findall(r"DROP\s+INDEX\s+(\w+)\s+ON\s+(?:dbo\.)?(\w+)", text, re.I):
+        found.setdefault(name, table)
+    return found
+
+
+# --- QUERY COLLECTION ---
+def queries_from_source(paths):
+    # Plain string literals that look like SELECTs; f-strings are skipped
+    found = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) \
+                    and re.match(r"\s*SELECT\b", node.value, re.I):
+                found.append((os.path.basename(path), node.value))
+    return found
+
+
+def queries_from_slow_log(path):
+    found = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if " | " in line:
+                found.append(("slow log", line.split(" | ", 1)[1].strip()))
+    return found
+
+
+def app_queries(slow_log=None):
+    paths = [p for p in glob.glob(os.path.join(ROOT, "*.py")) + glob.glob(os.path.join(ROOT, "admin_pages", "*.py"))
+             if not p.endswith("index_advisor.py")]
+    found = queries_from_source(paths)
+    if slow_log and os.path.exists(slow_log):
+        found += queries_from_slow_log(slow_log)
+    # Same statement text from several places counts once
+    seen, unique = set(), []
+    for src, sql in found:
+        key = re.sub(r"\s+", " ", sql).strip().lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append((src, sql))
+    return unique
+
+
+# --- ANALYSIS ---
+def split_scopes(sql):
+    # Innermost "(SELECT ...)" subqueries become scopes of their own
+    scopes = []
+    while True:
+        m = re.search(r"\(\s*SELECT\b", sql, re.I)
+        if not m:
+            break
+        depth, i = 0, m.start()
+        for i in range(m.start(), len(sql)):
+            depth += {"(": 1, ")": -1}.get(sql[i], 0)
+            if depth == 0:
+                break
+        inner = sql[m.start() + 1:i]
+        if re.search(r"\(\s*SELECT\b", inner, re.I):
+            scopes += split_scopes(inner)
+        else:
+            scopes.append(inner)
+        sql = sql[:m.start()] + "(?)" + sql[i + 1:]
+    return [sql] + scopes
+
+
+def clause(sql, start, ends):
+    m = re.search(start, sql, re.I)
+    if not m:
+        return ""
+    rest = sql[m.end():]
+    stop = min([e.start() for e in (re.search(x, rest, re.I) for x in ends) if e] or [len(rest)])
+    return rest[:stop]
+
+
+class Scope:
+    def __init__(self, sql, schema):
+        self.sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+        self.schema = schema
+        self.lookup = {t.lower(): t for t in schema}
+        self.aliases = {}
+        for m in re.finditer(r"\b(?:FROM|JOIN)\s+\[?(\w+)\]?(?:\s+(?:AS\s+)?(\w+))?", self.sql, re.I):
+            table = self.lookup.get(m.group(1).lower())
+            if not table:
+                continue
+            alias = m.group(2)
+            if alias and alias.upper() not in KEYWORDS:
+                self.aliases[alias.lower()] = table
+            self.aliases[table.lower()] = table
+        self.tables = sorted(set(self.aliases.values()))
+
+    def resolve(self, ref):
+        # "A.Col" or "Col" -> (Table, Column) if it names a real column
+        parts = ref.strip("[]").split(".")
+        if len(parts) == 2:
+            table = self.aliases.get(parts[0].lower())
+            candidates = [table] if table else []
+            col = parts[1]
+        else:
+            candidates, col = self.tables, parts[0]
+        for t in candidates:
+            for c in self.schema[t]["columns"]:
+                if c.lower() == col.strip("[]").lower():
+                    return t, c
+        return None
+
+    def refs(self, text):
+        out = []
+        for m in re.finditer(r"\b(\w+\.\[?\w+\]?|\w+)\b", text):
+            r = self.resolve(m.group(1))
+            if r:
+                out.append(r)
+        return out
+
+
+def analyse(sql, schema):
+    # -> {table: {"eq": [...], "range": [...], "order": [...], "read": set(), "joins": [...]}}
+    usage = {}
+    for scope_sql in split_scopes(sql):
+        s = Scope(scope_sql, schema)
+        if not s.tables:
+            continue
+        use = {t: {"eq": [], "range": [], "order": [], "read": set(), "joins": []} for t in s.tables}
+        where = clause(s.sql, r"\bWHERE\b", [r"\bGROUP\s+BY\b", r"\bORDER\s+BY\b", r"\bUNION\b"])
+        col = r"(\w+\.\[?\w+\]?|\[?\w+\]?)"
+        for m in re.finditer(col + r"\s*(>=|<=|<>|!=|=|<|>|\bBETWEEN\b)\s*(@?\w+\.?\w*|\?)", where, re.I):
+            left, op, right = m.group(1), m.group(2).upper(), m.group(3)
+            lref, rref = s.resolve(left), s.resolve(right)
+            if not lref or rref:
+                continue
+            if op == "=":
+                use[lref[0]]["eq"].append(lref[1])
+            elif op in RANGE_OPS:
+                use[lref[0]]["range"].append(lref[1])
+        for m in re.finditer(col + r"\s*=\s*" + col, s.sql):
+            a, b = s.resolve(m.group(1)), s.resolve(m.group(2))
+            if a and b and a[0] != b[0]:
+                use[a[0]]["joins"].append((a[1], b))
+                use[b[0]]["joins"].append((b[1], a))
+        order = clause(s.sql, r"\bORDER\s+BY\b", [r"\bOFFSET\b", r"\)"])
+        for t, c in s.refs(order):
+            use[t]["order"].append(c)
+        for t, c in s.refs(s.sql):
+            use[t]["read"].add(c)
+        if re.search(r"SELECT\s+(TOP\s*\(?\s*\S+\s*\)?\s+)?\*", s.sql, re.I):
+            for t in s.tables:
+                use[t]["read"].update(schema[t]["columns"])
+        for t, u in use.items():
+            into = usage.setdefault(t, {"eq": [], "range": [], "order": [], "read": set(), "joins": []})
+            for k in ("eq", "range", "order", "joins"):
+                into[k] += u[k]
+            into["read"] |= u["read"]
+    return usage
+
+
+def _dedupe(cols):
+    return list(OrderedDict.fromkeys(cols))
+
+
+def propose(queries, schema, row_counts=None, min_rows=0, served=None):
+    # served, if given, collects lookups an existing PK / UNIQUE index already covers
+    proposals = OrderedDict()   # (table, key tuple) -> {"include": set, "queries": [...]}
+
+    def add(table, key, read, src):
+        info = schema[table]
+        if not key or key[0] in info["pk"][:1]:
+            return                                          # the clustered PK already serves it
+        if any(info["columns"].get(c) in LOB_TYPES for c in key):
+            return
+        if row_counts is not None and row_counts.get(table, 0) < min_rows:
+            return
+        include = {c for c in read if c not in key and c not in info["pk"]
+                   and info["columns"].get(c) not in LOB_TYPES}
+        entry = proposals.setdefault((table, tuple(key)), {"include": set(), "queries": []})
+        entry["include"] |= include
+        if src not in entry["queries"]:
+            entry["queries"].append(src)
+
+    for src, sql in queries:
+        usage = analyse(sql, schema)
+        filtered = {t for t, u in usage.items() if u["eq"] or u["range"]}
+        for table, u in usage.items():
+            info = schema[table]
+            eq = _dedupe(u["eq"])
+            # A single-row lookup on a UNIQUE / PK column needs nothing more
+            unique = [c for c in eq if c in info["unique"] or [c] == info["pk"]]
+            if unique:
+                if served is not None and (table, unique[0]) not in served:
+                    served.append((table, unique[0]))
+                continue
+            key = eq + _dedupe(u["range"])[:1]
+            for c in u["order"]:
+                if c not in key and not u["range"]:
+                    key.append(c)
+            add(table, _dedupe(key), u["read"], src)
+            # Joined from a filtered driver: seek this side on its join column
+            for col, (other, _) in u["joins"]:
+                if other in filtered and other != table and col not in info["pk"]:
+                    add(table, [col], u["read"], src)
+
+    # Fold an index whose key is a prefix of another on the same table into it
+    merged = OrderedDict()
+    for (table, key), entry in sorted(proposals.items(), key=lambda kv: -len(kv[0][1])):
+        target = next((k for k in merged if k[0] == table and k[1][:len(key)] == key), None)
+        if target:
+            merged[target]["include"] |= entry["include"] - set(target[1])
+            merged[target]["queries"] += [q for q in entry["queries"] if q not in merged[target]["queries"]]
+        else:
+            merged[(table, key)] = entry
+    return [{"table": t, "key": list(k), "include": sorted(e["include"]), "queries": e["queries"],
+             "name": "IX_" + t + "_" + "_".join(k)} for (t, k), e in merged.items()]
+
+
+# --- OUTPUT ---
+def migration_sql(proposals, served=(), command="python index_advisor.py", elsewhere=(), skipped=(), retired=()):
+    lines = ["-- Covering indexes for the report, log and login hot paths.",
+             "-- Generated by index_advisor.py; safe to run more than once.",
+             f"-- Command: {command}",
+             "-- Evidence: python -m benchmarks.bench_indexes --db bench.sqlite"]
+    for table, col in served:
+        lines.append(f"-- {table}.{col} lookups are already served by its PRIMARY KEY / UNIQUE index.")
+    for p, ix in elsewhere:
+        if ix["name"] == p["name"]:
+            lines.append(f"-- {p['name']} is created by {ix['file']}.")
+        else:
+            lines.append(f"-- {p['name']} is not needed: {ix['name']} ({ix['file']}) serves it.")
+    for name in skipped:
+        lines.append(f"-- {name} is left out (--skip): the benchmark shows no saving worth its write cost.")
+    lines.append("")
+    for name, table in retired:
+        lines += ["-- Created by an earlier version of this script; no longer proposed",
+                  f"IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{name}' AND object_id = OBJECT_ID('dbo.{table}'))",
+                  f"    DROP INDEX {name} ON dbo.{table};",
+                  "GO", ""]
+    for p in proposals:
+        inc = f" INCLUDE ({', '.join(p['include'])})" if p["include"] else ""
+        lines += [f"-- Serves: {'; '.join(q for q in p['queries'])}",
+                  f"IF OBJECT_ID('dbo.{p['table']}') IS NOT NULL",
+                  f"   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{p['name']}' AND object_id = OBJECT_ID('dbo.{p['table']}'))",
+                  f"    CREATE NONCLUSTERED INDEX {p['name']} ON dbo.{p['table']} ({', '.join(p['key'])}){inc};",
+                  "GO", ""]
+    return "\r\n".join(lines)
+
+
+def describe(src, sql):
+    first = re.sub(r"\s+", " ", sql).strip()
+    return f"{src}: {first[:90]}{'...' if len(first) > 90 else ''}"
+
+
+def sqlite_row_counts(db, tables):
+    import sqlite3
+    conn = sqlite3.connect(db)
+    counts = {}
+    for t in tables:
+        try:
+            counts[t] = conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+        except sqlite3.Error:
+            counts[t] = 0
+    conn.close()
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Propose covering indexes for the queries the apps issue")
+    ap.add_argument("--slow-log", default=DEFAULT_SLOW_LOG, help="\"\" to leave the log out")
+    ap.add_argument("--db", help="SQLite dataset to read table sizes from (see benchmarks.generate_data)")
+    ap.add_argument("--min-rows", type=int, default=1000, help="skip tables smaller than this (needs --db)")
+    ap.add_argument("--skip", action="append", default=[], metavar="NAME",
+                    help="leave this proposed index out (repeatable)")
+    ap.add_argument("--write", help="write the migration script here")
+    args = ap.parse_args()
+
+    schema = load_schema()
+    queries = [(describe(src, sql), sql) for src, sql in app_queries(args.slow_log)]
+    counts = sqlite_row_counts(args.db, schema) if args.db else None
+    served = []
+    existing = existing_indexes(exclude=args.write or TARGET)
+    elsewhere, skipped, proposals = [], [], []
+    for p in propose(queries, schema, counts, args.min_rows, served):
+        ix = covered_by(p, existing)
+        if ix:
+            elsewhere.append((p, ix))
+        elif p["name"] in args.skip:
+            skipped.append(p["name"])
+        else:
+            proposals.append(p)
+    for p in proposals:
+        inc = f" INCLUDE ({', '.join(p['include'])})" if p["include"] else ""
+        print(f"{p['name']}: {p['table']} ({', '.join(p['key'])}){inc}")
+        for q in p["queries"]:
+            print(f"    <- {q}")
+    for table, col in served:
+        print(f"(already indexed: {table}.{col})")
+    for p, ix in elsewhere:
+        print(f"(served by {ix['name']} in {ix['file']}: {p['name']})")
+    for name in skipped:
+        print(f"(skipped: {name})")
+    if args.write:
+        keep = {p["name"] for p in proposals}
+        retired = [(name, table) for name, table in shipped(args.write).items()
+                   if name not in keep and name not in {ix["name"] for ix in existing}]
+        command = " ".join(["python index_advisor.py"] + [
+            f"--{k.replace('_', '-')} {v!r}" if v == "" else f"--{k.replace('_', '-')} {v}"
+            for k, v in (("db", args.db), ("min_rows", args.min_rows if args.db else None),
+                         ("slow_log", args.slow_log if args.slow_log != DEFAULT_SLOW_LOG else None)) if v is not None]
+            + [f"--skip {name}" for name in args.skip] + [f"--write {os.path.relpath(args.write, ROOT)}"])
+        with open(args.write, "w", encoding="utf-8", newline="") as f:
+            f.write(migration_sql(proposals, served, command, elsewhere, skipped, retired) + "\r\n")
+        print(f"Wrote {args.write}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# Durable local spool for website booking inquiries.
+# The page appends the inquiry to a JSON-lines segment file (flushed and
+# fsync'd) and thanks the guest straight away; InquiryWriter drains the spool
+# into Booking_Inquiries on a background thread in multi-row batches. A
+# checkpoint file records how far the spool has been written to the database,
+# so a restart picks up where it left off. Every inquiry carries a SpoolRef
+# that the insert skips if already present, so replaying a batch after a
+# crash between COMMIT and checkpoint never duplicates it.
+# One website process per spool directory.
+
+SPOOL_DIR = os.environ.get(
+    'HMS_SPOOL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spool'))
+
+SEGMENT_BYTES = 4_000_000
+# Same guest, phone and room type again within this window is a double click
+DUPLICATE_WINDOW = 600
+
+# SQL Server allows 2,100 parameters per statement (4 per row). Batches are
+# cut into these fixed sizes so only a handful of statement texts get cached.
+# BookingDate is left to the column's GETDATE() default: the server's clock,
+# not the web server's.
+CHUNK_SIZES = (400, 100, 20, 5, 1)
+INSERT_SQL = """INSERT INTO Booking_Inquiries (ServiceName, GuestPhone, FullName, SpoolRef)
+SELECT v.ServiceName, v.GuestPhone, v.FullName, v.SpoolRef
+FROM (VALUES {rows}) v(ServiceName, GuestPhone, FullName, SpoolRef)
+WHERE NOT EXISTS (SELECT 1 FROM Booking_Inquiries B WHERE B.SpoolRef = v.SpoolRef)"""
+
+# Deadlock victim, query timeout: worth another try, never a reason to reject a row
+TRANSIENT_SQLSTATES = {'40001', 'HYT00'}
+
+
+def is_transient(error):
+    return bool(error.args) and error.args[0] in TRANSIENT_SQLSTATES
+
+
+class InquirySpool:
+    def __init__(self, directory=SPOOL_DIR, segment_bytes=SEGMENT_BYTES, fsync=True):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._recent = {}
+        self._file = None
+        self.appended = 0
+        self.duplicates = 0
+        segments = self._segments()
+        self._seq = segments[-1] if segments else 1
+        self._open(self._seq)
+
+    # --- FILES ---
+    def _segment_path(self, seq):
+        return os.path.join(self.directory, f'inquiries-{seq:08d}.jsonl')
+
+    def _segments(self):
+        seqs = []
+        for name in os.listdir(self.directory):
+            if name.startswith('inquiries-') and name.endswith('.jsonl'):
+                seqs.append(int(name[10:-6]))
+        return sorted(seqs)
+
+    def _open(self, seq):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._segment_path(seq), 'ab')
+        # A crash mid-write can leave a torn last line; start on a fresh one
+        if self._file.tell() and not self._ends_with_newline(seq):
+            self._file.write(b'\n')
+
+    def _ends_with_newline(self, seq):
+        with open(self._segment_path(seq), 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    # --- WRITE SIDE (page requests) ---
+    def append(self, service, phone, name):
+        # -> SpoolRef; once this returns the inquiry survives a crash or restart
+        key = (service, phone.strip(), name.strip().lower())
+        now = time.time()
+        with self._lock:
+            ref, at = self._recent.get(key, (None, 0))
+            if ref and now - at < DUPLICATE_WINDOW:
+                self.duplicates += 1
+                return ref
+            ref = uuid.uuid4().hex
+            record = {'ref': ref, 'service': service, 'phone': phone, 'name': name,
+                      'at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            self._file.write(json.dumps(record).encode('utf-8') + b'\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.appended += 1
+            self._recent[key] = (ref, now)
+            if len(self._recent) > 10_000:
+                self._recent = {k: v for k, v in self._recent.items() if now - v[1] < DUPLICATE_WINDOW}
+            if self._file.tell() >= self.segment_bytes:
+                self._seq += 1
+                self._open(self._seq)
+            return ref
+
+    # --- READ SIDE (writer thread) ---
+    def _checkpoint_path(self):
+        return os.path.join(self.directory, 'checkpoint.json')
+
+    def checkpoint(self):
+        try:
+            with open(self._checkpoint_path()) as f:
+                cp = json.load(f)
+            return cp['seq'], cp['offset']
+        except (OSError, ValueError, KeyError):
+            segments = self._segments()
+            return (segments[0] if segments else 1), 0
+
+    def read_batch(self, max_rows):
+        # -> (records, position after them); only complete lines are returned
+        seq, offset = self.checkpoint()
+        records = []
+        with self._lock:
+            last = self._seq
+        while len(records) < max_rows and seq <= last:
+            path = self._segment_path(seq)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    f.seek(offset)
+                    while len(records) < max_rows:
+                        line = f.readline()
+                        if not line.endswith(b'\n'):
+                            break
+                        offset += len(line)
+                        if line.strip():
+                            try:
+                                records.append(json.loads(line))
+                            except ValueError:
+                                pass            # torn line from a crash, skipped
+            if len(records) >= max_rows or seq == last:
+                break
+            seq, offset = seq + 1, 0
+        return records, (seq, offset)
+
+    def commit(self, position):
+        # Written to a temp file and renamed, so the checkpoint is never half-written
+        seq, offset = position
+        tmp = self._checkpoint_path() + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'seq': seq, 'offset': offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._checkpoint_path())
+        for old in self._segments():
+            if old < seq:
+                os.remove(self._segment_path(old))
+
+    def reject(self, record, error):
+        # Rows the database refuses on their own go aside instead of blocking the spool
+        with open(os.path.join(self.directory, 'rejected.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(dict(record, error=str(error))) + '\n')
+
+    def backlog_bytes(self):
+        seq, offset = self.checkpoint()
+        total = -offset
+        for s in self._segments():
+            if s >= seq:
+                total += os.path.getsize(self._segment_path(s))
+        return max(total, 0)
+
+
+def insert_batch(conn, records):
+    # All chunks in one transaction
+    cur = conn.cursor()
+    i = 0
+    while i < len(records):
+        size = next(n for n in CHUNK_SIZES if n <= len(records) - i)
+        params = []
+        for r in records[i:i + size]:
+            params += [r['service'], r['phone'], r['name'], r['ref']]
+        cur.execute(INSERT_SQL.format(rows=', '.join(['(?, ?, ?, ?)'] * size)), params)
+        i += size
+    conn.commit()
+
+
+class InquiryWriter:
+    def __init__(self, spool, pool, batch_rows=2000, every=1.0, max_backoff=60.0, split_after=3):
+        self.spool = spool
+        self.pool = pool
+        self.batch_rows = batch_rows
+        self.every = every
+        self.max_backoff = max_backoff
+        # Consecutive failures of one batch before it is retried row by row
+        self.split_after = split_after
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._failures = 0
+        self.written = 0
+        self.rejected = 0
+        self.last_error = None
+
+    def flush_once(self):
+        # -> rows taken off the spool (written or rejected)
+        records, position = self.spool.read_batch(self.batch_rows)
+        if not records:
+            return 0
+        rejected = 0
+        try:
+            with self.pool.connection() as conn:
+                insert_batch(conn, records)
+        except Exception as e:
+            self._failures += 1
+            self.last_error = e
+            if self._failures < self.split_after:
+                raise
+            rejected = self._write_rows(records)
+        self.spool.commit(position)
+        self.written += len(records) - rejected
+        self.rejected += rejected
+        self._failures = 0
+        self.last_error = None
+        return len(records)
+
+    def _write_rows(self, records):
+        # -> rows rejected. One bad row must not hold up the rest, but if the
+        # database itself is unreachable, or the failure is transient, this
+        # raises and the whole batch stays spooled (rows already written are
+        # skipped on the retry by their SpoolRef). Nothing is set aside until
+        # every row has been tried, so a raise never leaves a row both in
+        # rejected.jsonl and in the spool.
+        rejects = []
+        for r in records:
+            try:
+                with self.pool.connection() as conn:
+                    insert_batch(conn, [r])
+            except Exception as e:
+                if is_transient(e):
+                    raise
+                # Only a database that answers can have refused the row itself
+                with self.pool.connection() as conn:
+                    conn.cursor().execute('SELECT 1').fetchone()
+                rejects.append((r, e))
+        for r, e in rejects:
+            self.spool.reject(r, e)
+        return len(rejects)
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='inquiry-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        # Called after an append so the inquiry is written within milliseconds
+        self._wake.set()
+
+    def _run(self):
+        backoff = None
+        while not self._stop.is_set():
+            try:
+                while self.flush_once() >= self.batch_rows:
+                    pass                        # backlog: keep draining without sleeping
+                backoff = None
+            except Exception:
+                # Database slow or down; the spool keeps everything until it is back
+                backoff = min(backoff * 2 if backoff else 1.0, self.max_backoff)
+            if backoff:
+                # New appends do not cut a backoff short
+                self._stop.wait(backoff)
+            else:
+                self._wake.wait(self.every)
+            self._wake.clear()
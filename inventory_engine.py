@@ -0,0 +1,221 @@
+import bisect
+import threading
+import time
+
+# Low-stock alerts and reorder drafts (replaces rejoining Current_Inventory and
+# Stock_Items on every view of "Low Stock Alerts").
+# Stock events post to Current_Inventory in the database
+# (migrations/008_inventory_engine.sql); one engine per process keeps the
+# ledger in memory: item, minimum, on-hand quantity and preferred vendor, plus
+# the set of items at or below their minimum. Each poll reads only the
+# Current_Inventory and Stock_Items rows whose ROWVERSION moved since the last
+# one and re-checks just those items, so the alert list is ready before the
+# page asks for it. Deleted rows bump no rowversion; the periodic full reload
+# covers them, and picks up new purchase history for the vendor mapping.
+
+# Drafted orders bring an item up to this many times its minimum
+REORDER_TO = 2
+
+FEED_HEADER = """
+SET NOCOUNT ON;
+DECLARE @since BINARY(8) = ?;
+DECLARE @hi BINARY(8) = MIN_ACTIVE_ROWVERSION();
+SELECT @hi AS hi;
+"""
+
+ITEM_COLUMNS = """SELECT S.StockID, S.ItemName, IC.CatName, S.MinQty
+FROM Stock_Items S LEFT JOIN Inventory_Cats IC ON S.InvCatID = IC.InvCatID"""
+
+DRAFTED_SQL = """SELECT DISTINCT PD.StockID FROM PO_Details PD
+JOIN Purchase_Orders P ON PD.PO_ID = P.PO_ID WHERE P.Status = 'Draft'"""
+
+FULL_BATCH = FEED_HEADER + ITEM_COLUMNS + """;
+SELECT StockID, SUM(Qty) FROM Current_Inventory GROUP BY StockID;
+SELECT StockID, VendorID, VendorName FROM vw_Stock_Preferred_Vendor;
+""" + DRAFTED_SQL + ";"
+
+# Whole on-hand totals for every item with a changed inventory row, so an
+# item split over several rows is never half updated
+DELTA_BATCH = FEED_HEADER + ITEM_COLUMNS + """
+WHERE S.RowVer >= @since AND S.RowVer < @hi;
+SELECT StockID, SUM(Qty) FROM Current_Inventory
+WHERE StockID IN (SELECT StockID FROM Current_Inventory WHERE RowVer >= @since AND RowVer < @hi)
+GROUP BY StockID;
+""" + DRAFTED_SQL + ";"
+
+DRAFT_PO_SQL = """SET NOCOUNT ON;
+INSERT INTO Purchase_Orders (VendorID, TotalAmount, Status) VALUES (?, NULL, 'Draft');
+SELECT CAST(SCOPE_IDENTITY() AS INT);"""
+DRAFT_LINE_SQL = "INSERT INTO PO_Details (PO_ID, StockID, Qty) VALUES (?, ?, ?)"
+
+ZERO_VERSION = b'\x00' * 8
+
+
+def order_quantity(qty, min_qty):
+    return max(REORDER_TO * (min_qty or 0) - (qty or 0), 0)
+
+
+def sort_key(row):
+    return (-row['Needed'], row['ItemName'] or '', row['StockID'])
+
+
+class InventoryEngine:
+    def __init__(self, pool, every=5, reload_every=600):
+        self.pool = pool
+        self.every = every
+        self.reload_every = reload_every
+        self._lock = threading.Lock()
+        self._items = {}                # StockID -> (ItemName, CatName, MinQty)
+        self._qty = {}                  # StockID -> on hand; items with no inventory row are left out
+        self._vendors = {}              # StockID -> (VendorID, VendorName)
+        self._drafted = set()           # StockIDs already on a draft purchase order
+        self._low = {}                  # StockID -> alert row, for items at or below their minimum
+        self._order = []                # alert sort keys, biggest shortfall first, kept sorted
+        self._alerts = None             # the rows in that order, rebuilt when any of them changes
+        self._rowver = None
+        self._loaded_at = 0.0
+        self._thread = None
+        self._stop = threading.Event()
+        self.version = 0
+        self.loaded = False
+        self.last_error = None
+
+    # --- LEDGER ---
+    def _check(self, stock_id):
+        # Re-evaluates one item; True if its alert row appeared, changed or went away
+        item, qty = self._items.get(stock_id), self._qty.get(stock_id)
+        old = self._low.pop(stock_id, None)
+        if old is not None:
+            del self._order[bisect.bisect_left(self._order, sort_key(old))]
+        if item is None or qty is None or item[2] is None or qty > item[2]:
+            return old is not None
+        name, cat, min_qty = item
+        vendor = self._vendors.get(stock_id)
+        row = {'StockID': stock_id, 'ItemName': name, 'CatName': cat, 'Qty': qty,
+               'MinQty': min_qty, 'Needed': min_qty - qty, 'OrderQty': order_quantity(qty, min_qty),
+               'Vendor': vendor[1] if vendor else None, 'Drafted': stock_id in self._drafted}
+        self._low[stock_id] = row
+        bisect.insort(self._order, sort_key(row))
+        return row != old
+
+    def _apply(self, items, quantities, drafted):
+        touched = set()
+        for stock_id, name, cat, min_qty in items:
+            self._items[stock_id] = (name, cat, min_qty)
+            touched.add(stock_id)
+        for stock_id, qty in quantities:
+            self._qty[stock_id] = qty
+            touched.add(stock_id)
+        if drafted != self._drafted:
+            touched |= (drafted ^ self._drafted) & self._low.keys()
+            self._drafted = drafted
+        changed = False
+        for stock_id in touched:
+            changed = self._check(stock_id) or changed
+        if changed:
+            self._alerts = None
+            self.version += 1
+
+    def poll(self):
+        full = self._rowver is None or time.monotonic() - self._loaded_at >= self.reload_every
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(FULL_BATCH if full else DELTA_BATCH, (ZERO_VERSION if full else self._rowver,))
+            hi = bytes(cur.fetchone().hi)
+            cur.nextset()
+            items = cur.fetchall()
+            cur.nextset()
+            quantities = cur.fetchall()
+            vendors = None
+            if full:
+                cur.nextset()
+                vendors = {r[0]: (r[1], r[2]) for r in cur.fetchall()}
+            cur.nextset()
+            drafted = {r[0] for r in cur.fetchall()}
+        with self._lock:
+            if full:
+                self._items, self._qty, self._low, self._order, self._vendors = {}, {}, {}, [], vendors
+                self._alerts = None
+            self._apply(items, quantities, drafted)
+            self._rowver = hi
+            if full:
+                self._loaded_at = time.monotonic()
+        self.loaded = True
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.poll()
+
+    # --- READERS ---
+    def alerts(self):
+        # -> [{StockID, ItemName, CatName, Qty, MinQty, Needed, OrderQty, Vendor, Drafted}], biggest shortfall first
+        with self._lock:
+            if self._alerts is None:
+                self._alerts = [self._low[key[2]] for key in self._order]
+            return self._alerts
+
+    def summary(self):
+        with self._lock:
+            return {'items': len(self._items), 'low': len(self._low),
+                    'drafted': len(self._low.keys() & self._drafted),
+                    'no_vendor': sum(1 for s in self._low if s not in self._vendors)}
+
+    # --- REORDER DRAFTS ---
+    def draft_orders(self):
+        # One draft purchase order per vendor for every low item not already on
+        # one -> {VendorName: (PO_ID, lines)}. Items with no purchase history are skipped.
+        with self._lock:
+            wanted = {}
+            for stock_id in self._low.keys() - self._drafted:
+                vendor = self._vendors.get(stock_id)
+                qty = order_quantity(self._qty[stock_id], self._items[stock_id][2])
+                if vendor is not None and qty > 0:
+                    wanted.setdefault(vendor, []).append((stock_id, qty))
+        if not wanted:
+            return {}
+        drafted = {}
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                # One drafter at a time across processes; re-read what is on a draft under the lock
+                cur.execute("EXEC sp_getapplock @Resource = 'inventory_drafts', @LockMode = 'Exclusive', "
+                            "@LockOwner = 'Transaction'")
+                cur.execute(DRAFTED_SQL)
+                already = {r[0] for r in cur.fetchall()}
+                for (vendor_id, vendor_name), lines in sorted(wanted.items()):
+                    lines = sorted(line for line in lines if line[0] not in already)
+                    if not lines:
+                        continue
+                    cur.execute(DRAFT_PO_SQL, (vendor_id,))
+                    po_id = cur.fetchone()[0]
+                    cur.fast_executemany = True
+                    cur.executemany(DRAFT_LINE_SQL, [(po_id, stock_id, qty) for stock_id, qty in lines])
+                    drafted[vendor_name] = (po_id, len(lines))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        with self._lock:
+            self._apply([], [], self._drafted | {s for lines in wanted.values() for s, _ in lines})
+        return drafted
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="inventory-engine", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception as e:
+                # Alerts stay as of the last good poll
+                self.last_error = e
+            self._stop.wait(self.every)
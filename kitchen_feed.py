@@ -0,0 +1,152 @@
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+# Live kitchen feed (replaces polling vw_Kitchen_Orders).
+# One poller per process keeps the open tickets in memory. Each pass asks only
+# for orders whose Orders / Order_Details / Kitchen_Tickets rows changed since
+# the last ROWVERSION seen (migrations/004_kitchen_rowversion.sql) and
+# replaces those orders' lines. Elapsed minutes are worked out here from
+# OrderTime and the server clock, so unchanged rows need no query at all.
+# The upper bound is MIN_ACTIVE_ROWVERSION(), so a row still being written is
+# picked up on a later pass rather than skipped. Deleted order lines do not
+# bump any rowversion; a periodic full reload covers them.
+
+OPEN_STATUSES = ('Pending', 'Preparing')
+
+FEED_HEADER = """
+SET NOCOUNT ON;
+DECLARE @since BINARY(8) = ?;
+DECLARE @hi BINARY(8) = MIN_ACTIVE_ROWVERSION();
+SELECT @hi AS hi, GETDATE() AS server_now;
+"""
+
+FEED_COLUMNS = """SELECT O.OrderID, OD.DetailID, RO.OutletName, RT.TableNo, MI.ItemName, OD.Qty,
+       KT.Status AS CookingStatus, O.OrderTime
+FROM Orders O
+JOIN Order_Details OD ON O.OrderID = OD.OrderID
+JOIN Menu_Items MI ON OD.ItemID = MI.ItemID
+JOIN Restaurant_Tables RT ON O.TableID = RT.TableID
+JOIN Restaurant_Outlets RO ON RT.OutletID = RO.OutletID
+LEFT JOIN Kitchen_Tickets KT ON O.OrderID = KT.OrderID"""
+
+# Every open ticket, for the first pass and the periodic reload
+FULL_BATCH = FEED_HEADER + FEED_COLUMNS + """
+WHERE KT.Status IN ('Pending', 'Preparing');
+"""
+
+# Current lines of every order touched since @since, open or not, so closed
+# tickets can be dropped from the board
+DELTA_BATCH = FEED_HEADER + """
+WITH changed AS (
+    SELECT OrderID FROM Orders WHERE RowVer >= @since AND RowVer < @hi
+    UNION SELECT OrderID FROM Order_Details WHERE RowVer >= @since AND RowVer < @hi
+    UNION SELECT OrderID FROM Kitchen_Tickets WHERE RowVer >= @since AND RowVer < @hi)
+""" + FEED_COLUMNS.replace("FROM Orders O", "FROM changed C JOIN Orders O ON O.OrderID = C.OrderID") + ";\n"
+
+ZERO_VERSION = b'\x00' * 8
+
+
+class KitchenFeed:
+    def __init__(self, pool, every=3, reload_every=600, history=1000):
+        self.pool = pool
+        self.every = every
+        self.reload_every = reload_every
+
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._orders = {}               # OrderID -> list of line dicts
+        self._rowver = None
+        self._clock_offset = None       # server clock minus local clock
+        self._loaded_at = None
+        self.version = 0
+        self._changes = deque(maxlen=history)   # (version, OrderID)
+        self.last_error = None
+
+    # --- POLLING ---
+    def poll(self):
+        # -> OrderIDs whose lines changed in this pass
+        with self._poll_lock:
+            now = datetime.now()
+            full = self._rowver is None or (now - self._loaded_at).total_seconds() >= self.reload_every
+            with self.pool.connection() as conn:
+                cur = conn.cursor()
+                cur.execute(FULL_BATCH if full else DELTA_BATCH, (ZERO_VERSION if full else self._rowver,))
+                head = cur.fetchone()
+                cur.nextset()
+                rows = cur.fetchall()
+
+            fresh = {}
+            for r in rows:
+                if r.CookingStatus in OPEN_STATUSES:
+                    fresh.setdefault(r.OrderID, []).append({
+                        'OrderID': r.OrderID, 'DetailID': r.DetailID, 'OutletName': r.OutletName,
+                        'TableNo': r.TableNo, 'ItemName': r.ItemName, 'Qty': r.Qty,
+                        'CookingStatus': r.CookingStatus, 'OrderTime': r.OrderTime})
+            touched = (set(self._orders) | set(fresh)) if full else {r.OrderID for r in rows}
+
+            with self._lock:
+                changed = [oid for oid in touched if self._orders.get(oid) != fresh.get(oid)]
+                if full:
+                    self._orders = fresh
+                    self._loaded_at = now
+                else:
+                    for oid in touched:
+                        if oid in fresh:
+                            self._orders[oid] = fresh[oid]
+                        else:
+                            self._orders.pop(oid, None)
+                if changed:
+                    self.version += 1
+                    self._changes.extend((self.version, oid) for oid in changed)
+                self._rowver = bytes(head.hi)
+                self._clock_offset = head.server_now - now
+                self.last_error = None
+            return changed
+
+    # --- READERS (page renders, no database access) ---
+    def board(self, outlet=None):
+        # -> (version, open lines with Minutes_Elapsed), oldest order first
+        with self._lock:
+            now = datetime.now() + (self._clock_offset or timedelta(0))
+            lines = [dict(line, Minutes_Elapsed=int((now - line['OrderTime']).total_seconds() // 60))
+                     for order in self._orders.values() for line in order
+                     if outlet is None or line['OutletName'] == outlet]
+            version = self.version
+        lines.sort(key=lambda l: (l['OrderTime'], l['OrderID'], l['DetailID']))
+        return version, lines
+
+    def changed_since(self, version):
+        # OrderIDs changed after `version`; None if that is older than the kept history
+        with self._lock:
+            if self._changes and self._changes[0][0] > version + 1:
+                return None
+            return {oid for v, oid in self._changes if v > version}
+
+    def ensure_loaded(self):
+        if self._rowver is None:
+            self.poll()
+        return self
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="kitchen-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                # Displays keep showing the last good board
+                with self._lock:
+                    self.last_error = e
+            self._stop.wait(self.every)
@@ -0,0 +1,64 @@
+-- Covering indexes for the report, log and login hot paths.
+-- Generated by index_advisor.py; safe to run more than once.
+-- Command: python index_advisor.py --db bench.sqlite --min-rows 1000 --slow-log '' --skip IX_Employees_DeptID --write migrations/001_covering_indexes.sql
+-- Evidence: python -m benchmarks.bench_indexes --db bench.sqlite
+-- System_Users.Username lookups are already served by its PRIMARY KEY / UNIQUE index.
+-- IX_CheckOut_Records_ActualCheckOut is created by 002_daily_rollups.sql.
+-- IX_Restaurant_Payments_OrderID is created by 002_daily_rollups.sql.
+-- IX_Attendance_Date is created by 009_payroll.sql.
+-- IX_Leave_Records_Status is not needed: IX_Leave_Records_Status_StartDate (009_payroll.sql) serves it.
+-- IX_Audit_Logs_LogTime is not needed: CX_Audit_Logs_LogTime (007_audit_partitioning.sql) serves it.
+-- IX_Employees_DeptID is left out (--skip): the benchmark shows no saving worth its write cost.
+
+-- Created by an earlier version of this script; no longer proposed
+IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Booking_Inquiries_BookingDate' AND object_id = OBJECT_ID('dbo.Booking_Inquiries'))
+    DROP INDEX IX_Booking_Inquiries_BookingDate ON dbo.Booking_Inquiries;
+GO
+
+-- Created by an earlier version of this script; no longer proposed
+IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Audit_Logs_LogTime' AND object_id = OBJECT_ID('dbo.Audit_Logs'))
+    DROP INDEX IX_Audit_Logs_LogTime ON dbo.Audit_Logs;
+GO
+
+-- Serves: guest_inquiries.py: SELECT InquiryID, FullName, GuestPhone, ServiceName, BookingDate FROM Booking_Inquiries OR...
+IF OBJECT_ID('dbo.Booking_Inquiries') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Booking_Inquiries_BookingDate_InquiryID' AND object_id = OBJECT_ID('dbo.Booking_Inquiries'))
+    CREATE NONCLUSTERED INDEX IX_Booking_Inquiries_BookingDate_InquiryID ON dbo.Booking_Inquiries (BookingDate, InquiryID) INCLUDE (FullName, GuestPhone, ServiceName);
+GO
+
+-- Serves: dashboard_snapshot.py: SELECT (SELECT ISNULL(SUM(TotalBill),0) FROM CheckOut_Records WHERE ActualCheckOut >= @tod...; dashboard_snapshot.py: SELECT RO.OutletName, SUM(RP.Amount) AS Rev FROM Restaurant_Payments RP JOIN Orders O ON R...; dashboard_snapshot.py: SELECT MI.ItemName, SUM(OD.Qty) AS Sales FROM Order_Details OD JOIN Orders O ON OD.OrderID...; dashboard_snapshot.py: SELECT MC.CategoryName, SUM(OD.Qty * MI.Price) AS Sales FROM Order_Details OD JOIN Orders ...
+IF OBJECT_ID('dbo.Orders') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Orders_OrderTime' AND object_id = OBJECT_ID('dbo.Orders'))
+    CREATE NONCLUSTERED INDEX IX_Orders_OrderTime ON dbo.Orders (OrderTime) INCLUDE (TableID);
+GO
+
+-- Serves: dashboard_snapshot.py: SELECT MI.ItemName, SUM(OD.Qty) AS Sales FROM Order_Details OD JOIN Orders O ON OD.OrderID...; dashboard_snapshot.py: SELECT MC.CategoryName, SUM(OD.Qty * MI.Price) AS Sales FROM Order_Details OD JOIN Orders ...
+IF OBJECT_ID('dbo.Order_Details') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Order_Details_OrderID' AND object_id = OBJECT_ID('dbo.Order_Details'))
+    CREATE NONCLUSTERED INDEX IX_Order_Details_OrderID ON dbo.Order_Details (OrderID) INCLUDE (ItemID, Qty);
+GO
+
+-- Serves: availability.py: SELECT ResID, RoomID, CheckInDate, CheckOutDate, Status FROM Reservations WHERE CheckOutDa...; catalog_replica.py: SELECT ResID, RoomID, CheckInDate, CheckOutDate, Status FROM Reservations WHERE CheckOutDa...
+IF OBJECT_ID('dbo.Reservations') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Reservations_CheckOutDate' AND object_id = OBJECT_ID('dbo.Reservations'))
+    CREATE NONCLUSTERED INDEX IX_Reservations_CheckOutDate ON dbo.Reservations (CheckOutDate) INCLUDE (CheckInDate, RoomID, Status);
+GO
+
+-- Serves: reports.py: SELECT TOP (200) Username, IP_Address, AttemptTime FROM Failed_Logins WHERE AttemptTime >=...
+IF OBJECT_ID('dbo.Failed_Logins') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Failed_Logins_AttemptTime' AND object_id = OBJECT_ID('dbo.Failed_Logins'))
+    CREATE NONCLUSTERED INDEX IX_Failed_Logins_AttemptTime ON dbo.Failed_Logins (AttemptTime) INCLUDE (IP_Address, Username);
+GO
+
+-- Serves: reports.py: SELECT G.FirstName + ' ' + G.LastName AS [Guest], R.RoomNumber, RT.TypeName, Res.CheckInDa...
+IF OBJECT_ID('dbo.Reservations') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Reservations_CheckInDate' AND object_id = OBJECT_ID('dbo.Reservations'))
+    CREATE NONCLUSTERED INDEX IX_Reservations_CheckInDate ON dbo.Reservations (CheckInDate) INCLUDE (GuestID, RoomID, Status);
+GO
+
+-- Serves: reports.py: SELECT G.FirstName + ' ' + G.LastName AS [Guest], GP.Preference, ISNULL(BG.Reason, 'Not Bl...
+IF OBJECT_ID('dbo.Spa_Bookings') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Spa_Bookings_Date' AND object_id = OBJECT_ID('dbo.Spa_Bookings'))
+    CREATE NONCLUSTERED INDEX IX_Spa_Bookings_Date ON dbo.Spa_Bookings (Date) INCLUDE (GuestID, SpaID);
+GO
+
@@ -0,0 +1,177 @@
+-- Daily revenue and sales rollups.
+-- One row per day and outlet / item / category / room type, so the dashboard
+-- and the sales reports no longer rejoin Order_Details -> Menu_Items ->
+-- Orders -> Restaurant_Tables -> Restaurant_Outlets over all history.
+-- Readers take whole days before today from here and today from the raw rows.
+-- Kept current by sp_Refresh_Daily_Rollups (run by the admin app every minute,
+-- or from a SQL Agent job). Safe to run more than once.
+--
+-- Payments have no date of their own; they count on the day of their order.
+-- Check-outs count on ActualCheckOut; one with no ActualCheckOut is not
+-- counted anywhere. Rows with no outlet / room type land under ID 0.
+
+IF OBJECT_ID('dbo.Daily_Outlet_Revenue') IS NULL
+CREATE TABLE Daily_Outlet_Revenue (
+SalesDate DATE NOT NULL,
+OutletID INT NOT NULL,
+Revenue DECIMAL(14,2) NOT NULL,
+Payments INT NOT NULL,
+PRIMARY KEY (SalesDate, OutletID));
+GO
+
+IF OBJECT_ID('dbo.Daily_Item_Sales') IS NULL
+CREATE TABLE Daily_Item_Sales (
+SalesDate DATE NOT NULL,
+OutletID INT NOT NULL,
+ItemID INT NOT NULL,
+Qty INT NOT NULL,
+LineTotal DECIMAL(14,2) NOT NULL,
+PRIMARY KEY (SalesDate, OutletID, ItemID));
+GO
+
+IF OBJECT_ID('dbo.Daily_Category_Sales') IS NULL
+CREATE TABLE Daily_Category_Sales (
+SalesDate DATE NOT NULL,
+OutletID INT NOT NULL,
+CategoryID INT NOT NULL,
+Qty INT NOT NULL,
+LineTotal DECIMAL(14,2) NOT NULL,
+PRIMARY KEY (SalesDate, OutletID, CategoryID));
+GO
+
+IF OBJECT_ID('dbo.Daily_RoomType_Revenue') IS NULL
+CREATE TABLE Daily_RoomType_Revenue (
+SalesDate DATE NOT NULL,
+TypeID INT NOT NULL,
+Revenue DECIMAL(14,2) NOT NULL,
+CheckOuts INT NOT NULL,
+PRIMARY KEY (SalesDate, TypeID));
+GO
+
+-- Highest source IDENTITY already folded into the rollups
+IF OBJECT_ID('dbo.Rollup_Watermarks') IS NULL
+CREATE TABLE Rollup_Watermarks (
+SourceTable VARCHAR(50) PRIMARY KEY,
+LastID INT NOT NULL,
+RefreshedAt DATETIME DEFAULT GETDATE());
+GO
+
+INSERT INTO Rollup_Watermarks (SourceTable, LastID)
+SELECT T.Name, 0 FROM (VALUES ('Restaurant_Payments'), ('Order_Details'), ('CheckOut_Records')) T(Name)
+WHERE NOT EXISTS (SELECT 1 FROM Rollup_Watermarks W WHERE W.SourceTable = T.Name);
+GO
+
+-- The refresh and the readers' "today" part seek check-outs by date and
+-- payments by order (orders by date are covered by IX_Orders_OrderTime)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_CheckOut_Records_ActualCheckOut' AND object_id = OBJECT_ID('dbo.CheckOut_Records'))
+    CREATE NONCLUSTERED INDEX IX_CheckOut_Records_ActualCheckOut ON dbo.CheckOut_Records (ActualCheckOut) INCLUDE (CheckInID, TotalBill);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Restaurant_Payments_OrderID' AND object_id = OBJECT_ID('dbo.Restaurant_Payments'))
+    CREATE NONCLUSTERED INDEX IX_Restaurant_Payments_OrderID ON dbo.Restaurant_Payments (OrderID) INCLUDE (Amount);
+GO
+
+----------------------------------------------------------------------------------
+
+-- Recomputes every day touched by rows above the watermarks, plus the last
+-- @Recheck_Days days (late commits, updates and deletes). Each dirty day is
+-- deleted and re-aggregated, so running it twice changes nothing.
+-- @Rebuild = 1 recomputes all history.
+CREATE OR ALTER PROCEDURE sp_Refresh_Daily_Rollups
+    @Recheck_Days INT = 1,
+    @Rebuild BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    BEGIN TRAN;
+    -- One refresher at a time, however many app processes call it
+    EXEC sp_getapplock @Resource = 'sp_Refresh_Daily_Rollups', @LockMode = 'Exclusive', @LockOwner = 'Transaction';
+
+    DECLARE @pay INT = 0, @od INT = 0, @co INT = 0;
+    IF @Rebuild = 0
+        SELECT @pay = MAX(CASE WHEN SourceTable = 'Restaurant_Payments' THEN LastID END),
+               @od = MAX(CASE WHEN SourceTable = 'Order_Details' THEN LastID END),
+               @co = MAX(CASE WHEN SourceTable = 'CheckOut_Records' THEN LastID END)
+        FROM Rollup_Watermarks;
+    DECLARE @pay_hi INT = ISNULL((SELECT MAX(PayID) FROM Restaurant_Payments), 0);
+    DECLARE @od_hi INT = ISNULL((SELECT MAX(DetailID) FROM Order_Details), 0);
+    DECLARE @co_hi INT = ISNULL((SELECT MAX(CheckOutID) FROM CheckOut_Records), 0);
+    DECLARE @recheck DATE = DATEADD(DAY, -@Recheck_Days, CAST(GETDATE() AS DATE));
+
+    IF @Rebuild = 1
+    BEGIN
+        DELETE FROM Daily_Outlet_Revenue;
+        DELETE FROM Daily_Item_Sales;
+        DELETE FROM Daily_Category_Sales;
+        DELETE FROM Daily_RoomType_Revenue;
+    END
+
+    -- Restaurant days: new payments or order lines, the recheck window, and
+    -- days already rolled up inside it (in case their rows were deleted)
+    DECLARE @food_days TABLE (SalesDate DATE PRIMARY KEY);
+    INSERT INTO @food_days
+    SELECT CAST(O.OrderTime AS DATE) FROM Restaurant_Payments RP JOIN Orders O ON RP.OrderID = O.OrderID
+    WHERE RP.PayID > @pay AND RP.PayID <= @pay_hi
+    UNION SELECT CAST(O.OrderTime AS DATE) FROM Order_Details OD JOIN Orders O ON OD.OrderID = O.OrderID
+    WHERE OD.DetailID > @od AND OD.DetailID <= @od_hi
+    UNION SELECT CAST(OrderTime AS DATE) FROM Orders WHERE OrderTime >= @recheck
+    UNION SELECT SalesDate FROM Daily_Outlet_Revenue WHERE SalesDate >= @recheck
+    UNION SELECT SalesDate FROM Daily_Item_Sales WHERE SalesDate >= @recheck;
+
+    DECLARE @room_days TABLE (SalesDate DATE PRIMARY KEY);
+    INSERT INTO @room_days
+    SELECT CAST(ActualCheckOut AS DATE) FROM CheckOut_Records
+    WHERE CheckOutID > @co AND CheckOutID <= @co_hi AND ActualCheckOut IS NOT NULL
+    UNION SELECT CAST(ActualCheckOut AS DATE) FROM CheckOut_Records WHERE ActualCheckOut >= @recheck
+    UNION SELECT SalesDate FROM Daily_RoomType_Revenue WHERE SalesDate >= @recheck;
+
+    DELETE R FROM Daily_Outlet_Revenue R JOIN @food_days D ON R.SalesDate = D.SalesDate;
+    INSERT INTO Daily_Outlet_Revenue (SalesDate, OutletID, Revenue, Payments)
+    SELECT D.SalesDate, ISNULL(RT.OutletID, 0), SUM(RP.Amount), COUNT(*)
+    FROM @food_days D
+    JOIN Orders O ON O.OrderTime >= D.SalesDate AND O.OrderTime < DATEADD(DAY, 1, D.SalesDate)
+    JOIN Restaurant_Payments RP ON RP.OrderID = O.OrderID AND RP.PayID <= @pay_hi
+    LEFT JOIN Restaurant_Tables RT ON O.TableID = RT.TableID
+    GROUP BY D.SalesDate, ISNULL(RT.OutletID, 0);
+
+    DELETE R FROM Daily_Item_Sales R JOIN @food_days D ON R.SalesDate = D.SalesDate;
+    INSERT INTO Daily_Item_Sales (SalesDate, OutletID, ItemID, Qty, LineTotal)
+    SELECT D.SalesDate, ISNULL(RT.OutletID, 0), OD.ItemID, SUM(OD.Qty), SUM(OD.Qty * MI.Price)
+    FROM @food_days D
+    JOIN Orders O ON O.OrderTime >= D.SalesDate AND O.OrderTime < DATEADD(DAY, 1, D.SalesDate)
+    JOIN Order_Details OD ON OD.OrderID = O.OrderID AND OD.DetailID <= @od_hi
+    JOIN Menu_Items MI ON OD.ItemID = MI.ItemID
+    LEFT JOIN Restaurant_Tables RT ON O.TableID = RT.TableID
+    GROUP BY D.SalesDate, ISNULL(RT.OutletID, 0), OD.ItemID;
+
+    -- Categories straight from the item rows just written
+    DELETE R FROM Daily_Category_Sales R JOIN @food_days D ON R.SalesDate = D.SalesDate;
+    INSERT INTO Daily_Category_Sales (SalesDate, OutletID, CategoryID, Qty, LineTotal)
+    SELECT S.SalesDate, S.OutletID, ISNULL(MI.CategoryID, 0), SUM(S.Qty), SUM(S.LineTotal)
+    FROM Daily_Item_Sales S JOIN @food_days D ON S.SalesDate = D.SalesDate
+    JOIN Menu_Items MI ON S.ItemID = MI.ItemID
+    GROUP BY S.SalesDate, S.OutletID, ISNULL(MI.CategoryID, 0);
+
+    DELETE R FROM Daily_RoomType_Revenue R JOIN @room_days D ON R.SalesDate = D.SalesDate;
+    INSERT INTO Daily_RoomType_Revenue (SalesDate, TypeID, Revenue, CheckOuts)
+    SELECT D.SalesDate, ISNULL(R.TypeID, 0), SUM(CO.TotalBill), COUNT(*)
+    FROM @room_days D
+    JOIN CheckOut_Records CO ON CO.ActualCheckOut >= D.SalesDate AND CO.ActualCheckOut < DATEADD(DAY, 1, D.SalesDate)
+                            AND CO.CheckOutID <= @co_hi
+    LEFT JOIN CheckIn_Records CI ON CO.CheckInID = CI.CheckInID
+    LEFT JOIN Reservations Res ON CI.ResID = Res.ResID
+    LEFT JOIN Rooms R ON Res.RoomID = R.RoomID
+    GROUP BY D.SalesDate, ISNULL(R.TypeID, 0);
+
+    UPDATE Rollup_Watermarks
+    SET LastID = CASE SourceTable WHEN 'Restaurant_Payments' THEN @pay_hi
+                                  WHEN 'Order_Details' THEN @od_hi
+                                  ELSE @co_hi END,
+        RefreshedAt = GETDATE();
+    COMMIT;
+END
+GO
+
+EXEC sp_Refresh_Daily_Rollups @Rebuild = 1;
+GO
@@ -0,0 +1,22 @@
+-- Booking_Inquiries for the website's spooled inquiry writer (inquiry_spool.py).
+-- The table was created by hand until now; this declares it, adds the SpoolRef
+-- the batched insert dedupes on, and its unique index. Safe to run more than once.
+
+IF OBJECT_ID('dbo.Booking_Inquiries') IS NULL
+CREATE TABLE Booking_Inquiries (
+InquiryID INT PRIMARY KEY IDENTITY(1,1),
+ServiceName VARCHAR(100),
+GuestPhone VARCHAR(20),
+FullName VARCHAR(100),
+BookingDate DATETIME DEFAULT GETDATE(),
+SpoolRef CHAR(32) NULL);
+GO
+
+IF COL_LENGTH('dbo.Booking_Inquiries', 'SpoolRef') IS NULL
+    ALTER TABLE Booking_Inquiries ADD SpoolRef CHAR(32) NULL;
+GO
+
+-- Inquiries written before the spool have no SpoolRef, hence the filter
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_Booking_Inquiries_SpoolRef' AND object_id = OBJECT_ID('dbo.Booking_Inquiries'))
+    CREATE UNIQUE NONCLUSTERED INDEX UX_Booking_Inquiries_SpoolRef ON dbo.Booking_Inquiries (SpoolRef) WHERE SpoolRef IS NOT NULL;
+GO
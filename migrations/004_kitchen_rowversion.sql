@@ -0,0 +1,32 @@
+-- Change tracking for the live kitchen feed (kitchen_feed.py).
+-- A ROWVERSION column on each table the feed reads, indexed so the delta
+-- query seeks straight to the rows changed since the last poll, plus an
+-- index for the full load of open tickets. Safe to run more than once.
+
+IF COL_LENGTH('dbo.Orders', 'RowVer') IS NULL
+    ALTER TABLE Orders ADD RowVer ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.Order_Details', 'RowVer') IS NULL
+    ALTER TABLE Order_Details ADD RowVer ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.Kitchen_Tickets', 'RowVer') IS NULL
+    ALTER TABLE Kitchen_Tickets ADD RowVer ROWVERSION;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Orders_RowVer' AND object_id = OBJECT_ID('dbo.Orders'))
+    CREATE NONCLUSTERED INDEX IX_Orders_RowVer ON dbo.Orders (RowVer);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Order_Details_RowVer' AND object_id = OBJECT_ID('dbo.Order_Details'))
+    CREATE NONCLUSTERED INDEX IX_Order_Details_RowVer ON dbo.Order_Details (RowVer) INCLUDE (OrderID);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Kitchen_Tickets_RowVer' AND object_id = OBJECT_ID('dbo.Kitchen_Tickets'))
+    CREATE NONCLUSTERED INDEX IX_Kitchen_Tickets_RowVer ON dbo.Kitchen_Tickets (RowVer) INCLUDE (OrderID);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Kitchen_Tickets_Status' AND object_id = OBJECT_ID('dbo.Kitchen_Tickets'))
+    CREATE NONCLUSTERED INDEX IX_Kitchen_Tickets_Status ON dbo.Kitchen_Tickets (Status) INCLUDE (OrderID);
+GO
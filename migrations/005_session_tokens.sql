@@ -0,0 +1,21 @@
+-- Session token lookups for the admin gateway (auth.py).
+-- Every rerun whose cached token has aged out looks it up by Token; tokens are
+-- stored as SHA-256 hex, never in the clear. Safe to run more than once.
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Session_Tokens_Token' AND object_id = OBJECT_ID('dbo.Session_Tokens'))
+    CREATE NONCLUSTERED INDEX IX_Session_Tokens_Token ON dbo.Session_Tokens (Token) INCLUDE (UserID, Expiry);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Session_Tokens_UserID' AND object_id = OBJECT_ID('dbo.Session_Tokens'))
+    CREATE NONCLUSTERED INDEX IX_Session_Tokens_UserID ON dbo.Session_Tokens (UserID, Expiry);
+GO
+
+-- The periodic purge of expired tokens (auth.PURGE_SQL)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Session_Tokens_Expiry' AND object_id = OBJECT_ID('dbo.Session_Tokens'))
+    CREATE NONCLUSTERED INDEX IX_Session_Tokens_Expiry ON dbo.Session_Tokens (Expiry);
+GO
+
+-- Tokens issued before this release never existed; clear any hand-made rows
+-- whose Expiry has passed
+DELETE FROM Session_Tokens WHERE Expiry <= GETDATE();
+GO
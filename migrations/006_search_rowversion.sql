@@ -0,0 +1,19 @@
+-- Change tracking for the guest / lead search index (search_index.py).
+-- The admin app indexes Booking_Inquiries and Guests once, then reads only the
+-- rows whose ROWVERSION moved since its last pass. Safe to run more than once.
+
+IF COL_LENGTH('dbo.Booking_Inquiries', 'RowVer') IS NULL
+    ALTER TABLE Booking_Inquiries ADD RowVer ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.Guests', 'RowVer') IS NULL
+    ALTER TABLE Guests ADD RowVer ROWVERSION;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Booking_Inquiries_RowVer' AND object_id = OBJECT_ID('dbo.Booking_Inquiries'))
+    CREATE NONCLUSTERED INDEX IX_Booking_Inquiries_RowVer ON dbo.Booking_Inquiries (RowVer) INCLUDE (FullName, GuestPhone);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Guests_RowVer' AND object_id = OBJECT_ID('dbo.Guests'))
+    CREATE NONCLUSTERED INDEX IX_Guests_RowVer ON dbo.Guests (RowVer) INCLUDE (FirstName, LastName, Phone, Email, Identity_No);
+GO
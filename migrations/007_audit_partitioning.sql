@@ -0,0 +1,136 @@
+-- Month-partitioned Audit_Logs (audit_archive.py).
+-- Audit_Logs is rebuilt clustered on (LogTime, LogID) over one partition per
+-- month, page compressed. New rows always land at the end of the current
+-- month's partition, so the cost of the triggers' INSERT does not grow with
+-- history. Range queries on LogTime read only the months they cover, and
+-- archived months are dropped with TRUNCATE ... WITH (PARTITIONS ...).
+-- Action moves from TEXT (always off-row) to VARCHAR(MAX), which stays in-row.
+-- Safe to run more than once; the rebuild takes a while on a large table.
+
+-- One boundary per month from the oldest row to three months ahead;
+-- sp_Audit_Maintain_Partitions keeps adding them from then on
+IF NOT EXISTS (SELECT 1 FROM sys.partition_functions WHERE name = 'pf_Audit_Month')
+BEGIN
+    DECLARE @m DATE = DATEFROMPARTS(YEAR(ISNULL((SELECT MIN(LogTime) FROM Audit_Logs), GETDATE())),
+                                    MONTH(ISNULL((SELECT MIN(LogTime) FROM Audit_Logs), GETDATE())), 1);
+    DECLARE @last DATE = DATEADD(MONTH, 3, DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1));
+    DECLARE @values NVARCHAR(MAX) = N'';
+    WHILE @m <= @last
+    BEGIN
+        SET @values += CASE WHEN @values = N'' THEN N'' ELSE N', ' END + N'''' + CONVERT(NCHAR(8), @m, 112) + N'''';
+        SET @m = DATEADD(MONTH, 1, @m);
+    END
+    EXEC (N'CREATE PARTITION FUNCTION pf_Audit_Month (DATETIME) AS RANGE RIGHT FOR VALUES (' + @values + N')');
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = 'ps_Audit_Month')
+    CREATE PARTITION SCHEME ps_Audit_Month AS PARTITION pf_Audit_Month ALL TO ([PRIMARY]);
+GO
+
+IF EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('dbo.Audit_Logs') AND name = 'Action' AND system_type_id = TYPE_ID('text'))
+    ALTER TABLE Audit_Logs ALTER COLUMN Action VARCHAR(MAX);
+GO
+
+-- The partitioning column has to be part of every key
+IF COLUMNPROPERTY(OBJECT_ID('dbo.Audit_Logs'), 'LogTime', 'AllowsNull') = 1
+BEGIN
+    UPDATE Audit_Logs SET LogTime = '19000101' WHERE LogTime IS NULL;
+    ALTER TABLE Audit_Logs ALTER COLUMN LogTime DATETIME NOT NULL;
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'CX_Audit_Logs_LogTime' AND object_id = OBJECT_ID('dbo.Audit_Logs'))
+BEGIN
+    DECLARE @pk SYSNAME = (SELECT name FROM sys.key_constraints
+                           WHERE parent_object_id = OBJECT_ID('dbo.Audit_Logs') AND type = 'PK');
+    IF @pk IS NOT NULL
+        EXEC (N'ALTER TABLE Audit_Logs DROP CONSTRAINT ' + @pk);
+    -- The clustered index below covers what this one served
+    IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Audit_Logs_LogTime' AND object_id = OBJECT_ID('dbo.Audit_Logs'))
+        DROP INDEX IX_Audit_Logs_LogTime ON dbo.Audit_Logs;
+    CREATE CLUSTERED INDEX CX_Audit_Logs_LogTime ON dbo.Audit_Logs (LogTime, LogID)
+        WITH (DATA_COMPRESSION = PAGE) ON ps_Audit_Month (LogTime);
+    ALTER TABLE Audit_Logs ADD CONSTRAINT PK_Audit_Logs PRIMARY KEY NONCLUSTERED (LogID, LogTime)
+        WITH (DATA_COMPRESSION = PAGE) ON ps_Audit_Month (LogTime);
+END
+GO
+
+-- Security Logs filtered by user; aligned with the table so partitions can still be truncated
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Audit_Logs_UserID' AND object_id = OBJECT_ID('dbo.Audit_Logs'))
+    CREATE NONCLUSTERED INDEX IX_Audit_Logs_UserID ON dbo.Audit_Logs (UserID, LogTime)
+        WITH (DATA_COMPRESSION = PAGE) ON ps_Audit_Month (LogTime);
+GO
+
+----------------------------------------------------------------------------------
+
+-- Adds month boundaries up to @Months_Ahead ahead. Splitting a partition that
+-- has no rows yet is a metadata change.
+CREATE OR ALTER PROCEDURE sp_Audit_Maintain_Partitions
+    @Months_Ahead INT = 3
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @m DATE = DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1);
+    DECLARE @last DATE = DATEADD(MONTH, @Months_Ahead, @m);
+    WHILE @m <= @last
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM sys.partition_range_values v
+                       JOIN sys.partition_functions f ON f.function_id = v.function_id
+                       WHERE f.name = 'pf_Audit_Month' AND CAST(v.value AS DATETIME) = CAST(@m AS DATETIME))
+        BEGIN
+            ALTER PARTITION SCHEME ps_Audit_Month NEXT USED [PRIMARY];
+            DECLARE @b DATETIME = @m;
+            ALTER PARTITION FUNCTION pf_Audit_Month() SPLIT RANGE (@b);
+        END
+        SET @m = DATEADD(MONTH, 1, @m);
+    END
+END
+GO
+
+-- Removes one month the archiver has already written out. @Expected_Rows is
+-- the number of rows it wrote; if the month has changed since, nothing is
+-- removed and the archiver tries again on its next run. A partition holding
+-- only this month is truncated and its boundary merged away; otherwise the
+-- month's rows are deleted.
+CREATE OR ALTER PROCEDURE sp_Audit_Drop_Month
+    @Month DATE,
+    @Expected_Rows INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    DECLARE @from DATETIME = @Month, @to DATETIME = DATEADD(MONTH, 1, @Month);
+    DECLARE @p INT = $PARTITION.pf_Audit_Month(@from);
+    BEGIN TRAN;
+    DECLARE @month_rows INT = (SELECT COUNT(*) FROM Audit_Logs WITH (TABLOCKX, HOLDLOCK)
+                               WHERE LogTime >= @from AND LogTime < @to);
+    IF @month_rows <> @Expected_Rows
+    BEGIN
+        ROLLBACK;
+        DECLARE @label VARCHAR(7) = CONVERT(VARCHAR(7), @Month, 120);
+        RAISERROR ('Audit month %s changed since it was archived (%d rows, %d archived)', 16, 1,
+                   @label, @month_rows, @Expected_Rows);
+        RETURN;
+    END
+    DECLARE @partition_rows BIGINT = (SELECT SUM(rows) FROM sys.partitions
+                                      WHERE object_id = OBJECT_ID('dbo.Audit_Logs') AND index_id = 1
+                                        AND partition_number = @p);
+    IF @partition_rows = @month_rows
+        EXEC (N'TRUNCATE TABLE Audit_Logs WITH (PARTITIONS (' + CAST(@p AS NVARCHAR(10)) + N'))');
+    ELSE
+        DELETE FROM Audit_Logs WHERE LogTime >= @from AND LogTime < @to;
+    COMMIT;
+
+    -- Both sides of the boundary are now empty, so the merge moves no rows
+    IF @partition_rows = @month_rows AND EXISTS (
+        SELECT 1 FROM sys.partition_range_values v
+        JOIN sys.partition_functions f ON f.function_id = v.function_id
+        WHERE f.name = 'pf_Audit_Month' AND CAST(v.value AS DATETIME) = @from)
+        AND NOT EXISTS (SELECT 1 FROM Audit_Logs WHERE LogTime < @from)
+        ALTER PARTITION FUNCTION pf_Audit_Month() MERGE RANGE (@from);
+END
+GO
+
+EXEC sp_Audit_Maintain_Partitions;
+GO
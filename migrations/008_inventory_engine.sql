@@ -0,0 +1,169 @@
+-- Stock ledger and reorder drafts (inventory_engine.py).
+-- Stock_Issues, Damaged_Stock and Goods_Received now post their quantities to
+-- Current_Inventory from triggers, in the same transaction as the event, so
+-- on-hand stock is always the opening balance plus every event since. Do not
+-- also adjust Current_Inventory by hand after an issue, damage or receipt: the
+-- trigger has already posted it, so the edit counts it a second time. Correct
+-- the event row instead (an edit or delete posts the difference). A purchase
+-- order is received in one Goods_Received row; a second receipt for the same
+-- PO is refused, since it would post every PO line again. The engine reads only the Current_Inventory / Stock_Items rows whose ROWVERSION
+-- moved. Purchase_Orders get a Status so drafted reorders can be told apart.
+-- vw_Stock_Alerts took its vendor from Vendors.VendorID = Stock_Items.InvCatID;
+-- the preferred vendor is now the one that last supplied the item.
+-- Safe to run more than once.
+
+IF COL_LENGTH('dbo.Current_Inventory', 'RowVer') IS NULL
+    ALTER TABLE Current_Inventory ADD RowVer ROWVERSION;
+GO
+
+IF COL_LENGTH('dbo.Stock_Items', 'RowVer') IS NULL
+    ALTER TABLE Stock_Items ADD RowVer ROWVERSION;
+GO
+
+-- Existing orders were placed before statuses existed
+IF COL_LENGTH('dbo.Purchase_Orders', 'Status') IS NULL
+    ALTER TABLE Purchase_Orders ADD Status VARCHAR(20) NOT NULL CONSTRAINT DF_Purchase_Orders_Status DEFAULT 'Ordered';
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Current_Inventory_RowVer' AND object_id = OBJECT_ID('dbo.Current_Inventory'))
+    CREATE NONCLUSTERED INDEX IX_Current_Inventory_RowVer ON dbo.Current_Inventory (RowVer) INCLUDE (StockID);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Current_Inventory_StockID' AND object_id = OBJECT_ID('dbo.Current_Inventory'))
+    CREATE NONCLUSTERED INDEX IX_Current_Inventory_StockID ON dbo.Current_Inventory (StockID) INCLUDE (Qty);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Stock_Items_RowVer' AND object_id = OBJECT_ID('dbo.Stock_Items'))
+    CREATE NONCLUSTERED INDEX IX_Stock_Items_RowVer ON dbo.Stock_Items (RowVer);
+GO
+
+-- Latest supplier per item, and what Goods_Received posts
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PO_Details_StockID' AND object_id = OBJECT_ID('dbo.PO_Details'))
+    CREATE NONCLUSTERED INDEX IX_PO_Details_StockID ON dbo.PO_Details (StockID, PO_ID) INCLUDE (Qty);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PO_Details_PO_ID' AND object_id = OBJECT_ID('dbo.PO_Details'))
+    CREATE NONCLUSTERED INDEX IX_PO_Details_PO_ID ON dbo.PO_Details (PO_ID) INCLUDE (StockID, Qty);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Goods_Received_PO_ID' AND object_id = OBJECT_ID('dbo.Goods_Received'))
+    CREATE NONCLUSTERED INDEX IX_Goods_Received_PO_ID ON dbo.Goods_Received (PO_ID);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Purchase_Orders_Status' AND object_id = OBJECT_ID('dbo.Purchase_Orders'))
+    CREATE NONCLUSTERED INDEX IX_Purchase_Orders_Status ON dbo.Purchase_Orders (Status);
+GO
+
+----------------------------------------------------------------------------------
+
+IF TYPE_ID('dbo.Stock_Delta') IS NULL
+    CREATE TYPE Stock_Delta AS TABLE (StockID INT PRIMARY KEY, Qty INT NOT NULL);
+GO
+
+-- Adds each delta to the item's first Current_Inventory row, creating one if
+-- the item has none yet
+CREATE OR ALTER PROCEDURE sp_Post_Stock_Deltas
+    @Deltas Stock_Delta READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    UPDATE CI SET Qty = ISNULL(CI.Qty, 0) + D.Qty
+    FROM Current_Inventory CI
+    JOIN @Deltas D ON CI.StockID = D.StockID
+    WHERE CI.InvID = (SELECT MIN(InvID) FROM Current_Inventory WHERE StockID = D.StockID);
+
+    INSERT INTO Current_Inventory (StockID, Qty)
+    SELECT D.StockID, D.Qty FROM @Deltas D
+    WHERE NOT EXISTS (SELECT 1 FROM Current_Inventory CI WHERE CI.StockID = D.StockID);
+END
+GO
+
+-- Issues and damages take stock out; an edit or delete puts the old quantity back
+CREATE OR ALTER TRIGGER trg_Stock_Issues_Post ON Stock_Issues
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @d Stock_Delta;
+    INSERT INTO @d (StockID, Qty)
+    SELECT StockID, SUM(Qty) FROM (SELECT StockID, -ISNULL(Qty, 0) AS Qty FROM inserted
+                                   UNION ALL SELECT StockID, ISNULL(Qty, 0) FROM deleted) x
+    WHERE StockID IS NOT NULL
+    GROUP BY StockID HAVING SUM(Qty) <> 0;
+    IF EXISTS (SELECT 1 FROM @d)
+        EXEC sp_Post_Stock_Deltas @d;
+END
+GO
+
+CREATE OR ALTER TRIGGER trg_Damaged_Stock_Post ON Damaged_Stock
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @d Stock_Delta;
+    INSERT INTO @d (StockID, Qty)
+    SELECT StockID, SUM(Qty) FROM (SELECT StockID, -ISNULL(Qty, 0) AS Qty FROM inserted
+                                   UNION ALL SELECT StockID, ISNULL(Qty, 0) FROM deleted) x
+    WHERE StockID IS NOT NULL
+    GROUP BY StockID HAVING SUM(Qty) <> 0;
+    IF EXISTS (SELECT 1 FROM @d)
+        EXEC sp_Post_Stock_Deltas @d;
+END
+GO
+
+-- A goods receipt brings in every line of its purchase order. Receipts carry
+-- no quantities of their own, so a PO can be received only once; receipts
+-- recorded before this migration are left as they are.
+CREATE OR ALTER TRIGGER trg_Goods_Received_Post ON Goods_Received
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1
+               FROM inserted i
+               LEFT JOIN deleted d ON d.GRN_ID = i.GRN_ID
+               WHERE (d.GRN_ID IS NULL OR d.PO_ID <> i.PO_ID)
+                 AND (SELECT COUNT(*) FROM Goods_Received G WHERE G.PO_ID = i.PO_ID) > 1)
+        THROW 51000, 'This purchase order has already been received.', 1;
+
+    DECLARE @d Stock_Delta;
+    INSERT INTO @d (StockID, Qty)
+    SELECT PD.StockID, SUM(x.Sign * ISNULL(PD.Qty, 0))
+    FROM (SELECT PO_ID, 1 AS Sign FROM inserted UNION ALL SELECT PO_ID, -1 FROM deleted) x
+    JOIN PO_Details PD ON PD.PO_ID = x.PO_ID
+    WHERE PD.StockID IS NOT NULL
+    GROUP BY PD.StockID HAVING SUM(x.Sign * ISNULL(PD.Qty, 0)) <> 0;
+    IF EXISTS (SELECT 1 FROM @d)
+        EXEC sp_Post_Stock_Deltas @d;
+
+    UPDATE P SET Status = 'Received'
+    FROM Purchase_Orders P JOIN inserted i ON P.PO_ID = i.PO_ID
+    WHERE P.Status <> 'Received';
+END
+GO
+
+----------------------------------------------------------------------------------
+
+CREATE OR ALTER VIEW vw_Stock_Preferred_Vendor AS
+SELECT StockID, VendorID, VendorName
+FROM (SELECT PD.StockID, P.VendorID, V.VendorName,
+             ROW_NUMBER() OVER (PARTITION BY PD.StockID ORDER BY P.PO_ID DESC) AS rn
+      FROM PO_Details PD
+      JOIN Purchase_Orders P ON PD.PO_ID = P.PO_ID
+      JOIN Vendors V ON P.VendorID = V.VendorID) x
+WHERE rn = 1;
+GO
+
+CREATE OR ALTER VIEW vw_Stock_Alerts AS
+SELECT
+    S.StockID,
+    S.ItemName,
+    PV.VendorName AS PreferredVendor,
+    CI.Qty AS Current_Quantity,
+    S.MinQty AS Minimum_Required,
+    (S.MinQty - CI.Qty) AS Order_Quantity_Needed
+FROM Stock_Items S
+JOIN (SELECT StockID, SUM(Qty) AS Qty FROM Current_Inventory GROUP BY StockID) CI ON S.StockID = CI.StockID
+LEFT JOIN vw_Stock_Preferred_Vendor PV ON S.StockID = PV.StockID
+WHERE CI.Qty <= S.MinQty;
+GO
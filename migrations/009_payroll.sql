@@ -0,0 +1,124 @@
+-- Month-close payroll (payroll.py).
+-- Attendance gains the shift worked and the hours clocked, so overtime is
+-- measurable; Leave_Records gain the dates they cover, so approved leave can
+-- be matched to the days it excuses. Salary_Slips keep the breakdown behind
+-- NetPay, and GeneratedAt tells run-written slips from hand-entered ones.
+-- sp_Write_Salary_Slips takes a whole month's slips in one table-valued
+-- parameter and replaces what an earlier run wrote, so a rerun changes
+-- nothing unless the inputs did.
+-- Safe to run more than once.
+
+IF COL_LENGTH('dbo.Attendance', 'ShiftID') IS NULL
+    ALTER TABLE Attendance ADD ShiftID INT NULL CONSTRAINT FK_Attendance_Shifts REFERENCES Shifts(ShiftID);
+GO
+
+IF COL_LENGTH('dbo.Attendance', 'HoursWorked') IS NULL
+    ALTER TABLE Attendance ADD HoursWorked DECIMAL(5,2);
+GO
+
+IF COL_LENGTH('dbo.Leave_Records', 'StartDate') IS NULL
+    ALTER TABLE Leave_Records ADD StartDate DATE;
+GO
+
+IF COL_LENGTH('dbo.Leave_Records', 'EndDate') IS NULL
+    ALTER TABLE Leave_Records ADD EndDate DATE;
+GO
+
+IF COL_LENGTH('dbo.Salary_Slips', 'BasicPay') IS NULL
+    ALTER TABLE Salary_Slips ADD BasicPay DECIMAL(10,2);
+GO
+
+IF COL_LENGTH('dbo.Salary_Slips', 'DaysDeducted') IS NULL
+    ALTER TABLE Salary_Slips ADD DaysDeducted DECIMAL(5,2);
+GO
+
+IF COL_LENGTH('dbo.Salary_Slips', 'Deductions') IS NULL
+    ALTER TABLE Salary_Slips ADD Deductions DECIMAL(10,2);
+GO
+
+IF COL_LENGTH('dbo.Salary_Slips', 'OvertimeHours') IS NULL
+    ALTER TABLE Salary_Slips ADD OvertimeHours DECIMAL(6,2);
+GO
+
+IF COL_LENGTH('dbo.Salary_Slips', 'OvertimePay') IS NULL
+    ALTER TABLE Salary_Slips ADD OvertimePay DECIMAL(10,2);
+GO
+
+-- NULL for slips entered by hand
+IF COL_LENGTH('dbo.Salary_Slips', 'GeneratedAt') IS NULL
+    ALTER TABLE Salary_Slips ADD GeneratedAt DATETIME;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Attendance_Date' AND object_id = OBJECT_ID('dbo.Attendance'))
+    CREATE NONCLUSTERED INDEX IX_Attendance_Date ON dbo.Attendance (Date) INCLUDE (EmpID, Status, ShiftID, HoursWorked);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Leave_Records_Status_StartDate' AND object_id = OBJECT_ID('dbo.Leave_Records'))
+    CREATE NONCLUSTERED INDEX IX_Leave_Records_Status_StartDate ON dbo.Leave_Records (Status, StartDate) INCLUDE (EmpID, LeaveType, EndDate);
+GO
+
+-- One slip per employee per month. Hand-entered duplicates are left alone
+-- (and the index is not created) until someone resolves them.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_Salary_Slips_EmpID_Month' AND object_id = OBJECT_ID('dbo.Salary_Slips'))
+   AND NOT EXISTS (SELECT 1 FROM Salary_Slips WHERE EmpID IS NOT NULL AND Month IS NOT NULL
+                   GROUP BY EmpID, Month HAVING COUNT(*) > 1)
+    CREATE UNIQUE NONCLUSTERED INDEX UX_Salary_Slips_EmpID_Month ON dbo.Salary_Slips (EmpID, Month)
+    WHERE EmpID IS NOT NULL AND Month IS NOT NULL;
+GO
+
+----------------------------------------------------------------------------------
+
+IF TYPE_ID('dbo.Salary_Slip_Row') IS NULL
+    CREATE TYPE Salary_Slip_Row AS TABLE (
+        EmpID INT PRIMARY KEY,
+        BasicPay DECIMAL(10,2) NOT NULL,
+        DaysDeducted DECIMAL(5,2) NOT NULL,
+        Deductions DECIMAL(10,2) NOT NULL,
+        OvertimeHours DECIMAL(6,2) NOT NULL,
+        OvertimePay DECIMAL(10,2) NOT NULL,
+        NetPay DECIMAL(10,2) NOT NULL);
+GO
+
+-- Month is 'YYYY-MM'. Slips an earlier run wrote are updated in place,
+-- missing ones inserted, and run-written slips for employees no longer in
+-- @Slips removed. A slip entered by hand (GeneratedAt IS NULL) is never
+-- touched; its employee is counted as skipped. Returns the four counts.
+CREATE OR ALTER PROCEDURE sp_Write_Salary_Slips
+    @Month VARCHAR(20),
+    @Slips Salary_Slip_Row READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    BEGIN TRAN;
+    -- One payroll run at a time, however many app processes call it
+    EXEC sp_getapplock @Resource = 'sp_Write_Salary_Slips', @LockMode = 'Exclusive', @LockOwner = 'Transaction';
+    DECLARE @now DATETIME = GETDATE(), @removed INT, @updated INT, @inserted INT, @skipped INT;
+
+    DELETE S FROM Salary_Slips S
+    WHERE S.Month = @Month AND S.GeneratedAt IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM @Slips N WHERE N.EmpID = S.EmpID);
+    SET @removed = @@ROWCOUNT;
+
+    UPDATE S SET BasicPay = N.BasicPay, DaysDeducted = N.DaysDeducted, Deductions = N.Deductions,
+                 OvertimeHours = N.OvertimeHours, OvertimePay = N.OvertimePay, NetPay = N.NetPay,
+                 GeneratedAt = @now
+    FROM Salary_Slips S JOIN @Slips N ON S.EmpID = N.EmpID
+    WHERE S.Month = @Month AND S.GeneratedAt IS NOT NULL;
+    SET @updated = @@ROWCOUNT;
+
+    SELECT @skipped = COUNT(DISTINCT N.EmpID)
+    FROM @Slips N JOIN Salary_Slips S ON S.EmpID = N.EmpID
+    WHERE S.Month = @Month AND S.GeneratedAt IS NULL;
+
+    INSERT INTO Salary_Slips (EmpID, Month, BasicPay, DaysDeducted, Deductions, OvertimeHours, OvertimePay, NetPay, GeneratedAt)
+    SELECT N.EmpID, @Month, N.BasicPay, N.DaysDeducted, N.Deductions, N.OvertimeHours, N.OvertimePay, N.NetPay, @now
+    FROM @Slips N
+    -- Any slip of the month blocks the insert, so a hand-entered one is left alone
+    WHERE NOT EXISTS (SELECT 1 FROM Salary_Slips S WHERE S.EmpID = N.EmpID AND S.Month = @Month);
+    SET @inserted = @@ROWCOUNT;
+
+    COMMIT;
+    SELECT @inserted AS inserted, @updated AS updated, @removed AS removed, @skipped AS skipped;
+END
+GO
@@ -0,0 +1,45 @@
+-- Audit rows for writes made by no signed-in user.
+-- The audit triggers took ISNULL(SESSION_CONTEXT('UserID'), 1), so every write
+-- by the apps' background jobs (inquiry spool, rollups, payroll runs without
+-- an admin, inventory drafts), whose pooled connections carry no UserID
+-- (db_pool.ConnectionPool), was logged against UserID 1, a real account.
+-- They now log UserID NULL, which the Security Logs page shows as "(system)".
+-- 0, what the admin app sends before anyone has signed in, is treated the
+-- same way (it is not a System_Users row, so the insert used to fail).
+-- Recreates every existing trg_<table>_Audit trigger. Safe to run more than once.
+
+DECLARE @TableName SYSNAME;
+DECLARE @SQL NVARCHAR(MAX);
+
+DECLARE table_cursor CURSOR LOCAL FAST_FORWARD FOR
+SELECT t.name FROM sys.tables t
+JOIN sys.triggers tr ON tr.parent_id = t.object_id AND tr.name = 'trg_' + t.name + '_Audit';
+
+OPEN table_cursor;
+FETCH NEXT FROM table_cursor INTO @TableName;
+WHILE @@FETCH_STATUS = 0
+BEGIN
+    SET @SQL = N'
+    CREATE OR ALTER TRIGGER ' + QUOTENAME('trg_' + @TableName + '_Audit') + N'
+    ON ' + QUOTENAME(@TableName) + N'
+    AFTER UPDATE, DELETE
+    AS
+    BEGIN
+        SET NOCOUNT ON;
+        -- NULL: a background job or the system, not a person
+        DECLARE @UserID INT = NULLIF(CAST(SESSION_CONTEXT(N''UserID'') AS INT), 0);
+
+        IF EXISTS (SELECT * FROM deleted) AND NOT EXISTS (SELECT * FROM inserted)
+            INSERT INTO Audit_Logs (UserID, Action, TableAffected)
+            VALUES (@UserID, ''DELETE operation performed'', ' + QUOTENAME(@TableName, '''') + N');
+
+        IF EXISTS (SELECT * FROM deleted) AND EXISTS (SELECT * FROM inserted)
+            INSERT INTO Audit_Logs (UserID, Action, TableAffected)
+            VALUES (@UserID, ''UPDATE operation performed'', ' + QUOTENAME(@TableName, '''') + N');
+    END';
+    EXEC sp_executesql @SQL;
+    FETCH NEXT FROM table_cursor INTO @TableName;
+END
+CLOSE table_cursor;
+DEALLOCATE table_cursor;
+GO
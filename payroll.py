@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Month-close payroll (fills Salary_Slips, which used to be typed in by hand).
+# Employees, the month's Attendance, the approved Leave_Records that overlap it
+# and Shifts are each read in one query; pay is worked out on whole columns
+# with pandas/NumPy, never employee by employee. Staffs of PARALLEL_FROM or
+# more are split by department over a process pool. The slips go to
+# sp_Write_Salary_Slips (migrations/009_payroll.sql) as one table-valued
+# parameter, and it replaces what an earlier run of the month wrote, so
+# running a month again is safe.
+#
+# Rules: the daily rate is Salary / days in the month. An absence, or a
+# 'Leave' day without approved leave behind it, costs a day, and a late
+# arrival a quarter of one (DEDUCTED_DAYS). Approved Casual, Sick or Annual leave costs nothing;
+# approved Unpaid leave costs each day it covers. Hours clocked beyond the
+# shift's length are overtime at OVERTIME_RATE times the hourly rate
+# (daily rate / STANDARD_HOURS); an 'Overtime' day with no hours recorded
+# counts OVERTIME_HOURS. Days with no attendance record are paid.
+
+DEDUCTED_DAYS = {'Absent': 1.0, 'Leave': 1.0, 'Half Day': 0.5, 'Late': 0.25}
+PAID_LEAVE = ('Casual', 'Sick', 'Annual')
+STANDARD_HOURS = 8
+OVERTIME_RATE = 1.5
+OVERTIME_HOURS = 2
+PARALLEL_FROM = 20000
+
+EMPLOYEES_SQL = "SELECT EmpID, FullName, DeptID, Salary FROM Employees WHERE Salary IS NOT NULL"
+ATTENDANCE_SQL = "SELECT EmpID, Date, Status, ShiftID, HoursWorked FROM Attendance WHERE Date >= ? AND Date < ?"
+LEAVES_SQL = """SELECT EmpID, LeaveType, StartDate, EndDate FROM Leave_Records
+WHERE Status = 'Approved' AND StartDate < ? AND EndDate >= ?"""
+SHIFTS_SQL = "SELECT ShiftID, StartTime, EndTime FROM Shifts"
+SLIPS_SQL = """SELECT S.SlipID, S.EmpID, E.FullName, S.BasicPay, S.DaysDeducted, S.Deductions,
+       S.OvertimeHours, S.OvertimePay, S.NetPay, S.GeneratedAt
+FROM Salary_Slips S LEFT JOIN Employees E ON S.EmpID = E.EmpID
+WHERE S.Month = ? ORDER BY S.EmpID"""
+WRITE_SQL = "{CALL sp_Write_Salary_Slips (?, ?)}"
+
+SLIP_COLUMNS = ['EmpID', 'BasicPay', 'DaysDeducted', 'Deductions', 'OvertimeHours', 'OvertimePay', 'NetPay']
+
+
+def month_range(month):
+    # 'YYYY-MM' -> (first day, first day of the next month)
+    first = datetime.strptime(month, '%Y-%m').date()
+    return first, date(first.year + first.month // 12, first.month % 12 + 1, 1)
+
+
+def _frame(cur, sql, params=()):
+    cur.execute(sql, params)
+    return pd.DataFrame.from_records(cur.fetchall(), columns=[c[0] for c in cur.description])
+
+
+def load_month(conn, month):
+    # -> (employees, attendance, leaves, shifts), four queries on one connection
+    first, after = month_range(month)
+    cur = conn.cursor()
+    return (_frame(cur, EMPLOYEES_SQL), _frame(cur, ATTENDANCE_SQL, (first, after)),
+            _frame(cur, LEAVES_SQL, (after, first)), _frame(cur, SHIFTS_SQL))
+
+
+def _hours(times):
+    # TIME values (or 'HH:MM[:SS]' text) -> hours past midnight
+    if times.empty:
+        return pd.Series(dtype=float)
+    parts = times.astype(str).str.split(':', expand=True)
+    return parts[0].astype(float) + parts[1].astype(float) / 60
+
+
+def _leave_days(leaves, first, after):
+    # One row per (EmpID, Date) an approved leave covers inside the month; paid wins over unpaid
+    start = pd.to_datetime(leaves['StartDate']).clip(lower=pd.Timestamp(first)).values.astype('datetime64[D]')
+    end = pd.to_datetime(leaves['EndDate']).clip(upper=pd.Timestamp(after) - pd.Timedelta(days=1)).values.astype('datetime64[D]')
+    days = np.maximum((end - start).astype(int) + 1, 0)
+    offsets = np.arange(days.sum()) - np.repeat(np.cumsum(days) - days, days)
+    out = pd.DataFrame({'EmpID': np.repeat(leaves['EmpID'].to_numpy(), days),
+                        'Date': np.repeat(start, days) + offsets.astype('timedelta64[D]'),
+                        'Paid': np.repeat(leaves['LeaveType'].isin(PAID_LEAVE).to_numpy(), days)})
+    return out.groupby(['EmpID', 'Date'], as_index=False)['Paid'].max()
+
+
+def compute_slips(month, employees, attendance, leaves, shifts):
+    # -> one row per employee: EmpID, FullName, DeptID and the SLIP_COLUMNS after EmpID
+    first, after = month_range(month)
+    days_in_month = (after - first).days
+
+    att = attendance.assign(Date=pd.to_datetime(attendance['Date']).values.astype('datetime64[D]'))
+    att = att.drop_duplicates(['EmpID', 'Date'])
+    shift_hours = pd.Series(((_hours(shifts['EndTime']) - _hours(shifts['StartTime'])) % 24).to_numpy(),
+                            index=shifts['ShiftID'])
+    att['ShiftHours'] = att['ShiftID'].map(shift_hours).fillna(STANDARD_HOURS).astype(float)
+
+    days = att.merge(_leave_days(leaves, first, after), on=['EmpID', 'Date'], how='outer')
+    status_days = days['Status'].map(DEDUCTED_DAYS).fillna(0.0)
+    days['Deducted'] = np.where(days['Paid'].isna(), status_days, np.where(days['Paid'].eq(True), 0.0, 1.0))
+    worked = pd.to_numeric(days['HoursWorked'], errors='coerce').astype(float)
+    extra = (worked - days['ShiftHours']).clip(lower=0)
+    days['Overtime'] = extra.fillna(pd.Series(np.where(days['Status'] == 'Overtime', OVERTIME_HOURS, 0.0),
+                                              index=days.index))
+    per_emp = days.groupby('EmpID')[['Deducted', 'Overtime']].sum()
+
+    slips = employees[['EmpID', 'FullName', 'DeptID']].copy()
+    basic = employees['Salary'].astype(float).to_numpy()
+    deducted = slips['EmpID'].map(per_emp['Deducted']).fillna(0.0).to_numpy()
+    overtime = slips['EmpID'].map(per_emp['Overtime']).fillna(0.0).to_numpy()
+    daily = basic / days_in_month
+    slips['BasicPay'] = basic.round(2)
+    slips['DaysDeducted'] = deducted.round(2)
+    slips['Deductions'] = np.minimum(deducted * daily, basic).round(2)
+    slips['OvertimeHours'] = overtime.round(2)
+    slips['OvertimePay'] = (overtime * daily / STANDARD_HOURS * OVERTIME_RATE).round(2)
+    slips['NetPay'] = (slips['BasicPay'] - slips['Deductions'] + slips['OvertimePay']).round(2)
+    return slips
+
+
+def _department(args):
+    return compute_slips(*args)
+
+
+def compute(month, employees, attendance, leaves, shifts, workers=None, parallel_from=PARALLEL_FROM):
+    # Serial below parallel_from employees or with one worker (workers=None is
+    # one per CPU); otherwise one task per department. Spawned, not forked: the
+    # app process has threads.
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(employees) < parallel_from or employees['DeptID'].nunique() < 2:
+        return compute_slips(month, employees, attendance, leaves, shifts)
+    tasks = []
+    for _, staff in employees.groupby(employees['DeptID'].fillna(-1)):
+        ids = staff['EmpID']
+        tasks.append((month, staff, attendance[attendance['EmpID'].isin(ids)],
+                      leaves[leaves['EmpID'].isin(ids)], shifts))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        parts = list(pool.map(_department, tasks))
+    return pd.concat(parts, ignore_index=True).sort_values('EmpID', ignore_index=True)
+
+
+class Payroll:
+    def __init__(self, pool, workers=None):
+        self.pool = pool
+        self.workers = workers
+
+    def preview(self, month):
+        with self.pool.connection() as conn:
+            frames = load_month(conn, month)
+        return compute(month, *frames, workers=self.workers)
+
+    def run(self, month, session_context=None):
+        # -> (slips, {'inserted', 'updated', 'removed', 'skipped'}). session_context
+        # is the acting admin's, so the Salary_Slips audit rows name them.
+        slips = self.preview(month)
+        rows = [(int(emp_id),) + tuple(map(float, pay)) for emp_id, *pay in slips[SLIP_COLUMNS].itertuples(index=False)]
+        with self.pool.connection(session_context) as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(WRITE_SQL, (month, rows))
+                counts = cur.fetchone()
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return slips, {'inserted': counts[0], 'updated': counts[1], 'removed': counts[2], 'skipped': counts[3]}
+
+    def slips(self, month):
+        with self.pool.connection() as conn:
+            return _frame(conn.cursor(), SLIPS_SQL, (month,))
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Result cache for read-mostly catalog queries on the public website.
+# Entries expire on a per-query TTL and the cache is a bounded LRU.
+# The admin app runs in a different process, so writes there are signalled
+# through small stamp files (one per table); an entry is stale as soon as any
+# table it reads from has a stamp newer than the entry itself.
+
+SIGNAL_DIR = os.environ.get(
+    'HMS_CACHE_SIGNAL_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_signals'))
+
+# Tables the website caches or replicates (catalog_replica.py); writes to
+# anything else need no signal
+CATALOG_TABLES = ('Room_Types', 'Spa_Services', 'Restaurant_Outlets', 'Rooms', 'Reservations')
+
+
+def _stamp_path(table):
+    return os.path.join(SIGNAL_DIR, f"{table}.stamp")
+
+
+def signal_change(*tables):
+    # Called by writers (admin Table Explorer) after a successful commit
+    os.makedirs(SIGNAL_DIR, exist_ok=True)
+    now = time.time()
+    for t in tables:
+        if t not in CATALOG_TABLES:
+            continue
+        path = _stamp_path(t)
+        with open(path, 'w') as f:
+            f.write(repr(now))
+        os.utime(path, (now, now))
+
+
+def last_change(table):
+    try:
+        return os.stat(_stamp_path(table)).st_mtime
+    except OSError:
+        return 0.0
+
+
+class QueryCache:
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (value, stored_at, expires_at, tables)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at, expires_at, tables = entry
+            if time.monotonic() >= expires_at or any(last_change(t) > stored_at for t in tables):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, ttl, tables=(), stored_at=None):
+        stored_at = time.time() if stored_at is None else stored_at
+        with self._lock:
+            self._entries[key] = (value, stored_at, time.monotonic() + ttl, tuple(tables))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key, loader, ttl, tables=()):
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        # Stamp with the load start so a write landing mid-query still invalidates
+        started = time.time()
+        value = loader()
+        # Failed loads (None) are not cached so the next rerun retries
+        if value is not None:
+            self.put(key, value, ttl, tables, stored_at=started)
+        return value
+
+    def invalidate(self, *tables):
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if set(e[3]) & set(tables)]
+            for k in stale:
+                del self._entries[k]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
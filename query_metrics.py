@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+# Query timing for both apps.
+# Every statement run through run_query is recorded under a normalized
+# fingerprint (literals -> ?, whitespace collapsed) with wall time, rows
+# returned and bytes materialized into the DataFrame. Statements slower than
+# SLOW_QUERY_MS also go to a rotating log file. Stats are per process; a
+# StatsPublisher writes one process's top statements to LOG_DIR every few
+# seconds, so the admin Performance page can show the website's as well.
+
+SLOW_QUERY_MS = float(os.environ.get('HMS_SLOW_QUERY_MS', 500))
+LOG_DIR = os.environ.get(
+    'HMS_LOG_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs'))
+
+# Recent timings kept per fingerprint for the p95
+WINDOW = 500
+# Statements a published snapshot keeps
+PUBLISH_TOP = 50
+
+
+def fingerprint(sql):
+    s = re.sub(r"--[^\n]*", " ", sql)
+    s = re.sub(r"/\*.*?\*/", " ", s, flags=re.S)
+    s = re.sub(r"N?'(?:[^']|'')*'", "?", s)
+    s = re.sub(r"\b\d+(?:\.\d+)?\b", "?", s)
+    s = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?+)", s)
+    return re.sub(r"\s+", " ", s).strip().lower()
+
+
+def _slow_logger():
+    logger = logging.getLogger('hms.slow_queries')
+    if not logger.handlers:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        handler = RotatingFileHandler(os.path.join(LOG_DIR, 'slow_queries.log'),
+                                      maxBytes=1_000_000, backupCount=5, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class QueryStats:
+    def __init__(self, slow_ms=SLOW_QUERY_MS, app=''):
+        self.slow_ms = slow_ms
+        self.app = app
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, sql, seconds, rows=None, nbytes=None, error=None):
+        fp = fingerprint(sql)
+        ms = seconds * 1000
+        with self._lock:
+            s = self._stats.get(fp)
+            if s is None:
+                s = self._stats[fp] = {'fingerprint': fp, 'calls': 0, 'errors': 0, 'total_ms': 0.0,
+                                       'max_ms': 0.0, 'rows': 0, 'bytes': 0, 'recent': deque(maxlen=WINDOW)}
+            s['calls'] += 1
+            s['errors'] += error is not None
+            s['total_ms'] += ms
+            s['max_ms'] = max(s['max_ms'], ms)
+            s['rows'] += rows or 0
+            s['bytes'] += nbytes or 0
+            s['recent'].append(ms)
+        if ms >= self.slow_ms:
+            _slow_logger().info('%s %.1fms rows=%s bytes=%s%s | %s', self.app or '-', ms, rows, nbytes,
+                                f' error={error!r}' if error is not None else '', fp)
+
+    @contextmanager
+    def timed(self, sql):
+        # Callers fill in info['rows'] / info['bytes'] once they have a result
+        info = {'rows': None, 'bytes': None}
+        start = time.perf_counter()
+        try:
+            yield info
+        except Exception as e:
+            self.record(sql, time.perf_counter() - start, info['rows'], info['bytes'], error=e)
+            raise
+        self.record(sql, time.perf_counter() - start, info['rows'], info['bytes'])
+
+    def top(self, by='total_ms', n=20):
+        with self._lock:
+            rows = []
+            for s in self._stats.values():
+                recent = sorted(s['recent'])
+                p95 = recent[min(len(recent) - 1, int(0.95 * len(recent)))] if recent else 0.0
+                rows.append({'fingerprint': s['fingerprint'], 'calls': s['calls'], 'errors': s['errors'],
+                             'total_ms': s['total_ms'], 'avg_ms': s['total_ms'] / s['calls'],
+                             'p95_ms': p95, 'max_ms': s['max_ms'], 'rows': s['rows'], 'bytes': s['bytes']})
+        return sorted(rows, key=lambda r: r[by], reverse=True)[:n]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def publish(self, path=None, n=PUBLISH_TOP):
+        # Written to a temp file and renamed, so a reader never sees half of it
+        path = path or published_path(self.app)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'app': self.app, 'published': time.time(), 'queries': self.top('total_ms', n)}, f)
+        os.replace(tmp, path)
+
+
+def published_path(app):
+    return os.path.join(LOG_DIR, f'query_stats_{app or "app"}.json')
+
+
+def read_published(app, path=None):
+    # -> (time.time() it was written, top() rows), or (None, []) if never published
+    try:
+        with open(path or published_path(app), encoding='utf-8') as f:
+            data = json.load(f)
+        return data['published'], data['queries']
+    except (OSError, ValueError, KeyError):
+        return None, []
+
+
+class StatsPublisher:
+    def __init__(self, stats, every=15.0, path=None):
+        self.stats = stats
+        self.every = every
+        self.path = path
+        self._thread = None
+        self._stop = threading.Event()
+        self.last_error = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='stats-publisher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.every):
+            try:
+                self.stats.publish(self.path)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,175 @@
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from rollups import split_range
+
+# SQL behind the admin app's report pages.
+# Kept out of `databse UI.py` so the benchmark suite (benchmarks/) times
+# exactly the statements the pages run.
+
+DEPARTMENTS = "SELECT DeptName FROM Departments"
+
+
+# --- QUICK INSIGHTS ---
+# Each report is fixed SQL text with ? markers, so every date or department
+# choice reuses one cached plan instead of compiling a new ad-hoc statement.
+# Reports with a department filter have a second, equally fixed variant.
+Report = namedtuple('Report', 'sql dept_sql params')
+
+
+def _date_params(start, end, dept):
+    return (start, end)
+
+
+def _day_range_params(start, end, dept):
+    # Whole days as a half-open range: >= start 00:00 and < the day after end
+    return (datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min))
+
+
+def _rollup_range_params(start, end, dept):
+    return split_range(start, end)
+
+
+def _dept_params(start, end, dept):
+    return () if dept == "All Departments" else (dept,)
+
+
+QUICK_INSIGHTS = {
+    "Current Occupancy": Report(
+        """SELECT G.FirstName + ' ' + G.LastName AS [Guest], R.RoomNumber, RT.TypeName, Res.CheckInDate, Res.Status
+                   FROM Reservations Res JOIN Guests G ON Res.GuestID = G.GuestID
+                   JOIN Rooms R ON Res.RoomID = R.RoomID JOIN Room_Types RT ON R.TypeID = RT.TypeID
+                   WHERE Res.CheckInDate BETWEEN ? AND ?""",
+        None, _date_params),
+
+    # Joins Guests with Preferences, Blacklist status, and Spa Bookings
+    "Guest Service & Preference History": Report(
+        """SELECT G.FirstName + ' ' + G.LastName AS [Guest],
+                          GP.Preference,
+                          ISNULL(BG.Reason, 'Not Blacklisted') AS [Security Status],
+                          S.ServiceName AS [Last Spa Service],
+                          SB.Date AS [Service Date]
+                   FROM Guests G
+                   LEFT JOIN Guest_Preferences GP ON G.GuestID = GP.GuestID
+                   LEFT JOIN Blacklisted_Guests BG ON G.GuestID = BG.GuestID
+                   LEFT JOIN Spa_Bookings SB ON G.GuestID = SB.GuestID
+                   LEFT JOIN Spa_Services S ON SB.SpaID = S.SpaID
+                   WHERE (SB.Date >= ? AND SB.Date < ?) OR SB.Date IS NULL""",
+        None, _day_range_params),
+
+    "Room Maintenance & Housekeeping Status": Report(
+        """SELECT R.RoomNumber, R.Status AS [Room Status],
+                          HT.Status AS [Task Status],
+                          E.FullName AS [Assigned Staff],
+                          D.DeptName AS [Department]
+                   FROM Rooms R
+                   LEFT JOIN Housekeeping_Tasks HT ON R.RoomID = HT.RoomID
+                   LEFT JOIN Employees E ON HT.EmpID = E.EmpID
+                   LEFT JOIN Departments D ON E.DeptID = D.DeptID""",
+        """SELECT R.RoomNumber, R.Status AS [Room Status],
+                          HT.Status AS [Task Status],
+                          E.FullName AS [Assigned Staff],
+                          D.DeptName AS [Department]
+                   FROM Rooms R
+                   LEFT JOIN Housekeeping_Tasks HT ON R.RoomID = HT.RoomID
+                   LEFT JOIN Employees E ON HT.EmpID = E.EmpID
+                   LEFT JOIN Departments D ON E.DeptID = D.DeptID
+                   WHERE D.DeptName = ?""",
+        _dept_params),
+
+    # Item totals by outlet and category, one row per item, not per order
+    # line: whole days from Daily_Item_Sales, today from the raw order lines
+    # (see rollups.py). "Restaurant Order Lines" below lists the lines.
+    "Detailed Restaurant Order Breakdown": Report(
+        """SELECT RO.OutletName, MC.CategoryName, MI.ItemName, S.Qty, S.LineTotal AS [Line Total]
+                   FROM (SELECT OutletID, ItemID, SUM(Qty) AS Qty, SUM(LineTotal) AS LineTotal
+                         FROM (SELECT OutletID, ItemID, Qty, LineTotal FROM Daily_Item_Sales
+                               WHERE SalesDate >= ? AND SalesDate < ?
+                               UNION ALL
+                               SELECT RT.OutletID, OD.ItemID, OD.Qty, OD.Qty * MI.Price
+                               FROM Orders O
+                               JOIN Order_Details OD ON OD.OrderID = O.OrderID
+                               JOIN Menu_Items MI ON OD.ItemID = MI.ItemID
+                               JOIN Restaurant_Tables RT ON O.TableID = RT.TableID
+                               WHERE O.OrderTime >= ? AND O.OrderTime < ?) U
+                         GROUP BY OutletID, ItemID) S
+                   JOIN Menu_Items MI ON S.ItemID = MI.ItemID
+                   JOIN Menu_Categories MC ON MI.CategoryID = MC.CategoryID
+                   JOIN Restaurant_Outlets RO ON S.OutletID = RO.OutletID
+                   ORDER BY RO.OutletName, MC.CategoryName, MI.ItemName""",
+        None, _rollup_range_params),
+
+    # Every order line with its OrderTime, read from the live tables
+    "Restaurant Order Lines": Report(
+        """SELECT RO.OutletName, MC.CategoryName, MI.ItemName,
+                          OD.Qty, (OD.Qty * MI.Price) AS [Line Total], O.OrderTime
+                   FROM Order_Details OD
+                   JOIN Menu_Items MI ON OD.ItemID = MI.ItemID
+                   JOIN Menu_Categories MC ON MI.CategoryID = MC.CategoryID
+                   JOIN Orders O ON OD.OrderID = O.OrderID
+                   JOIN Restaurant_Tables RT ON O.TableID = RT.TableID
+                   JOIN Restaurant_Outlets RO ON RT.OutletID = RO.OutletID
+                   WHERE O.OrderTime >= ? AND O.OrderTime < ?
+                   ORDER BY O.OrderTime""",
+        None, _day_range_params),
+
+    "Staff Directory & Payroll": Report(
+        """SELECT E.FullName, D.DeptName, Des.Title, E.Salary FROM Employees E
+                   JOIN Departments D ON E.DeptID = D.DeptID JOIN Designations Des ON E.DesigID = Des.DesigID""",
+        """SELECT E.FullName, D.DeptName, Des.Title, E.Salary FROM Employees E
+                   JOIN Departments D ON E.DeptID = D.DeptID JOIN Designations Des ON E.DesigID = Des.DesigID
+                   WHERE D.DeptName = ?""",
+        _dept_params),
+
+    # The page shows and exports InventoryEngine's snapshot instead; this is the
+    # same list in SQL (one row per item, as vw_Stock_Alerts), which the
+    # benchmarks time the engine against
+    "Low Stock Alerts": Report(
+        """SELECT S.StockID, S.ItemName, IC.CatName, I.Qty, S.MinQty
+                   FROM (SELECT StockID, SUM(Qty) AS Qty FROM Current_Inventory GROUP BY StockID) I
+                   JOIN Stock_Items S ON I.StockID = S.StockID
+                   JOIN Inventory_Cats IC ON S.InvCatID = IC.InvCatID
+                   WHERE I.Qty <= S.MinQty""",
+        None, lambda start, end, dept: ()),
+}
+
+
+def bind_report(name, start, end, dept):
+    # -> (sql, params) for the chosen filters; the SQL text never changes with them
+    report = QUICK_INSIGHTS[name]
+    params = report.params(start, end, dept)
+    sql = report.dept_sql if report.dept_sql and params else report.sql
+    return sql, params
+
+
+# --- SECURITY LOGS ---
+# Always bounded by a time range, which is also what lets SQL Server read only
+# the Audit_Logs partitions for those months (migrations/007). The audit trail
+# pages backwards with a (LogTime, LogID) cursor instead of OFFSET.
+AUDIT_PAGE = 50
+
+AUDIT_TRAIL_SQL = """SELECT TOP (?) a.LogID, a.LogTime, u.Username, a.Action, a.TableAffected
+FROM Audit_Logs a LEFT JOIN System_Users u ON a.UserID = u.UserID
+WHERE a.LogTime >= ? AND a.LogTime < ? AND a.LogTime <= ? AND NOT (a.LogTime = ? AND a.LogID >= ?){filters}
+ORDER BY a.LogTime DESC, a.LogID DESC"""
+
+SECURITY_LOGS = {
+    "Failed Logins": """SELECT TOP (200) Username, IP_Address, AttemptTime FROM Failed_Logins
+WHERE AttemptTime >= ? AND AttemptTime < ? ORDER BY AttemptTime DESC""",
+    "Audit Trail": AUDIT_TRAIL_SQL.format(filters=""),
+}
+
+
+def audit_trail_sql(user=None, table=None):
+    # One fixed text per combination of filters in use
+    filters = (" AND u.Username = ?" if user else "") + (" AND a.TableAffected = ?" if table else "")
+    return AUDIT_TRAIL_SQL.format(filters=filters)
+
+
+def bind_security_log(name, start, end, before=None, user=None, table=None, limit=AUDIT_PAGE):
+    # -> (sql, params); [start, end) as datetimes, `before` the (LogTime, LogID) of the last row shown
+    if name == "Failed Logins":
+        return SECURITY_LOGS[name], (start, end)
+    at, log_id = before or (end, 0)
+    params = (limit, start, end, at, at, log_id) + tuple(v for v in (user, table) if v)
+    return audit_trail_sql(user, table), params
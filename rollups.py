@@ -0,0 +1,65 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+# Daily revenue / sales rollups (migrations/002_daily_rollups.sql).
+# Readers split any date range at midnight today: whole days before it come
+# from the Daily_* tables, today onwards from the raw rows, so the two halves
+# never overlap. RollupJob keeps the tables current by running the idempotent
+# refresh procedure on a background thread; concurrent callers are serialized
+# inside the procedure, so every admin process can run one.
+
+REFRESH_SQL = "EXEC sp_Refresh_Daily_Rollups @Recheck_Days = ?, @Rebuild = ?"
+
+
+def split_range(start, end, today=None):
+    # [start, end] whole days -> (rollup_from, rollup_to, raw_from, raw_to), all half-open
+    lo = datetime.combine(start, datetime.min.time())
+    hi = datetime.combine(end + timedelta(days=1), datetime.min.time())
+    cut = datetime.combine(today or date.today(), datetime.min.time())
+    cut = min(max(cut, lo), hi)
+    return lo.date(), cut.date(), cut, hi
+
+
+def refresh_rollups(conn, recheck_days=1, rebuild=False):
+    cur = conn.cursor()
+    cur.execute(REFRESH_SQL, (recheck_days, 1 if rebuild else 0))
+    conn.commit()
+
+
+class RollupJob:
+    def __init__(self, pool, every=60, recheck_days=1):
+        self.pool = pool
+        self.every = every
+        self.recheck_days = recheck_days
+        self._thread = None
+        self._stop = threading.Event()
+        self.last_run = None
+        self.last_error = None
+
+    def run_once(self, rebuild=False):
+        t = time.perf_counter()
+        with self.pool.connection() as conn:
+            refresh_rollups(conn, self.recheck_days, rebuild)
+        self.last_run = (datetime.now(), time.perf_counter() - t)
+        self.last_error = None
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="daily-rollups", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                # Readers keep using the rollups as of the last good run
+                self.last_error = e
+            self._stop.wait(self.every)
@@ -0,0 +1,172 @@
+import threading
+import time
+
+from query_cache import QueryCache
+from table_pager import quote_ident
+
+# Schema metadata for the admin Table Explorer.
+# Tables, columns, primary keys, foreign keys and row estimates are read from
+# the system catalog in one batch and kept per process. Every `check_every`
+# seconds a one-row query compares the newest modify_date and the object count
+# of user tables and keys with what was loaded; any CREATE / ALTER / DROP
+# changes one of them and the next access reloads. Row estimates are refreshed
+# on their own, cheaper schedule. Foreign-key dropdowns read small reference
+# tables once and keep them until the explorer writes to that table.
+
+VERSION_SQL = """SELECT MAX(modify_date), COUNT(*) FROM sys.objects
+WHERE type IN ('U', 'PK', 'F', 'UQ') AND is_ms_shipped = 0"""
+
+ROWS_SQL = """SELECT t.name, ISNULL(SUM(ps.row_count), 0)
+FROM sys.tables t LEFT JOIN sys.dm_db_partition_stats ps ON ps.object_id = t.object_id AND ps.index_id IN (0, 1)
+WHERE t.is_ms_shipped = 0
+GROUP BY t.name"""
+
+CATALOG_BATCH = """SET NOCOUNT ON;
+""" + VERSION_SQL + """;
+SELECT t.name, c.name, ty.name, c.max_length, c.is_nullable, c.is_identity, c.is_computed,
+       CASE WHEN c.default_object_id <> 0 THEN 1 ELSE 0 END
+FROM sys.tables t
+JOIN sys.columns c ON c.object_id = t.object_id
+JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+WHERE t.is_ms_shipped = 0
+ORDER BY t.name, c.column_id;
+SELECT t.name, c.name
+FROM sys.indexes i
+JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+JOIN sys.tables t ON t.object_id = i.object_id
+WHERE i.is_primary_key = 1
+ORDER BY t.name, ic.key_ordinal;
+SELECT pt.name, pc.name, rt.name, rc.name
+FROM sys.foreign_key_columns fkc
+JOIN sys.tables pt ON pt.object_id = fkc.parent_object_id
+JOIN sys.columns pc ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+JOIN sys.tables rt ON rt.object_id = fkc.referenced_object_id
+JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id;
+""" + ROWS_SQL + ";"
+
+TEXT_TYPES = {'char', 'varchar', 'nchar', 'nvarchar', 'text', 'ntext'}
+# Filled in by the server, never typed into a form
+SERVER_TYPES = {'timestamp', 'rowversion'}
+
+
+def label_column(entry, key):
+    # The column a dropdown shows next to the key: a *Name column if there is one
+    text = [c['name'] for c in entry['columns'] if c['type'] in TEXT_TYPES and c['name'] != key]
+    named = [c for c in text if 'name' in c.lower()]
+    return (named or text or [None])[0]
+
+
+class SchemaCatalog:
+    def __init__(self, pool, check_every=30, rows_every=60, lookup_ttl=600, lookup_limit=1000):
+        self.pool = pool
+        self.check_every = check_every
+        self.rows_every = rows_every
+        self.lookup_ttl = lookup_ttl
+        # Reference tables larger than this get a plain input instead of a dropdown
+        self.lookup_limit = lookup_limit
+        self._lock = threading.Lock()
+        self._tables = None
+        self._version = None
+        self._checked = 0.0
+        self._rows_at = 0.0
+        self._lookups = QueryCache(max_entries=256)
+        self.loads = 0
+
+    # --- LOADING ---
+    def _load(self, cur):
+        cur.execute(CATALOG_BATCH)
+        version = tuple(cur.fetchone())
+        tables = {}
+        cur.nextset()
+        for t, name, dtype, max_len, nullable, identity, computed, has_default in cur.fetchall():
+            if dtype in ('nchar', 'nvarchar') and max_len > 0:
+                max_len //= 2
+            entry = tables.setdefault(t, {'name': t, 'columns': [], 'pk': [], 'fks': {}, 'rows': 0})
+            entry['columns'].append({
+                'name': name, 'type': dtype, 'max_len': max_len if max_len > 0 and dtype in TEXT_TYPES else None,
+                'nullable': bool(nullable), 'identity': bool(identity), 'computed': bool(computed),
+                'has_default': bool(has_default)})
+        cur.nextset()
+        for t, col in cur.fetchall():
+            tables[t]['pk'].append(col)
+        cur.nextset()
+        for t, col, ref_table, ref_col in cur.fetchall():
+            tables[t]['fks'][col] = (ref_table, ref_col)
+        cur.nextset()
+        for t, rows in cur.fetchall():
+            if t in tables:
+                tables[t]['rows'] = int(rows)
+        self._tables, self._version = tables, version
+        self._rows_at = time.monotonic()
+        self.loads += 1
+
+    def _current(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._tables is not None and now - self._checked < self.check_every \
+                    and now - self._rows_at < self.rows_every:
+                return self._tables
+            with self.pool.connection() as conn:
+                cur = conn.cursor()
+                if self._tables is None:
+                    self._load(cur)
+                elif now - self._checked >= self.check_every:
+                    cur.execute(VERSION_SQL)
+                    if tuple(cur.fetchone()) != self._version:
+                        self._load(cur)
+                        self._lookups.clear()
+                if now - self._rows_at >= self.rows_every:
+                    cur.execute(ROWS_SQL)
+                    for t, rows in cur.fetchall():
+                        if t in self._tables:
+                            self._tables[t]['rows'] = int(rows)
+                    self._rows_at = now
+            self._checked = now
+            return self._tables
+
+    def invalidate(self):
+        # Next access reloads everything, e.g. right after DDL run from the SQL Console
+        with self._lock:
+            self._tables = None
+        self._lookups.clear()
+
+    # --- READERS ---
+    def tables(self):
+        return sorted(self._current())
+
+    def table(self, name):
+        return self._current().get(name)
+
+    def editable_columns(self, name):
+        # Columns a form may set: not identity, computed or rowversion
+        entry = self.table(name)
+        if entry is None:
+            return []
+        return [c for c in entry['columns']
+                if not c['identity'] and not c['computed'] and c['type'] not in SERVER_TYPES]
+
+    def lookup(self, table, column):
+        # -> [(key, label)] for an FK column's dropdown, or None when there is none
+        entry = self.table(table)
+        if entry is None or column not in entry['fks']:
+            return None
+        ref_table, ref_col = entry['fks'][column]
+        ref = self.table(ref_table)
+        if ref is None or ref['rows'] > self.lookup_limit:
+            return None
+
+        def load():
+            label = label_column(ref, ref_col)
+            select = quote_ident(ref_col) + (f", {quote_ident(label)}" if label else "")
+            with self.pool.connection() as conn:
+                cur = conn.cursor()
+                cur.execute(f"SELECT TOP ({self.lookup_limit}) {select} FROM {quote_ident(ref_table)} "
+                            f"ORDER BY {quote_ident(label or ref_col)}")
+                return [(r[0], f"{r[0]} · {r[1]}" if label else str(r[0])) for r in cur.fetchall()]
+
+        return self._lookups.get_or_load((ref_table, ref_col), load, self.lookup_ttl, tables=(ref_table,))
+
+    def changed(self, *tables):
+        # Called after the explorer writes, so dropdowns over those tables reload
+        self._lookups.invalidate(*tables)
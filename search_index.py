@@ -0,0 +1,331 @@
+import re
+import threading
+import time
+import unicodedata
+from array import array
+
+import numpy as np
+
+# In-memory search over Booking_Inquiries and Guests for the admin app.
+# Each record is kept as one normalized line of text (name words, phone
+# digits, email, ID number) plus an inverted index from 3-character grams to
+# record numbers. Grams start with a "^" at the beginning of every word, so a
+# two-letter search still matches word prefixes. A query intersects the gram
+# lists of its words with numpy, ranks whole-word hits first, and checks the
+# text of only the records on the requested page.
+# Updated records get a new number; the old one is left dead in the postings
+# and skipped until the next compaction.
+# SearchSync keeps the index current from SQL Server with ROWVERSION deltas
+# (migrations/006_search_rowversion.sql); the page fetches display rows for
+# the current page only.
+
+INQUIRY, GUEST = 0, 1
+SOURCE_NAMES = {INQUIRY: 'Inquiry', GUEST: 'Guest'}
+MIN_TERM = 2
+# Up to this many candidates every one is checked, so the total is exact;
+# beyond it the total is estimated from the share of the page walk that matched
+EXACT_COUNT = 5000
+
+
+def fold(text):
+    # Lower case, accents stripped
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def phone_digits(phone):
+    # "+92 300-1234567", "0092300..." and "0300 1234567" all become 03001234567
+    d = re.sub(r'\D', '', str(phone or ''))
+    if d.startswith('00'):
+        d = d[2:]
+    if d.startswith('92') and len(d) == 12:
+        d = '0' + d[2:]
+    return d
+
+
+def record_text(name, phone=None, email=None, identity=None):
+    words = re.findall(r'[\w@.+-]+', fold(name))
+    if email:
+        words.append(fold(email).strip())
+    for value in (phone_digits(phone), re.sub(r'\W', '', fold(identity))):
+        if value:
+            words.append(value)
+    return ' '.join(words)
+
+
+def query_terms(query):
+    terms = []
+    for t in re.findall(r'[\w@.+-]+', fold(query)):
+        # Phone fragments are matched on digits only
+        terms.append(phone_digits(t) if re.fullmatch(r'[\d+-]+', t) else t)
+    # "0300 1234567" is one phone number, not two words
+    if len(terms) > 1 and all(t.isdigit() for t in terms):
+        terms = [phone_digits(''.join(terms))]
+    return [t for t in terms if len(t) >= MIN_TERM]
+
+
+def grams(word):
+    w = '^' + word
+    return {w[i:i + 3] for i in range(len(w) - 2)}
+
+
+def term_grams(term):
+    # Grams every record containing `term` must have; two-letter terms match word starts
+    if len(term) < 3:
+        return {'^' + term}
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+def as_numpy(postings):
+    # Copied, so no buffer stays exported and the array can keep growing
+    return np.frombuffer(postings, dtype=np.uint32).copy()
+
+
+def intersect(a, b):
+    # Both sorted ascending; cost follows the shorter one
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    i = np.searchsorted(b, a)
+    i[i == len(b)] = 0
+    return a[b[i] == a]
+
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}             # gram -> array of record numbers, ascending
+        self._words = {}                # whole word -> array of record numbers
+        self._texts = []                # record number -> " text ", None once dead
+        self._keys = array('q')         # record number -> id * 2 + source
+        self._alive = bytearray()
+        self._where = {}                # id * 2 + source -> record number
+        self.dead = 0
+
+    def __len__(self):
+        return len(self._where)
+
+    def count(self, source):
+        with self._lock:
+            return sum(1 for k in self._where if k & 1 == source)
+
+    def add(self, source, row_id, name, phone=None, email=None, identity=None):
+        self.add_many([(source, row_id, name, phone, email, identity)])
+
+    def add_many(self, records):
+        # (source, id, name, phone, email, identity) tuples; one lock round for the lot
+        prepared = [(row_id * 2 + source, record_text(name, phone, email, identity))
+                    for source, row_id, name, phone, email, identity in records]
+        with self._lock:
+            for key, text in prepared:
+                old = self._where.get(key)
+                if old is not None:
+                    if self._texts[old] == ' ' + text + ' ':
+                        continue
+                    self._kill(old)
+                self._append(key, text)
+
+    def _append(self, key, text):
+        n = len(self._texts)
+        self._texts.append(' ' + text + ' ')
+        self._keys.append(key)
+        self._alive.append(1)
+        self._where[key] = n
+        words = set(text.split(' '))
+        for table, entries in ((self._words, words), (self._postings, {g for w in words for g in grams(w)})):
+            for e in entries:
+                postings = table.get(e)
+                if postings is None:
+                    table[e] = array('I', (n,))
+                else:
+                    postings.append(n)
+
+    def _kill(self, n):
+        self._texts[n] = None
+        self._alive[n] = 0
+        self.dead += 1
+
+    def remove(self, source, row_id):
+        with self._lock:
+            n = self._where.pop(row_id * 2 + source, None)
+            if n is not None:
+                self._kill(n)
+
+    def ids(self, source):
+        with self._lock:
+            return {k >> 1 for k in self._where if k & 1 == source}
+
+    def compact(self):
+        # Rebuild without dead records once they are a fifth of the index
+        with self._lock:
+            if self.dead < 0.2 * max(len(self._texts), 1):
+                return False
+            live = [(self._keys[n], t[1:-1]) for n, t in enumerate(self._texts) if t is not None]
+            self._postings, self._words, self._texts = {}, {}, []
+            self._keys, self._alive, self._where, self.dead = array('q'), bytearray(), {}, 0
+            for key, text in live:
+                self._append(key, text)
+            return True
+
+    # --- QUERIES ---
+    def search(self, query, limit=25, offset=0, source=None):
+        # -> (total matches, [(source, id, score)]) best first, newest first on ties
+        terms = query_terms(query)
+        if not terms:
+            return 0, []
+        with self._lock:
+            # Records holding every gram of every term: the matches, plus the odd
+            # record whose grams are all there but not in a row
+            lists = []
+            for term in terms:
+                for g in term_grams(term):
+                    postings = self._postings.get(g)
+                    if postings is None:
+                        return 0, []
+                    lists.append(postings)
+            lists.sort(key=len)
+            found = as_numpy(lists[0])
+            for postings in lists[1:]:
+                found = intersect(found, as_numpy(postings))
+            found = found[np.frombuffer(self._alive, dtype=np.uint8)[found].astype(bool)]
+            if source is not None:
+                found = found[(np.frombuffer(self._keys, dtype=np.int64)[found] & 1) == source]
+            # Rough rank from the word index: whole-word hits first, newest first
+            rank = np.zeros(len(found), dtype=np.int64)
+            for term in terms:
+                words = self._words.get(term)
+                if words is not None:
+                    exact = as_numpy(words)
+                    i = np.searchsorted(exact, found)
+                    i[i == len(exact)] = 0
+                    rank += exact[i] == found
+            order = np.lexsort((-found.astype(np.int64), -rank))
+            # Exact check and score for the requested page only (all of them when few)
+            texts, keys, page = self._texts, self._keys, []
+            checked = 0
+            exact = len(found) <= EXACT_COUNT
+            for n in found[order]:
+                checked += 1
+                score = self._score(texts[n], terms)
+                if score:
+                    page.append((score, int(n)))
+                    if len(page) >= offset + limit and not exact:
+                        break
+            total = len(page) if exact else round(len(found) * len(page) / checked)
+            page = sorted(page, key=lambda m: (-m[0], -m[1]))[offset:offset + limit]
+            return total, [(keys[n] & 1, keys[n] >> 1, score) for score, n in page]
+
+    @staticmethod
+    def _score(padded, terms):
+        # Per term: 3 whole word, 2 word start, 1 anywhere; 0 if any term is missing
+        total = 0
+        for t in terms:
+            if ' ' + t + ' ' in padded:
+                total += 3
+            elif ' ' + t in padded:
+                total += 2
+            elif len(t) >= 3 and t in padded:
+                total += 1
+            else:
+                return 0
+        return total
+
+
+# --- KEEPING IT CURRENT ---
+SYNC_HEADER = """
+SET NOCOUNT ON;
+DECLARE @since BINARY(8) = ?;
+DECLARE @hi BINARY(8) = MIN_ACTIVE_ROWVERSION();
+SELECT @hi AS hi;
+"""
+
+SYNC_BATCH = SYNC_HEADER + """
+SELECT InquiryID, FullName, GuestPhone FROM Booking_Inquiries WHERE RowVer >= @since AND RowVer < @hi;
+SELECT GuestID, FirstName, LastName, Phone, Email, Identity_No FROM Guests WHERE RowVer >= @since AND RowVer < @hi;
+"""
+
+# Deletes bump no rowversion; the IDs still present are compared now and then
+RECONCILE_BATCH = """
+SET NOCOUNT ON;
+SELECT InquiryID FROM Booking_Inquiries;
+SELECT GuestID FROM Guests;
+"""
+
+FETCH_BATCH = 5000
+ZERO_VERSION = b'\x00' * 8
+
+
+def index_inquiries(index, rows):
+    index.add_many([(INQUIRY, r[0], r[1], r[2], None, None) for r in rows])
+
+
+def index_guests(index, rows):
+    index.add_many([(GUEST, r[0], f"{r[1] or ''} {r[2] or ''}", r[3], r[4], r[5]) for r in rows])
+
+
+class SearchSync:
+    def __init__(self, index, pool, every=5, reconcile_every=900):
+        self.index = index
+        self.pool = pool
+        self.every = every
+        self.reconcile_every = reconcile_every
+        self._rowver = None
+        self._reconciled = 0.0
+        self._thread = None
+        self._stop = threading.Event()
+        self.loaded = False
+        self.last_error = None
+
+    def sync_once(self):
+        since = self._rowver or ZERO_VERSION
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(SYNC_BATCH, (since,))
+            hi = bytes(cur.fetchone().hi)
+            for apply in (index_inquiries, index_guests):
+                cur.nextset()
+                while True:
+                    rows = cur.fetchmany(FETCH_BATCH)
+                    if not rows:
+                        break
+                    apply(self.index, rows)
+        self._rowver = hi
+        self.loaded = True
+
+    def reconcile(self):
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(RECONCILE_BATCH)
+            present = {INQUIRY: {r[0] for r in cur.fetchall()}}
+            cur.nextset()
+            present[GUEST] = {r[0] for r in cur.fetchall()}
+        for source, ids in present.items():
+            for gone in self.index.ids(source) - ids:
+                self.index.remove(source, gone)
+        self.index.compact()
+
+    # --- BACKGROUND SCHEDULE ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="search-sync", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sync_once()
+                if time.monotonic() - self._reconciled >= self.reconcile_every:
+                    if self._reconciled:
+                        self.reconcile()
+                    self._reconciled = time.monotonic()
+                self.last_error = None
+            except Exception as e:
+                # Searches keep using what is already indexed
+                self.last_error = e
+            self._stop.wait(self.every)
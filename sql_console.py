@@ -0,0 +1,256 @@
+import itertools
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Background execution for the admin SQL Console.
+# Each command runs on a worker thread over its own connection, so a long
+# query never holds the Streamlit script thread. The page polls the job and
+# shows rows as they arrive (fetchmany), up to a row cap; a command cut short
+# by the cap is cancelled and rolled back whole, so none of its statements
+# take effect. A timer cancels the statement at its deadline, and the Cancel button does the same straight away
+# (pyodbc's Cursor.cancel works from another thread). Estimate Plan compiles
+# the command under SHOWPLAN_XML without running it, within the same timeout. Console connections carry
+# their own application name, so they stand out in the session list next to
+# everything else that can be killed.
+
+CONSOLE_APP = 'HMS SQL Console'
+MAX_ROWS = 5000
+FETCH_BATCH = 500
+STATEMENT_TIMEOUT = 60
+KEEP_JOBS = 50
+SHOWPLAN_NS = {'p': 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'}
+
+SESSIONS_SQL = """SELECT s.session_id, s.login_name, s.host_name, s.program_name, s.status,
+       r.command, r.status AS request_status, r.wait_type, r.blocking_session_id,
+       r.total_elapsed_time / 1000.0 AS elapsed_s, s.cpu_time, s.reads, s.writes, s.last_request_start_time,
+       SUBSTRING(t.text, r.statement_start_offset / 2 + 1,
+                 (CASE r.statement_end_offset WHEN -1 THEN DATALENGTH(t.text) ELSE r.statement_end_offset END
+                  - r.statement_start_offset) / 2 + 1) AS running_sql
+FROM sys.dm_exec_sessions s
+LEFT JOIN sys.dm_exec_requests r ON r.session_id = s.session_id
+OUTER APPLY sys.dm_exec_sql_text(r.sql_handle) t
+WHERE s.is_user_process = 1 AND s.session_id <> @@SPID
+ORDER BY CASE WHEN r.session_id IS NULL THEN 1 ELSE 0 END, r.total_elapsed_time DESC"""
+
+
+def console_conn_str(conn_str):
+    return conn_str + f"APP={CONSOLE_APP};"
+
+
+def is_ddl(sql):
+    return bool(re.search(r'^\s*(create|alter|drop)\b', sql, re.I | re.M))
+
+
+def parse_plan(xml_texts):
+    # SHOWPLAN_XML documents -> [{statement, type, cost, rows}], [{operator, object, rows, cost}]
+    statements, operators = [], []
+    for text in xml_texts:
+        root = ET.fromstring(text)
+        for stmt in root.iter(f"{{{SHOWPLAN_NS['p']}}}StmtSimple"):
+            statements.append({'statement': (stmt.get('StatementText') or '').strip()[:200],
+                               'type': stmt.get('StatementType'),
+                               'cost': float(stmt.get('StatementSubTreeCost') or 0),
+                               'rows': float(stmt.get('StatementEstRows') or 0)})
+            for op in stmt.iter(f"{{{SHOWPLAN_NS['p']}}}RelOp"):
+                obj = op.find('.//p:Object', SHOWPLAN_NS)
+                operators.append({'operator': op.get('PhysicalOp'),
+                                  'object': '.'.join(v.strip('[]') for v in (obj.get('Table'), obj.get('Index'))
+                                                     if v) if obj is not None else '',
+                                  'rows': float(op.get('EstimateRows') or 0),
+                                  'cost': float(op.get('EstimatedTotalSubtreeCost') or 0)})
+    return statements, operators
+
+
+class ConsoleJob:
+    def __init__(self, job_id, sql, owner):
+        self.id = job_id
+        self.sql = sql
+        self.owner = owner
+        self.status = 'queued'          # queued, running, done, truncated, failed, cancelled, timed out
+        self.results = []               # [{columns, rows, truncated}] one per result set
+        self.rowcounts = []             # rows affected by statements that return none
+        self.error = None
+        self.spid = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._cursor = None
+        self._stop = threading.Event()
+        self._timed_out = False
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    @property
+    def rows(self):
+        return sum(len(r['rows']) for r in self.results)
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def cancel(self, timed_out=False):
+        self._timed_out = self._timed_out or timed_out
+        self._stop.set()
+        cursor = self._cursor
+        if cursor is not None:
+            try:
+                cursor.cancel()
+            except Exception:
+                pass                    # already finished or closed
+
+
+class ConsoleRunner:
+    def __init__(self, connect, workers=2, timeout=STATEMENT_TIMEOUT, max_rows=MAX_ROWS,
+                 batch=FETCH_BATCH, stats=None):
+        self.connect = connect
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.batch = batch
+        self.stats = stats
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sql-console')
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+
+    # --- JOBS ---
+    def submit(self, sql, owner, user_id=None, timeout=None):
+        job = ConsoleJob(next(self._ids), sql, owner)
+        with self._lock:
+            self._jobs[job.id] = job
+            # Forget the oldest finished jobs
+            for old in [j for j in self._jobs.values() if not j.active][:max(len(self._jobs) - KEEP_JOBS, 0)]:
+                del self._jobs[old.id]
+        self._pool.submit(self._execute, job, user_id, timeout or self.timeout)
+        return job
+
+    def job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner=None):
+        with self._lock:
+            return [j for j in reversed(self._jobs.values()) if owner is None or j.owner == owner]
+
+    def _open(self, user_id, timeout):
+        conn = self.connect()
+        conn.timeout = timeout
+        cur = conn.cursor()
+        if user_id is not None:
+            cur.execute("EXEC sp_set_session_context ?, ?", ('UserID', user_id))
+        return conn, cur
+
+    def _execute(self, job, user_id, timeout):
+        if job._stop.is_set():
+            job.status = 'cancelled'
+            return
+        job.status, job.started = 'running', time.time()
+        timer = threading.Timer(timeout, job.cancel, kwargs={'timed_out': True})
+        timer.daemon = True
+        conn = None
+        try:
+            conn, cur = self._open(user_id, timeout)
+            cur.execute("SELECT @@SPID")
+            job.spid = cur.fetchone()[0]
+            job._cursor = cur
+            timer.start()
+            rows_left = self.max_rows
+            cut_short = False
+            cur.execute(job.sql)
+            while True:
+                if cur.description is not None:
+                    result = {'columns': [d[0] for d in cur.description], 'rows': [], 'truncated': False}
+                    job.results.append(result)
+                    while not job._stop.is_set():
+                        batch = cur.fetchmany(min(self.batch, rows_left) or 1)
+                        if not batch:
+                            break
+                        if rows_left <= 0:
+                            result['truncated'] = cut_short = True
+                            break
+                        result['rows'].extend(tuple(r) for r in batch)
+                        rows_left -= len(batch)
+                elif cur.rowcount is not None and cur.rowcount >= 0:
+                    job.rowcounts.append(cur.rowcount)
+                if job._stop.is_set() or cut_short or not cur.nextset():
+                    break
+            if cut_short and not job._stop.is_set():
+                # The rest of the result, and any statement after it, is not
+                # wanted; stop the server sending or running them
+                cur.cancel()
+            if job._stop.is_set() or cut_short:
+                # Only part of the batch ran: undo it rather than commit half
+                conn.rollback()
+                job.status = ('timed out' if job._timed_out else 'cancelled') if job._stop.is_set() else 'truncated'
+            else:
+                conn.commit()
+                job.status = 'done'
+        except Exception as e:
+            job.error = e
+            job.status = 'timed out' if job._timed_out else ('cancelled' if job._stop.is_set() else 'failed')
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+        finally:
+            timer.cancel()
+            job._cursor = None
+            job.finished = time.time()
+            if conn is not None:
+                conn.close()
+            if self.stats is not None:
+                self.stats.record(job.sql, job.elapsed(), job.rows, None,
+                                  error=job.error if job.status != 'done' else None)
+
+    # --- PLAN PREVIEW ---
+    def estimate(self, sql, timeout=None):
+        # -> (statements, operators) from the estimated plan; nothing is executed
+        conn, cur = self._open(None, timeout or self.timeout)
+        # Compiling can be slow too (a huge batch, or blocked on schema locks)
+        timer = threading.Timer(timeout or self.timeout, cur.cancel)
+        timer.daemon = True
+        timer.start()
+        try:
+            cur.execute("SET SHOWPLAN_XML ON")
+            cur.execute(sql)
+            plans = []
+            while True:
+                if cur.description is not None:
+                    plans += [r[0] for r in cur.fetchall()]
+                if not cur.nextset():
+                    break
+            cur.execute("SET SHOWPLAN_XML OFF")
+        finally:
+            timer.cancel()
+            conn.close()
+        return parse_plan(plans)
+
+    # --- SESSIONS ---
+    def sessions(self):
+        conn, cur = self._open(None, 15)
+        try:
+            cur.execute(SESSIONS_SQL)
+            columns = [d[0] for d in cur.description]
+            return columns, [tuple(r) for r in cur.fetchall()]
+        finally:
+            conn.close()
+
+    def kill(self, session_id):
+        # KILL takes no parameters; the ID is forced to an integer first
+        session_id = int(session_id)
+        with self._lock:
+            for job in self._jobs.values():
+                if job.spid == session_id and job.active:
+                    job.cancel()
+        conn, cur = self._open(None, 15)
+        try:
+            cur.execute(f"KILL {session_id}")
+        finally:
+            conn.close()
@@ -0,0 +1,52 @@
+import pandas as pd
+
+# Server-side paging for the Table Explorer.
+# Sequential Next/Prev moves use keyset paging (WHERE key > last_key) so the
+# cost of a page does not grow with its position; jumping straight to page N
+# falls back to OFFSET ... FETCH. Rows are pulled with fetchmany and turned
+# into DataFrames batch by batch instead of one big fetchall.
+
+FETCH_BATCH = 500
+
+
+def quote_ident(name):
+    return "[" + str(name).replace("]", "]]") + "]"
+
+
+def iter_frames(cursor, batch_size=FETCH_BATCH):
+    columns = [c[0] for c in cursor.description]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield pd.DataFrame.from_records(rows, columns=columns)
+
+
+def read_frame(cursor, batch_size=FETCH_BATCH):
+    frames = list(iter_frames(cursor, batch_size))
+    if not frames:
+        return pd.DataFrame(columns=[c[0] for c in cursor.description])
+    return pd.concat(frames, ignore_index=True)
+
+
+def fetch_page(conn, table, key_col, columns=None, page_size=50, after=None, offset=None):
+    cols = list(columns) if columns else None
+    if cols is not None and key_col not in cols:
+        cols.insert(0, key_col)
+    select_list = ", ".join(quote_ident(c) for c in cols) if cols else "*"
+    key = quote_ident(key_col)
+    src = quote_ident(table)
+
+    if after is not None:
+        sql = f"SELECT TOP (?) {select_list} FROM {src} WHERE {key} > ? ORDER BY {key}"
+        params = (page_size, after)
+    elif offset:
+        sql = f"SELECT {select_list} FROM {src} ORDER BY {key} OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
+        params = (offset, page_size)
+    else:
+        sql = f"SELECT TOP (?) {select_list} FROM {src} ORDER BY {key}"
+        params = (page_size,)
+
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    return read_frame(cur)
@@ -0,0 +1,22 @@
+import ast
+import os
+
+import pytest
+
+from admin_pages import PAGES, STAFF_PAGES, nav_options
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "admin_pages")
+
+
+def test_staff_see_only_their_pages():
+    assert nav_options("SuperAdmin") == list(PAGES)
+    assert nav_options("Receptionist") == STAFF_PAGES
+    assert set(STAFF_PAGES) <= set(PAGES)
+
+
+@pytest.mark.parametrize("module", sorted(PAGES.values()))
+def test_every_page_module_has_render(module):
+    # Parsed, not imported: importing a page pulls in streamlit and the driver
+    with open(os.path.join(PAGES_DIR, module + ".py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    assert "render" in {n.name for n in tree.body if isinstance(n, ast.FunctionDef)}
@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import os
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+
+from audit_archive import COLD_MONTHS_SQL, MONTH_SQL, AuditArchiver, AuditStore, add_months, read_manifest
+
+LOGS = [
+    (1, 1, "admin", "INSERT", "Guests", datetime(2025, 1, 5, 9, 0)),
+    (2, 2, "clerk", "UPDATE", "Rooms", datetime(2025, 1, 20, 9, 0)),
+    (3, None, None, "DELETE", "Orders", datetime(2025, 2, 2, 9, 0)),
+    (4, 1, "admin", "UPDATE", "Guests", datetime(2026, 3, 1, 9, 0)),
+    (5, 2, "clerk", "INSERT", "Orders", datetime(2026, 3, 2, 9, 0)),
+]
+
+
+class FakePool:
+    # Audit_Logs as a list; sp_Audit_Drop_Month deletes a month only when the
+    # row count it is given still matches, like the real procedure
+    def __init__(self):
+        self.logs = list(LOGS)
+        self.dropped = []
+        self.fail_drop = False
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return self
+
+    def commit(self):
+        pass
+
+    def execute(self, sql, params=()):
+        self.rows = []
+        if sql == COLD_MONTHS_SQL:
+            counts = {}
+            for r in self.logs:
+                if r[5] < params[0]:
+                    key = date(r[5].year, r[5].month, 1)
+                    counts[key] = counts.get(key, 0) + 1
+            self.rows = sorted(counts.items())
+        elif sql == MONTH_SQL:
+            self.rows = [r for r in self.logs if params[0] <= r[5] < params[1]]
+        elif sql.startswith("EXEC sp_Audit_Drop_Month"):
+            month, expected = params
+            hit = [r for r in self.logs if (r[5].year, r[5].month) == (month.year, month.month)]
+            if self.fail_drop or len(hit) != expected:
+                raise RuntimeError("row count changed since export")
+            self.logs = [r for r in self.logs if r not in hit]
+            self.dropped.append(month)
+        elif sql.startswith("SELECT TOP (?)"):
+            limit, start, end, at, _, log_id = params[:6]
+            live = [r for r in self.logs if start <= r[5] < end and (r[5], r[0]) < (at, log_id or float("inf"))]
+            live.sort(key=lambda r: (r[5], r[0]), reverse=True)
+            self.rows = [(r[0], r[5], r[2], r[3], r[4]) for r in live[:limit]]
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchmany(self, n):
+        batch, self.rows = self.rows[:n], self.rows[n:]
+        return batch
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+@pytest.fixture
+def archiver(pool, tmp_path):
+    return AuditArchiver(pool, keep_months=12, directory=str(tmp_path))
+
+
+def test_month_arithmetic():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_old_months_are_written_then_dropped(pool, archiver, tmp_path):
+    done = archiver.run_once(today=date(2026, 3, 15))
+    assert done == {"2025-01": 2, "2025-02": 1}
+    assert pool.dropped == [date(2025, 1, 1), date(2025, 2, 1)]
+    assert [r[0] for r in pool.logs] == [4, 5]
+    manifest = read_manifest(str(tmp_path))
+    path = os.path.join(str(tmp_path), manifest["2025-01"]["file"])
+    with open(path, "rb") as f:
+        assert hashlib.sha256(f.read()).hexdigest() == manifest["2025-01"]["sha256"]
+    with gzip.open(path, "rt") as f:
+        assert f.read().splitlines()[1] == "1,1,admin,INSERT,Guests,2025-01-05 09:00:00"
+    assert archiver.status()["rows"] == 3 and archiver.status()["oldest"] == "2025-01"
+    assert archiver.run_once(today=date(2026, 3, 15)) == {}
+
+
+def test_refused_drop_keeps_the_rows_in_the_table(pool, archiver):
+    pool.fail_drop = True
+    with pytest.raises(RuntimeError):
+        archiver.run_once(today=date(2026, 3, 15))
+    assert len(pool.logs) == 5
+
+
+def test_pages_run_from_the_live_table_into_the_archive(pool, archiver, tmp_path):
+    archiver.run_once(today=date(2026, 3, 15))
+    store = AuditStore(pool, directory=str(tmp_path))
+    start, end = datetime(2024, 12, 1), datetime(2026, 4, 1)
+    frame, after = store.page(start, end, limit=3)
+    assert list(frame["LogID"]) == [5, 4, 3]
+    assert after == (datetime(2025, 2, 2, 9, 0), 3)
+    frame, after = store.page(start, end, before=after, limit=3)
+    assert list(frame["LogID"]) == [2, 1] and after is None
+
+
+def test_archived_months_are_filtered(pool, archiver, tmp_path):
+    archiver.run_once(today=date(2026, 3, 15))
+    store = AuditStore(pool, directory=str(tmp_path))
+    frame, _ = store.page(datetime(2025, 1, 1), datetime(2025, 2, 1), user="clerk")
+    assert list(frame["LogID"]) == [2]
+    frame, _ = store.page(datetime(2025, 1, 1), datetime(2026, 1, 1), table="Orders")
+    assert list(frame["LogID"]) == [3]
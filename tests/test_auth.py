@@ -0,0 +1,189 @@
+from collections import namedtuple
+from contextlib import contextmanager
+
+import pytest
+
+import auth
+from auth import (FailedLoginLog, LoginThrottle, SessionStore, TokenBucket,
+                  client_address, token_hash)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(auth.time, "monotonic", c)
+    return c
+
+
+# --- TOKEN BUCKETS ---
+def test_bucket_allows_a_burst_then_refills(clock):
+    bucket = TokenBucket(3, 1 / 10)
+    assert [bucket.take("k") for _ in range(3)] == [0, 0, 0]
+    assert bucket.take("k") == pytest.approx(10)
+    clock.now += 10
+    assert bucket.take("k") == 0
+
+
+def test_bucket_wait_takes_nothing(clock):
+    bucket = TokenBucket(1, 1)
+    for _ in range(5):
+        assert bucket.wait("k") == 0
+    assert bucket.take("k") == 0
+    assert bucket.wait("k") == pytest.approx(1)
+
+
+def test_bucket_prunes_full_buckets(clock):
+    bucket = TokenBucket(2, 1, max_keys=2)
+    bucket.take("a")
+    clock.now += 5
+    bucket.take("b")
+    bucket.take("c")
+    assert set(bucket._buckets) == {"b", "c"}
+
+
+def test_throttle_turns_away_after_the_username_burst(clock):
+    throttle = LoginThrottle(per_user=(2, 1 / 60), per_ip=(100, 1))
+    assert throttle.check("Alice", "10.0.0.1") == 0
+    assert throttle.check(" alice ", "10.0.0.2") == 0
+    assert throttle.check("ALICE", "10.0.0.3") > 0
+    assert throttle.rejected == 1
+    throttle.succeeded("alice")
+    assert throttle.check("alice", "10.0.0.4") == 0
+
+
+def test_rejected_attempt_does_not_charge_the_other_bucket(clock):
+    throttle = LoginThrottle(per_user=(1, 1 / 60), per_ip=(2, 1 / 60))
+    assert throttle.check("alice", "10.0.0.1") == 0
+    # alice is out of tokens; the refusal must leave the shared IP's bucket alone
+    assert throttle.check("alice", "10.0.0.1") > 0
+    assert throttle.check("bob", "10.0.0.1") == 0
+
+
+# --- CLIENT ADDRESS ---
+def test_forwarded_header_ignored_from_untrusted_peer():
+    assert client_address("203.0.113.9", "1.2.3.4", trusted=frozenset()) == "203.0.113.9"
+    assert client_address(None, "1.2.3.4", trusted=frozenset()) == "127.0.0.1"
+
+
+def test_trusted_proxy_uses_the_hop_it_appended():
+    trusted = frozenset({"127.0.0.1"})
+    # The leftmost entry was sent by the client and can say anything
+    assert client_address(None, "6.6.6.6, 198.51.100.7", trusted=trusted) == "198.51.100.7"
+    assert client_address("127.0.0.1", "", trusted=trusted) == "127.0.0.1"
+
+
+# --- SESSION TOKENS ---
+Row = namedtuple("Row", "UserID Username RoleName TTL")
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.row = None
+
+    def execute(self, sql, params=()):
+        self.db.calls.append(sql)
+        if sql == auth.ISSUE_SQL:
+            user_id, h, ttl = params
+            self.db.tokens[h] = (user_id, ttl)
+        elif sql == auth.LOOKUP_SQL:
+            hit = self.db.tokens.get(params[0])
+            self.row = hit and Row(hit[0], self.db.users[hit[0]][0], self.db.users[hit[0]][1], hit[1])
+        elif sql == auth.REVOKE_SQL:
+            self.db.tokens.pop(params[0], None)
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.users = {7: ("alice", "Admin"), 8: ("bob", "Staff")}
+        self.tokens = {}
+        self.calls = []
+
+    @contextmanager
+    def connection(self, context=None):
+        yield FakeConnection(self)
+
+    def lookups(self):
+        return self.calls.count(auth.LOOKUP_SQL)
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+def test_issued_token_is_stored_hashed_and_resolves_from_cache(pool, clock):
+    store = SessionStore(pool)
+    token = store.issue(7, "alice", "Admin")
+    assert token not in pool.tokens and token_hash(token) in pool.tokens
+    assert store.resolve(token) == (7, "alice", "Admin")
+    assert pool.lookups() == 0 and store.hits == 1
+
+
+def test_cached_session_is_rechecked_after_cache_ttl(pool, clock):
+    store = SessionStore(pool, cache_ttl=60)
+    token = store.issue(7, "alice", "Admin")
+    # Revoked by another process: this cache still knows it for up to a minute
+    pool.tokens.clear()
+    assert store.resolve(token) == (7, "alice", "Admin")
+    clock.now += 61
+    assert store.resolve(token) is None
+    assert pool.lookups() == 1
+
+
+def test_revoke_and_forget_user(pool, clock):
+    store = SessionStore(pool)
+    a, b = store.issue(7, "alice", "Admin"), store.issue(8, "bob", "Staff")
+    store.revoke(a)
+    assert store.resolve(a) is None
+    store.forget_user("bob")
+    assert store.resolve(b) == (8, "bob", "Staff")
+    assert pool.lookups() == 2
+
+
+def test_unknown_or_empty_token_resolves_to_none(pool, clock):
+    store = SessionStore(pool)
+    assert store.resolve("") is None
+    assert store.resolve("nope") is None
+
+
+def test_expired_tokens_purged_at_most_once_per_interval(pool, clock):
+    store = SessionStore(pool, purge_every=3600)
+    store.issue(7, "alice", "Admin")
+    store.issue(8, "bob", "Staff")
+    assert pool.calls.count(auth.PURGE_SQL) == 1
+    clock.now += 3600
+    store.issue(7, "alice", "Admin")
+    assert pool.calls.count(auth.PURGE_SQL) == 2
+
+
+# --- FAILED LOGINS ---
+def test_failed_logins_capped_per_key():
+    log = FailedLoginLog(FakePool(), per_key=2)
+    for _ in range(5):
+        log.record("alice", "10.0.0.1")
+    log.record("bob", "10.0.0.1")
+    assert len(log._buffer) == 3
+    assert log.suppressed == 3
@@ -0,0 +1,110 @@
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+
+from availability import AvailabilityEngine
+
+TYPES = [(1, 'Deluxe'), (2, 'Suite')]
+ROOMS = [(101, 1, 'Ready'), (102, 1, 'Ready'), (103, 1, 'Maintenance'), (201, 2, 'Ready')]
+
+
+@pytest.fixture
+def engine():
+    e = AvailabilityEngine()
+    e.load_rooms(ROOMS, TYPES)
+    e.load_reservations([
+        (1, 101, date(2026, 5, 1), date(2026, 5, 4), 'Confirmed'),
+        (2, 102, date(2026, 5, 3), date(2026, 5, 5), 'Cancelled'),
+    ])
+    return e
+
+
+def free(e, room_type, check_in, check_out):
+    return sorted(e.free_rooms(room_type, check_in, check_out).tolist())
+
+
+def test_stays_are_half_open(engine):
+    # Room 101 is taken the nights of May 1-3 and free again on the 4th
+    assert free(engine, 'Deluxe', date(2026, 5, 3), date(2026, 5, 4)) == [102]
+    assert free(engine, 'Deluxe', date(2026, 5, 4), date(2026, 5, 6)) == [101, 102]
+    assert free(engine, 'Deluxe', date(2026, 4, 28), date(2026, 5, 1)) == [101, 102]
+
+
+def test_released_reservations_and_unsellable_rooms(engine):
+    # The cancelled stay does not hold 102; 103 is under maintenance
+    assert free(engine, 'Deluxe', date(2026, 5, 2), date(2026, 5, 4)) == [102]
+
+
+def test_type_by_id_or_name_and_unknown_name_is_empty(engine):
+    assert free(engine, 2, date(2026, 5, 1), date(2026, 5, 2)) == [201]
+    assert free(engine, 'Suite', date(2026, 5, 1), date(2026, 5, 2)) == [201]
+    assert free(engine, 'Penthouse', date(2026, 5, 1), date(2026, 5, 2)) == []
+
+
+def test_new_booking_edit_and_release(engine):
+    engine.add_reservation(3, 201, date(2026, 5, 1), date(2026, 5, 3))
+    assert free(engine, 'Suite', date(2026, 5, 2), date(2026, 5, 3)) == []
+    engine.add_reservation(3, 201, date(2026, 6, 1), date(2026, 6, 3))
+    assert free(engine, 'Suite', date(2026, 5, 2), date(2026, 5, 3)) == [201]
+    engine.release(3)
+    assert free(engine, 'Suite', date(2026, 6, 1), date(2026, 6, 2)) == [201]
+    assert engine.watermark == 3
+
+
+def test_free_count_by_type(engine):
+    assert engine.free_count_by_type(date(2026, 5, 1), date(2026, 5, 2)) == {'Deluxe': 1, 'Suite': 1}
+
+
+def test_rooms_without_a_type_are_not_counted():
+    e = AvailabilityEngine()
+    e.load_rooms([(1, None, 'Ready'), (2, 0, 'Ready')], [(0, 'Single')])
+    assert e.free_count_by_type(date(2026, 5, 1), date(2026, 5, 2)) == {'Single': 1}
+
+
+def test_overbookings_pair_each_clash_with_the_holder(engine):
+    assert engine.overbookings() == []
+    engine.add_reservation(4, 101, date(2026, 5, 3), date(2026, 5, 6))
+    engine.add_reservation(5, 101, date(2026, 5, 2), date(2026, 5, 3))
+    engine.add_reservation(6, 101, date(2026, 5, 6), date(2026, 5, 8))  # starts as 4 ends
+    assert sorted(engine.overbookings()) == [(101, 1, 4), (101, 1, 5)]
+
+
+class FakePool:
+    def __init__(self, reservations):
+        self.reservations = reservations
+        self.queries = []
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=()):
+        self.queries.append(sql)
+        if "FROM Room_Types" in sql:
+            self.rows = TYPES
+        elif "FROM Rooms" in sql:
+            self.rows = ROOMS
+        elif "MAX(ResID)" in sql:
+            self.rows = [(max(r[0] for r in self.reservations),)]
+        else:
+            self.rows = [r for r in self.reservations if r[0] > (params[0] if params else 0)]
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0]
+
+
+def test_sync_reads_only_reservations_above_the_watermark():
+    pool = FakePool([(1, 101, date(2026, 5, 1), date(2026, 5, 4), 'Confirmed')])
+    e = AvailabilityEngine(pool).ensure_fresh()
+    assert e.watermark == 1
+    pool.reservations.append((2, 102, date(2026, 5, 1), date(2026, 5, 4), 'Confirmed'))
+    assert e.sync() == 1
+    assert free(e, 'Deluxe', date(2026, 5, 1), date(2026, 5, 2)) == []
+    assert e.sync() == 0
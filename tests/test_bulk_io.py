@@ -0,0 +1,93 @@
+import io
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from bulk_io import convert, export_query, import_file, map_columns
+
+COLUMNS = [
+    {'name': 'GuestName', 'type': 'varchar', 'nullable': False, 'max_len': 10, 'has_default': False},
+    {'name': 'Nights', 'type': 'int', 'nullable': True, 'max_len': None, 'has_default': False},
+    {'name': 'Rate', 'type': 'float', 'nullable': True, 'max_len': None, 'has_default': False},
+]
+
+
+class Cursor:
+    # sqlite3's cursor takes no new attributes; pyodbc's has fast_executemany
+    def __init__(self, cur):
+        self.cur = cur
+        self.fast_executemany = False
+
+    def __getattr__(self, name):
+        return getattr(self.cur, name)
+
+
+class Connection:
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute("CREATE TABLE Stays (GuestName TEXT NOT NULL, Nights INT CHECK (Nights > 0), Rate TEXT)")
+
+    def cursor(self):
+        return Cursor(self.db.cursor())
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    def rows(self):
+        return self.db.execute("SELECT GuestName, Nights, Rate FROM Stays ORDER BY rowid").fetchall()
+
+
+@pytest.fixture
+def conn():
+    return Connection()
+
+
+def csv_file(text):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+def test_values_converted_to_the_column_type():
+    assert convert(" 1,200 ", COLUMNS[1]) == 1200
+    assert convert("12.50", COLUMNS[2]) == 12.5
+    assert convert("12.50", dict(COLUMNS[2], type='decimal')) == Decimal("12.50")
+    assert convert("", COLUMNS[1]) is None
+    with pytest.raises(ValueError):
+        convert("2.5", COLUMNS[1])
+    with pytest.raises(ValueError):
+        convert("far too long a name", COLUMNS[0])
+
+
+def test_columns_matched_by_name_ignoring_case_and_padding():
+    mapping, ignored, missing = map_columns([" guestname ", "NIGHTS", "Notes"], COLUMNS)
+    assert [col['name'] for _, col in mapping] == ["GuestName", "Nights"]
+    assert ignored == ["Notes"] and missing == []
+    assert map_columns(["Nights"], COLUMNS)[2] == ["GuestName"]
+
+
+def test_bad_rows_come_back_with_their_line_numbers(conn):
+    text = "GuestName,Nights,Rate\nAyesha,2,100\nBilal,two,90\nChen,-1,80\nDana,1,70\n"
+    result = import_file(conn, "Stays", csv_file(text), "stays.csv", columns=COLUMNS, chunk_rows=2)
+    assert (result['rows'], result['inserted'], result['error_count']) == (4, 2, 2)
+    # Line 3 fails conversion, line 4 is refused by the database
+    assert [line for line, _ in result['errors']] == [3, 4]
+    assert [r[0] for r in conn.rows()] == ["Ayesha", "Dana"]
+
+
+def test_missing_required_column_is_refused(conn):
+    with pytest.raises(ValueError):
+        import_file(conn, "Stays", csv_file("Nights\n2\n"), "stays.csv", columns=COLUMNS)
+
+
+def test_export_writes_every_batch(conn):
+    conn.db.executemany("INSERT INTO Stays VALUES (?, ?, ?)", [(f"G{i}", i + 1, "10") for i in range(7)])
+    out = io.BytesIO()
+    progress = []
+    n = export_query(conn, "SELECT GuestName, Nights FROM Stays", (), out, batch_size=3,
+                     on_progress=progress.append)
+    assert n == 7 and progress == [3, 6, 7]
+    lines = out.getvalue().decode("utf-8").splitlines()
+    assert lines[0] == "GuestName,Nights" and lines[1:3] == ["G0,1", "G1,2"] and len(lines) == 8
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+
+from catalog_replica import CatalogReplicator, CatalogSnapshot, read_info
+
+
+class FakePool:
+    # SQL Server stand-in: the same tables in an in-memory SQLite database
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.down = False
+        soon = date.today() + timedelta(days=3)
+        self.db.executescript(f"""
+            CREATE TABLE Room_Types (TypeID, TypeName, BasePrice, Description);
+            CREATE TABLE Restaurant_Outlets (OutletID, OutletName);
+            CREATE TABLE Spa_Services (SpaID, ServiceName, Price);
+            CREATE TABLE Rooms (RoomID, TypeID, Status);
+            CREATE TABLE Reservations (ResID, RoomID, CheckInDate, CheckOutDate, Status);
+            INSERT INTO Room_Types VALUES (1, 'Deluxe', 25000, 'City view'), (2, 'Suite', 60000, 'Sea view');
+            INSERT INTO Restaurant_Outlets VALUES (1, 'Main');
+            INSERT INTO Spa_Services VALUES (1, 'Massage', 8000);
+            INSERT INTO Rooms VALUES (101, 1, 'Ready'), (102, 1, 'Ready'), (201, 2, 'Ready');
+            INSERT INTO Reservations VALUES (1, 101, '{date.today()}', '{soon}', 'Confirmed'),
+                                            (2, 102, '2020-01-01', '2020-01-05', 'Confirmed');
+        """)
+
+    @contextmanager
+    def connection(self):
+        if self.down:
+            raise ConnectionError("server unreachable")
+        yield self.db
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "replica" / "catalog.sqlite")
+
+
+def test_copy_is_served_from_memory(pool, path):
+    assert CatalogReplicator(pool, path).run_once()
+    snap = CatalogSnapshot(path)
+    assert list(snap.table("Room_Types")["TypeName"]) == ["Deluxe", "Suite"]
+    # Reservation 2 ended years ago and is not copied
+    assert len(snap.table("Reservations")) == 1
+    assert snap.free_rooms("Deluxe", date.today(), date.today() + timedelta(days=1)) == 1
+    assert snap.free_rooms("Penthouse", date.today(), date.today() + timedelta(days=1)) == 0
+    assert snap.age() < 60
+
+
+def test_unchanged_rows_only_move_checked_at(pool, path):
+    rep = CatalogReplicator(pool, path)
+    rep.run_once()
+    inode = os.stat(path).st_ino
+    assert not rep.run_once()
+    assert rep.writes == 1 and os.stat(path).st_ino == inode
+    pool.db.execute("UPDATE Room_Types SET BasePrice = 27000 WHERE TypeID = 1")
+    assert rep.run_once() and rep.writes == 2
+
+
+def test_missing_file_is_written_again_even_with_the_same_rows(pool, path):
+    rep = CatalogReplicator(pool, path)
+    rep.run_once()
+    os.remove(path)
+    assert rep.run_once()
+    assert read_info(path)["Digest"] == rep.digest
+
+
+def test_no_snapshot_yet_means_the_site_falls_back(path):
+    snap = CatalogSnapshot(path)
+    assert snap.current() is None
+    assert snap.table("Room_Types") is None and snap.free_rooms("Deluxe", date.today(), date.today()) is None
+    assert snap.age() is None
+
+
+def test_damaged_copy_is_refused_and_the_last_good_one_kept(pool, path):
+    CatalogReplicator(pool, path).run_once()
+    snap = CatalogSnapshot(path, check_every=0)
+    digest = snap.current()["digest"]
+    # A copy whose rows no longer match the SHA-256 stored with them
+    db = sqlite3.connect(path)
+    db.execute("UPDATE Room_Types SET TypeName = 'Presidential' WHERE TypeID = 2")
+    db.execute("UPDATE Snapshot_Info SET Value = 'damaged' WHERE Key = 'Digest'")
+    db.commit()
+    db.close()
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    assert snap.current()["digest"] == digest
+    assert "checksum" in str(snap.last_error)
+    assert list(snap.table("Room_Types")["TypeName"]) == ["Deluxe", "Suite"]
+    # A fresh reader refuses the file outright
+    assert CatalogSnapshot(path).current() is None
+
+
+def test_server_down_keeps_the_last_snapshot(pool, path):
+    rep = CatalogReplicator(pool, path)
+    rep.run_once()
+    pool.down = True
+    with pytest.raises(ConnectionError):
+        rep.run_once()
+    snap = CatalogSnapshot(path)
+    assert snap.current()["digest"] == rep.digest
+
+
+def test_replicator_resumes_from_the_digest_on_disk(pool, path):
+    CatalogReplicator(pool, path).run_once()
+    restarted = CatalogReplicator(pool, path)
+    assert restarted.digest == read_info(path)["Digest"]
+    assert not restarted.run_once()
@@ -0,0 +1,94 @@
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import pytest
+
+from dashboard_snapshot import HISTORY_BATCH, TODAY_BATCH, DashboardSnapshot
+
+Revenue = namedtuple("Revenue", "checkout payments")
+Counts = namedtuple("Counts", "tot occ guests pending")
+
+
+def part(checkout, payments, outlets, food, categories, room_types):
+    return [[Revenue(checkout, payments)], outlets, food, categories, room_types]
+
+
+class FakePool:
+    # Each batch answers with its result sets in the order _read() takes them
+    def __init__(self):
+        self.history = part(1000, 300, [("Main", 300)], [("Tea", 40), ("Naan", 10)],
+                            [("Drinks", 200)], [("Deluxe", 1000)])
+        self.today = part(50, 20, [("Main", 15), ("Terrace", 5)], [("Naan", 35), ("Soup", None)],
+                          [("Drinks", 20)], [("Suite", 50)]) + [[Counts(10, 4, 7, 2)]]
+        self.batches = []
+        self.down = False
+
+    @contextmanager
+    def connection(self):
+        if self.down:
+            raise ConnectionError("server unreachable")
+        yield self
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        self.batches.append(sql)
+        self.sets = list(self.history if sql == HISTORY_BATCH else self.today)
+
+    def fetchone(self):
+        return self.sets[0][0]
+
+    def fetchall(self):
+        return self.sets[0]
+
+    def nextset(self):
+        self.sets.pop(0)
+        return bool(self.sets)
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+def test_totals_add_past_days_to_today(pool):
+    snap = DashboardSnapshot(pool).refresh()
+    assert snap['revenue'] == 1000 + 300 + 50 + 20
+    assert (snap['rooms_total'], snap['rooms_occupied'], snap['guests'], snap['pending_tasks']) == (10, 4, 7, 2)
+    assert snap['outlet_revenue'] == [("Main", 315), ("Terrace", 5)]
+    assert snap['food_top5'] == [("Naan", 45), ("Tea", 40), ("Soup", 0)]
+    assert snap['category_sales'] == [("Drinks", 220)]
+    assert snap['room_type_revenue'] == [("Deluxe", 1000), ("Suite", 50)]
+
+
+def test_history_is_read_once_per_rebuild_window(pool):
+    dash = DashboardSnapshot(pool, rebuild_every=3600)
+    dash.refresh()
+    pool.today[0] = [Revenue(80, 20)]
+    assert dash.refresh()['revenue'] == 1400
+    assert pool.batches == [HISTORY_BATCH, TODAY_BATCH, TODAY_BATCH]
+    # A forced rebuild picks up rewritten past days
+    pool.history[0] = [Revenue(2000, 300)]
+    assert dash.refresh(full=True)['revenue'] == 2400
+    assert pool.batches[-2:] == [HISTORY_BATCH, TODAY_BATCH]
+
+
+def test_latest_loads_on_first_use_then_serves_the_snapshot(pool):
+    dash = DashboardSnapshot(pool)
+    first = dash.latest()
+    assert dash.latest() is first and len(pool.batches) == 2
+
+
+def test_failed_refresh_keeps_the_previous_snapshot(pool):
+    dash = DashboardSnapshot(pool, refresh_every=3600)
+    first = dash.latest()
+    pool.down = True
+    dash.start()
+    deadline = time.monotonic() + 5
+    while dash.last_error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    dash.stop()
+    assert isinstance(dash.last_error, ConnectionError)
+    assert dash.latest() is first
@@ -0,0 +1,172 @@
+import threading
+import time
+
+import pytest
+
+from db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=()):
+        if self.conn.broken:
+            raise ConnectionError("link is gone")
+        self.conn.executed.append((sql, tuple(params)))
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.broken = False
+        self.closed = False
+        self.rollback_fails = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        if self.rollback_fails:
+            raise ConnectionError("rollback failed")
+
+    def close(self):
+        self.closed = True
+
+    def contexts(self):
+        return [params for sql, params in self.executed if sql.startswith("EXEC sp_set_session_context")]
+
+
+class FakeDriver:
+    def __init__(self):
+        self.opened = []
+
+    def connect(self):
+        conn = FakeConnection()
+        self.opened.append(conn)
+        return conn
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+def make_pool(driver, **kwargs):
+    return ConnectionPool(driver.connect, **kwargs)
+
+
+def test_reuses_the_most_recent_connection(driver):
+    pool = make_pool(driver)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert len(driver.opened) == 1
+    s = pool.stats()
+    assert (s['checkouts'], s['hits'], s['misses']) == (2, 1, 1)
+
+
+def test_never_opens_more_than_max_size(driver):
+    pool = make_pool(driver, max_size=2, checkout_timeout=0.05)
+    a, b = pool.acquire(), pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert len(driver.opened) == 2
+    assert pool.stats()['timeouts'] == 1
+    pool.release(a)
+    assert pool.acquire() is a
+    pool.release(b)
+
+
+def test_waiter_gets_a_connection_released_before_its_timeout(driver):
+    pool = make_pool(driver, max_size=1, checkout_timeout=2)
+    held = pool.acquire()
+    threading.Timer(0.05, pool.release, (held,)).start()
+    t = time.perf_counter()
+    assert pool.acquire() is held
+    assert time.perf_counter() - t < 1
+
+
+def test_stale_connection_failing_the_health_check_is_replaced(driver):
+    pool = make_pool(driver, health_check_after=0)
+    with pool.connection() as conn:
+        pass
+    conn.broken = True
+    with pool.connection() as fresh:
+        assert fresh is not conn
+    assert conn.closed
+    assert pool.stats()['health_failures'] == 1
+    assert pool.stats()['size'] == 1
+
+
+def test_recently_used_connection_skips_the_health_check(driver):
+    pool = make_pool(driver, health_check_after=60)
+    with pool.connection():
+        pass
+    with pool.connection() as conn:
+        pass
+    assert ("SELECT 1", ()) not in conn.executed
+
+
+def test_discarded_connection_frees_its_slot(driver):
+    pool = make_pool(driver, max_size=1, checkout_timeout=0.05)
+    conn = pool.acquire()
+    pool.release(conn, discard=True)
+    assert conn.closed
+    assert pool.acquire() is not conn
+    assert pool.stats()['discarded'] == 1
+
+
+def test_failed_rollback_discards_the_connection(driver):
+    pool = make_pool(driver)
+    conn = pool.acquire()
+    conn.rollback_fails = True
+    pool.release(conn)
+    assert conn.closed
+    assert pool.stats()['idle'] == 0
+
+
+def test_context_is_sent_only_when_it_changes(driver):
+    pool = make_pool(driver)
+    for _ in range(3):
+        with pool.connection({'UserID': 7}) as conn:
+            pass
+    with pool.connection({'UserID': 8}):
+        pass
+    assert conn.contexts() == [('UserID', 7), ('UserID', 8)]
+
+
+def test_checkout_without_context_resets_the_previous_one(driver):
+    pool = make_pool(driver)
+    with pool.connection({'UserID': 7}) as conn:
+        pass
+    with pool.connection():
+        pass
+    with pool.connection():
+        pass
+    assert conn.contexts() == [('UserID', 7), ('UserID', None)]
+
+
+def test_no_context_calls_without_context_sql(driver):
+    pool = make_pool(driver, context_sql=None)
+    with pool.connection({'UserID': 7}) as conn:
+        pass
+    assert conn.contexts() == []
+
+
+def test_closed_pool_refuses_checkouts(driver):
+    pool = make_pool(driver)
+    with pool.connection() as conn:
+        pass
+    pool.close()
+    assert conn.closed
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
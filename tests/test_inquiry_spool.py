@@ -0,0 +1,205 @@
+import json
+import os
+from contextlib import contextmanager
+
+import pytest
+
+from inquiry_spool import INSERT_SQL, InquirySpool, InquiryWriter, insert_batch
+
+
+class TransientError(Exception):
+    # pyodbc puts the SQLSTATE first
+    def __init__(self, state):
+        super().__init__(state, "Transaction was deadlocked")
+
+
+class FakeDatabase:
+    # Booking_Inquiries keyed by SpoolRef, as the insert's NOT EXISTS leaves it
+    def __init__(self):
+        self.rows = {}
+        self.down = False
+        self.refuse = set()            # names the database rejects
+        self.transient = {}            # name -> SQLSTATE raised for it
+        self.down_after = None         # name whose insert takes the server down
+        self.batches = []              # refs of every INSERT statement sent
+
+    @contextmanager
+    def connection(self, session_context=None):
+        if self.down:
+            raise ConnectionError("server unreachable")
+        yield FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.pending = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=()):
+        if self.db.down:
+            raise ConnectionError("server unreachable")
+        if sql == 'SELECT 1':
+            return self
+        rows = [params[i:i + 4] for i in range(0, len(params), 4)]
+        self.db.batches.append([r[3] for r in rows])
+        for r in rows:
+            if r[2] == self.db.down_after:
+                self.db.down = True
+                raise ConnectionError("server unreachable")
+            if r[2] in self.db.transient:
+                raise TransientError(self.db.transient[r[2]])
+        if any(r[2] in self.db.refuse for r in rows):
+            raise ValueError("String or binary data would be truncated")
+        self.pending += rows
+        return self
+
+    def fetchone(self):
+        return (1,)
+
+    def commit(self):
+        for service, phone, name, ref in self.pending:
+            self.db.rows.setdefault(ref, (service, phone, name))
+        self.pending = []
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return InquirySpool(str(tmp_path), fsync=False)
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+
+def test_double_submit_is_spooled_once(spool):
+    first = spool.append("Deluxe", "0300 1234567", "Ayesha Khan")
+    again = spool.append("Deluxe", "0300 1234567 ", "ayesha khan")
+    other = spool.append("Suite", "0300 1234567", "Ayesha Khan")
+    assert first == again != other
+    assert (spool.appended, spool.duplicates) == (2, 1)
+    assert len(spool.read_batch(10)[0]) == 2
+
+
+def test_flush_writes_and_checkpoints(spool, db):
+    for i in range(3):
+        spool.append("Deluxe", f"0300 000000{i}", f"Guest {i}")
+    writer = InquiryWriter(spool, db)
+    assert writer.flush_once() == 3
+    assert len(db.rows) == 3 and writer.written == 3
+    assert spool.read_batch(10)[0] == [] and spool.backlog_bytes() == 0
+    assert writer.flush_once() == 0
+
+
+def test_database_down_keeps_everything_spooled(spool, db):
+    spool.append("Deluxe", "0300 1234567", "Ayesha Khan")
+    writer = InquiryWriter(spool, db, split_after=3)
+    db.down = True
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            writer.flush_once()
+    assert spool.backlog_bytes() > 0 and writer.rejected == 0
+    db.down = False
+    assert writer.flush_once() == 1
+    assert len(db.rows) == 1 and writer.last_error is None
+
+
+def test_replay_after_a_crash_before_the_checkpoint_sends_the_same_refs(tmp_path, db):
+    spool = InquirySpool(str(tmp_path), fsync=False)
+    refs = {spool.append("Deluxe", f"0300 000000{i}", f"Guest {i}") for i in range(2)}
+    records, _ = spool.read_batch(10)
+    with db.connection() as conn:          # committed, then the process died
+        insert_batch(conn, records)
+    sent = [ref for batch in db.batches for ref in batch]
+
+    restarted = InquirySpool(str(tmp_path), fsync=False)
+    assert InquiryWriter(restarted, db).flush_once() == 2
+    replayed = [ref for batch in db.batches for ref in batch][len(sent):]
+    assert replayed == sent and set(sent) == refs
+    assert len(db.rows) == 2
+
+
+def test_bad_row_is_set_aside_after_repeated_failures(spool, db):
+    spool.append("Deluxe", "0300 1111111", "Good Guest")
+    spool.append("Deluxe", "0300 2222222", "Bad Guest")
+    db.refuse = {"Bad Guest"}
+    writer = InquiryWriter(spool, db, split_after=2)
+    with pytest.raises(ValueError):
+        writer.flush_once()
+    assert writer.flush_once() == 2
+    assert [r[2] for r in db.rows.values()] == ["Good Guest"]
+    assert (writer.written, writer.rejected) == (1, 1)
+    with open(os.path.join(spool.directory, 'rejected.jsonl'), encoding='utf-8') as f:
+        rejected = [json.loads(line) for line in f]
+    assert [r['name'] for r in rejected] == ["Bad Guest"] and 'truncated' in rejected[0]['error']
+
+
+def rejected_names(spool):
+    path = os.path.join(spool.directory, 'rejected.jsonl')
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['name'] for line in f]
+
+
+def test_transient_failure_is_retried_not_rejected(spool, db):
+    spool.append("Deluxe", "0300 1111111", "Good Guest")
+    spool.append("Deluxe", "0300 2222222", "Deadlocked Guest")
+    db.transient = {"Deadlocked Guest": '40001'}
+    writer = InquiryWriter(spool, db, split_after=1)
+    with pytest.raises(TransientError):
+        writer.flush_once()
+    assert rejected_names(spool) == [] and spool.backlog_bytes() > 0
+    db.transient = {}
+    assert writer.flush_once() == 2
+    assert (writer.written, writer.rejected) == (2, 0) and len(db.rows) == 2
+
+
+def test_outage_mid_split_sets_nothing_aside(spool, db):
+    spool.append("Deluxe", "0300 1111111", "Bad Guest")
+    spool.append("Deluxe", "0300 2222222", "Last Guest")
+    db.refuse = {"Bad Guest"}
+    db.down_after = "Last Guest"
+    writer = InquiryWriter(spool, db, split_after=1)
+    with pytest.raises(ConnectionError):
+        writer.flush_once()
+    # The bad row is still spooled, so it must not also be in rejected.jsonl
+    assert rejected_names(spool) == [] and writer.rejected == 0
+    db.down, db.down_after = False, None
+    assert writer.flush_once() == 2
+    assert rejected_names(spool) == ["Bad Guest"]
+
+
+def test_booking_date_is_left_to_the_server(spool):
+    spool.append("Deluxe", "0300 1111111", "Guest")
+    db = FakeDatabase()
+    with db.connection() as conn:
+        insert_batch(conn, spool.read_batch(10)[0])
+    assert "BookingDate" not in INSERT_SQL
+    assert list(db.rows.values()) == [("Deluxe", "0300 1111111", "Guest")]
+
+
+def test_torn_last_line_is_skipped_and_later_appends_survive(tmp_path, db):
+    spool = InquirySpool(str(tmp_path), fsync=False)
+    spool.append("Deluxe", "0300 1111111", "Before Crash")
+    with open(spool._segment_path(spool._seq), 'ab') as f:
+        f.write(b'{"ref": "torn')
+    restarted = InquirySpool(str(tmp_path), fsync=False)
+    restarted.append("Deluxe", "0300 2222222", "After Crash")
+    assert InquiryWriter(restarted, db).flush_once() == 2
+    assert sorted(r[2] for r in db.rows.values()) == ["After Crash", "Before Crash"]
+
+
+def test_segments_roll_over_and_are_removed_once_written(tmp_path, db):
+    spool = InquirySpool(str(tmp_path), segment_bytes=200, fsync=False)
+    for i in range(6):
+        spool.append("Deluxe", f"0300 000000{i}", f"Guest {i}")
+    assert len(spool._segments()) > 2
+    writer = InquiryWriter(spool, db, batch_rows=4)
+    assert writer.flush_once() == 4
+    assert writer.flush_once() == 2
+    assert len(db.rows) == 6
+    assert spool._segments() == [spool._seq]
@@ -0,0 +1,68 @@
+import pytest
+
+from inventory_engine import InventoryEngine, order_quantity
+
+ITEMS = [(1, "Rice", "Dry Goods", 50), (2, "Milk", "Dairy", 20), (3, "Soap", "Housekeeping", 100),
+         (4, "Tea", "Dry Goods", 10)]
+
+
+@pytest.fixture
+def engine():
+    e = InventoryEngine(pool=None)
+    e._vendors = {1: (7, "Metro"), 2: (8, "Nestle")}
+    e._apply(ITEMS, [(1, 10), (2, 20), (3, 150), (4, 2)], {2})
+    return e
+
+
+def test_alerts_are_items_at_or_below_minimum_biggest_shortfall_first(engine):
+    assert [(r['StockID'], r['Needed']) for r in engine.alerts()] == [(1, 40), (4, 8), (2, 0)]
+
+
+def test_alert_row_carries_vendor_order_quantity_and_draft_flag(engine):
+    rows = {r['StockID']: r for r in engine.alerts()}
+    assert rows[1]['Vendor'] == "Metro" and rows[1]['OrderQty'] == order_quantity(10, 50) == 90
+    assert rows[2]['Drafted'] and not rows[1]['Drafted']
+    assert rows[4]['Vendor'] is None
+
+
+def test_restock_above_minimum_clears_the_alert(engine):
+    version = engine.version
+    engine._apply([], [(1, 60)], {2})
+    assert 1 not in [r['StockID'] for r in engine.alerts()]
+    assert engine.version == version + 1
+
+
+def test_falling_below_minimum_raises_an_alert(engine):
+    engine._apply([], [(3, 40)], {2})
+    assert [r['StockID'] for r in engine.alerts()] == [3, 1, 4, 2]
+
+
+def test_raised_minimum_is_rechecked(engine):
+    engine._apply([(3, "Soap", "Housekeeping", 200)], [], {2})
+    assert engine.alerts()[0]['StockID'] == 3 and engine.alerts()[0]['Needed'] == 50
+
+
+def test_unchanged_poll_keeps_the_version_and_the_list(engine):
+    version, alerts = engine.version, engine.alerts()
+    engine._apply([], [(1, 10)], {2})
+    assert engine.version == version
+    assert engine.alerts() is alerts
+
+
+def test_draft_set_changes_update_the_flag(engine):
+    engine._apply([], [], {1, 2})
+    assert {r['StockID']: r['Drafted'] for r in engine.alerts()} == {1: True, 4: False, 2: True}
+
+
+def test_items_without_an_inventory_row_never_alert(engine):
+    engine._apply([(5, "Salt", "Dry Goods", 10)], [], {2})
+    assert 5 not in [r['StockID'] for r in engine.alerts()]
+
+
+def test_summary_counts(engine):
+    assert engine.summary() == {'items': 4, 'low': 3, 'drafted': 1, 'no_vendor': 1}
+
+
+def test_order_quantity_never_negative():
+    assert order_quantity(150, 50) == 0
+    assert order_quantity(None, None) == 0
@@ -0,0 +1,141 @@
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+from kitchen_feed import DELTA_BATCH, FULL_BATCH, ZERO_VERSION, KitchenFeed
+
+Head = namedtuple("Head", "hi server_now")
+Line = namedtuple("Line", "OrderID DetailID OutletName TableNo ItemName Qty CookingStatus OrderTime")
+
+
+def version(n):
+    return n.to_bytes(8, "big")
+
+
+class FakeDatabase:
+    # Orders with the last rowversion that touched them; `writing` is the
+    # version of a transaction still open, which MIN_ACTIVE_ROWVERSION stops at
+    def __init__(self):
+        self.counter = 0
+        self.writing = None
+        self.orders = {}                # OrderID -> (rowver, status, [(DetailID, item, qty)])
+        self.order_time = datetime(2026, 3, 1, 12, 0)
+        self.server_now = self.order_time + timedelta(minutes=30)
+        self.batches = []
+
+    def put(self, order_id, status, lines, rowver=None):
+        if rowver is None:
+            self.counter += 1
+            rowver = self.counter
+        self.orders[order_id] = (rowver, status, lines)
+
+    def rows(self, order_ids):
+        return [Line(oid, did, "Main", 4, item, qty, self.orders[oid][1], self.order_time + timedelta(minutes=oid))
+                for oid in sorted(order_ids) for did, item, qty in self.orders[oid][2]]
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+
+    def execute(self, sql, params):
+        db = self.db
+        since = int.from_bytes(params[0], "big")
+        hi = db.writing if db.writing is not None else db.counter + 1
+        db.batches.append((sql, since))
+        if sql == FULL_BATCH:
+            ids = [oid for oid, (_, status, _) in db.orders.items() if status in ("Pending", "Preparing")]
+        else:
+            assert sql == DELTA_BATCH
+            ids = [oid for oid, (rv, _, _) in db.orders.items() if since <= rv < hi]
+        self.result = [[Head(version(hi), db.server_now)], db.rows(ids)]
+
+    def fetchone(self):
+        return self.result[0][0]
+
+    def nextset(self):
+        self.result.pop(0)
+        return True
+
+    def fetchall(self):
+        return self.result[0]
+
+
+@pytest.fixture
+def db():
+    d = FakeDatabase()
+    d.put(1, "Pending", [(10, "Biryani", 2), (11, "Naan", 4)])
+    d.put(2, "Preparing", [(20, "Karahi", 1)])
+    d.put(3, "Served", [(30, "Tea", 2)])
+    return d
+
+
+def test_first_pass_loads_open_tickets_with_server_elapsed_time(db):
+    feed = KitchenFeed(db)
+    assert sorted(feed.poll()) == [1, 2]
+    version_, lines = feed.board()
+    assert [l["DetailID"] for l in lines] == [10, 11, 20]
+    # Minutes from the server's clock, not this machine's
+    assert lines[0]["Minutes_Elapsed"] in (29, 30)
+    assert db.batches[0] == (FULL_BATCH, 0)
+
+
+def test_later_passes_read_only_what_changed_since_the_last_version(db):
+    feed = KitchenFeed(db)
+    feed.poll()
+    first = feed.version
+    db.put(2, "Served", [(20, "Karahi", 1)])
+    db.put(4, "Pending", [(40, "Lassi", 1)])
+    assert sorted(feed.poll()) == [2, 4]
+    assert db.batches[1] == (DELTA_BATCH, 4)
+    assert [l["OrderID"] for l in feed.board()[1]] == [1, 1, 4]
+    assert feed.changed_since(first) == {2, 4}
+    assert feed.poll() == [] and feed.version == first + 1
+
+
+def test_row_still_being_written_is_picked_up_on_a_later_pass(db):
+    feed = KitchenFeed(db)
+    feed.poll()
+    # Version 5 is allocated to an open transaction while 6 commits first
+    db.writing = 5
+    db.put(5, "Pending", [(50, "Soup", 1)], rowver=6)
+    assert feed.poll() == []
+    db.put(6, "Pending", [(60, "Salad", 1)], rowver=5)
+    db.counter, db.writing = 6, None
+    assert sorted(feed.poll()) == [5, 6]
+
+
+def test_periodic_reload_drops_deleted_lines(db):
+    feed = KitchenFeed(db, reload_every=600)
+    feed.poll()
+    # Deleting a line bumps no rowversion, so the delta cannot see it
+    db.orders[1] = (db.orders[1][0], "Pending", [(10, "Biryani", 2)])
+    assert feed.poll() == []
+    feed.reload_every = 0
+    assert feed.poll() == [1]
+    assert [l["DetailID"] for l in feed.board()[1]] == [10, 20]
+
+
+def test_changed_since_gives_up_beyond_the_kept_history(db):
+    feed = KitchenFeed(db, history=2)
+    feed.poll()
+    for oid in (5, 6, 7):
+        db.put(oid, "Pending", [(oid * 10, "Tea", 1)])
+        feed.poll()
+    assert feed.changed_since(0) is None
+    assert feed.changed_since(feed.version - 1) == {7}
+
+
+def test_outlet_filter_and_zero_version_constant(db):
+    feed = KitchenFeed(db).ensure_loaded()
+    assert feed.board("Terrace")[1] == []
+    assert ZERO_VERSION == version(0)
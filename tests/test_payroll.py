@@ -0,0 +1,68 @@
+from datetime import date, time
+
+import pandas as pd
+import pytest
+
+from payroll import compute, compute_slips
+
+MONTH = "2026-02"
+
+
+@pytest.fixture
+def month_data():
+    employees = pd.DataFrame({'EmpID': [1, 2, 3, 4, 5, 6],
+                              'FullName': ["Asad", "Bina", "Chand", "Dua", "Ehsan", "Faiza"],
+                              'DeptID': [10, 10, 20, 20, 30, None],
+                              'Salary': [56000, 84000, 28000, 112000, 70000, 42000]})
+    attendance = pd.DataFrame([
+        (1, date(2026, 2, 2), 'Absent', 1, None),
+        (1, date(2026, 2, 3), 'Late', 1, 8),
+        (2, date(2026, 2, 2), 'Present', 2, 11),
+        (2, date(2026, 2, 2), 'Present', 2, 11),        # entered twice
+        (3, date(2026, 2, 4), 'Half Day', 1, 4),
+        (3, date(2026, 2, 5), 'Overtime', 1, None),
+        (4, date(2026, 2, 10), 'Absent', 1, None),       # covered by paid leave
+        (5, date(2026, 2, 27), 'Present', 3, 10),
+    ], columns=['EmpID', 'Date', 'Status', 'ShiftID', 'HoursWorked'])
+    leaves = pd.DataFrame([
+        (4, 'Annual', date(2026, 2, 9), date(2026, 2, 11)),
+        (5, 'Unpaid', date(2026, 1, 30), date(2026, 2, 2)),  # only Feb 1-2 count
+    ], columns=['EmpID', 'LeaveType', 'StartDate', 'EndDate'])
+    shifts = pd.DataFrame({'ShiftID': [1, 2, 3],
+                           'StartTime': [time(9), time(14), time(22)],
+                           'EndTime': [time(17), time(22), time(6)]})
+    return employees, attendance, leaves, shifts
+
+
+def by_emp(slips):
+    return slips.set_index('EmpID')
+
+
+def test_deductions_follow_attendance_and_leave(month_data):
+    slips = by_emp(compute_slips(MONTH, *month_data))
+    assert slips.loc[1, 'DaysDeducted'] == 1.25          # Absent + Late
+    assert slips.loc[1, 'Deductions'] == round(1.25 * 56000 / 28, 2)
+    assert slips.loc[3, 'DaysDeducted'] == 0.5
+    assert slips.loc[4, 'DaysDeducted'] == 0.0            # paid leave wins over the Absent mark
+    assert slips.loc[5, 'DaysDeducted'] == 2.0            # unpaid leave inside the month
+    assert slips.loc[6, 'NetPay'] == 42000
+
+
+def test_overtime_is_hours_past_the_shift(month_data):
+    slips = by_emp(compute_slips(MONTH, *month_data))
+    assert slips.loc[2, 'OvertimeHours'] == 3.0           # counted once despite the duplicate row
+    assert slips.loc[3, 'OvertimeHours'] == 2.0           # 'Overtime' without hours
+    assert slips.loc[5, 'OvertimeHours'] == 2.0           # night shift over midnight
+    assert slips.loc[2, 'OvertimePay'] == round(3 * 84000 / 28 / 8 * 1.5, 2)
+
+
+def test_parallel_run_matches_serial(month_data):
+    serial = compute(MONTH, *month_data, workers=1)
+    parallel = compute(MONTH, *month_data, workers=2, parallel_from=0)
+    pd.testing.assert_frame_equal(serial.sort_values('EmpID', ignore_index=True), parallel)
+
+
+def test_empty_shift_table_uses_standard_hours(month_data):
+    employees, attendance, leaves, shifts = month_data
+    slips = by_emp(compute_slips(MONTH, employees, attendance, leaves, shifts.iloc[0:0]))
+    assert slips.loc[2, 'OvertimeHours'] == 3.0
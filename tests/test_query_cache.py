@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+
+import query_cache
+from query_cache import QueryCache, last_change, signal_change
+
+
+@pytest.fixture(autouse=True)
+def signal_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(query_cache, "SIGNAL_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_loads_once_then_hits():
+    cache = QueryCache()
+    calls = []
+    load = lambda: calls.append(1) or ["Deluxe"]
+    assert cache.get_or_load("types", load, ttl=60) == ["Deluxe"]
+    assert cache.get_or_load("types", load, ttl=60) == ["Deluxe"]
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entry_expires_after_its_ttl():
+    cache = QueryCache()
+    cache.put("types", ["Deluxe"], ttl=0)
+    assert cache.get("types") is None
+
+
+def test_failed_load_is_not_cached():
+    cache = QueryCache()
+    assert cache.get_or_load("types", lambda: None, ttl=60) is None
+    assert cache.get_or_load("types", lambda: ["Suite"], ttl=60) == ["Suite"]
+
+
+def test_write_signalled_by_another_process_invalidates_readers_of_that_table():
+    cache = QueryCache()
+    cache.put("types", ["Deluxe"], ttl=60, tables=("Room_Types",), stored_at=time.time() - 5)
+    cache.put("spa", ["Massage"], ttl=60, tables=("Spa_Services",), stored_at=time.time() - 5)
+    signal_change("Room_Types")
+    assert cache.get("types") is None
+    assert cache.get("spa") == ["Massage"]
+
+
+def test_write_during_a_load_still_invalidates_it():
+    cache = QueryCache()
+
+    def load():
+        # The admin app commits while the website's query is running
+        signal_change("Room_Types")
+        return ["Deluxe"]
+    cache.get_or_load("types", load, ttl=60, tables=("Room_Types",))
+    assert cache.get("types") is None
+
+
+def test_only_catalog_tables_are_signalled(signal_dir):
+    signal_change("Audit_Logs", "Rooms")
+    assert os.listdir(signal_dir) == ["Rooms.stamp"]
+    assert last_change("Audit_Logs") == 0.0 and last_change("Rooms") > 0
+
+
+def test_invalidate_and_lru_bound():
+    cache = QueryCache(max_entries=2)
+    cache.put("a", 1, ttl=60, tables=("Rooms",))
+    cache.put("b", 2, ttl=60, tables=("Rooms", "Room_Types"))
+    cache.get("a")
+    cache.put("c", 3, ttl=60)
+    assert cache.get("b") is None and cache.get("a") == 1
+    assert cache.invalidate("Rooms") == 1 and cache.get("c") == 3
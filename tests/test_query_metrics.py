@@ -0,0 +1,40 @@
+import pytest
+
+from query_metrics import QueryStats, fingerprint, read_published
+
+
+def test_fingerprint_folds_literals_and_lists():
+    a = fingerprint("SELECT * FROM Guests WHERE GuestID = 42 AND Name = 'O''Brien'")
+    b = fingerprint("select *  from Guests where GuestID = 7 and Name = N'Ali' -- note")
+    assert a == b == "select * from guests where guestid = ? and name = ?"
+    assert fingerprint("WHERE ID IN (1, 2, 3)") == fingerprint("WHERE ID IN (4,5)")
+
+
+def test_calls_are_grouped_by_fingerprint():
+    stats = QueryStats(slow_ms=1e9)
+    stats.record("SELECT 1 FROM T WHERE ID = 1", 0.010, rows=1)
+    stats.record("SELECT 1 FROM T WHERE ID = 2", 0.030, rows=1)
+    stats.record("SELECT 2", 0.005, error=ValueError())
+    top = stats.top()
+    assert [r['calls'] for r in top] == [2, 1]
+    assert top[0]['total_ms'] == pytest.approx(40) and top[0]['avg_ms'] == pytest.approx(20)
+    assert top[0]['rows'] == 2 and top[1]['errors'] == 1
+
+
+def test_timed_records_failures_and_reraises():
+    stats = QueryStats(slow_ms=1e9)
+    with pytest.raises(RuntimeError):
+        with stats.timed("SELECT 1"):
+            raise RuntimeError("gone")
+    assert stats.top()[0]['errors'] == 1
+
+
+def test_published_stats_can_be_read_by_another_process(tmp_path):
+    path = str(tmp_path / "query_stats_website.json")
+    assert read_published('website', path) == (None, [])
+    stats = QueryStats(slow_ms=1e9, app='website')
+    stats.record("SELECT TypeName FROM Room_Types", 0.002, rows=4)
+    stats.publish(path)
+    published, rows = read_published('website', path)
+    assert published is not None
+    assert rows == stats.top('total_ms')
@@ -0,0 +1,75 @@
+from datetime import date, datetime
+
+import pytest
+
+from reports import AUDIT_PAGE, QUICK_INSIGHTS, SECURITY_LOGS, bind_report, bind_security_log
+
+START, END = date(2026, 3, 1), date(2026, 3, 31)
+WEEK = datetime(2026, 3, 1), datetime(2026, 3, 8)
+
+
+@pytest.mark.parametrize("name", list(QUICK_INSIGHTS))
+def test_every_report_binds_one_value_per_marker(name):
+    for dept in ("All Departments", "Kitchen"):
+        sql, params = bind_report(name, START, END, dept)
+        assert sql.count("?") == len(params)
+
+
+def test_date_filter_is_passed_as_parameters_not_text():
+    sql, params = bind_report("Current Occupancy", START, END, "All Departments")
+    assert params == (START, END)
+    assert "2026" not in sql
+    assert bind_report("Current Occupancy", date(2025, 1, 1), END, "All Departments")[0] == sql
+
+
+def test_day_range_is_half_open_over_whole_days():
+    _, params = bind_report("Guest Service & Preference History", START, END, "All Departments")
+    assert params == (datetime(2026, 3, 1), datetime(2026, 4, 1))
+
+
+def test_department_picks_the_filtered_variant():
+    all_sql, all_params = bind_report("Staff Directory & Payroll", START, END, "All Departments")
+    dept_sql, dept_params = bind_report("Staff Directory & Payroll", START, END, "Kitchen")
+    assert all_params == () and "WHERE D.DeptName = ?" not in all_sql
+    assert dept_params == ("Kitchen",) and "WHERE D.DeptName = ?" in dept_sql
+
+
+def test_reports_without_a_department_variant_ignore_the_filter():
+    assert bind_report("Low Stock Alerts", START, END, "Kitchen") == \
+        bind_report("Low Stock Alerts", START, END, "All Departments")
+
+
+def test_failed_logins_take_the_range_only():
+    start, end = WEEK
+    assert bind_security_log("Failed Logins", start, end) == (SECURITY_LOGS["Failed Logins"], (start, end))
+
+
+def test_audit_trail_first_page_starts_at_the_end_of_the_range():
+    start, end = WEEK
+    sql, params = bind_security_log("Audit Trail", start, end)
+    assert sql == SECURITY_LOGS["Audit Trail"]
+    assert params == (AUDIT_PAGE, start, end, end, end, 0)
+
+
+def test_audit_trail_page_size_is_a_parameter():
+    start, end = WEEK
+    sql, params = bind_security_log("Audit Trail", start, end, limit=10)
+    assert "TOP (?)" in sql and sql == bind_security_log("Audit Trail", start, end)[0]
+    assert params[0] == 10
+
+
+def test_audit_trail_next_page_continues_from_the_last_row_shown():
+    start, end = WEEK
+    last = (datetime(2026, 3, 5, 14, 30), 9120)
+    _, params = bind_security_log("Audit Trail", start, end, before=last)
+    assert params == (AUDIT_PAGE, start, end, last[0], last[0], 9120)
+
+
+@pytest.mark.parametrize("user, table", [("admin", None), (None, "Guests"), ("admin", "Guests")])
+def test_audit_trail_filters_add_a_clause_and_a_value_each(user, table):
+    start, end = WEEK
+    sql, params = bind_security_log("Audit Trail", start, end, user=user, table=table)
+    assert sql.count("?") == len(params)
+    assert ("u.Username = ?" in sql) == bool(user)
+    assert ("a.TableAffected = ?" in sql) == bool(table)
+    assert params[6:] == tuple(v for v in (user, table) if v)
@@ -0,0 +1,45 @@
+from datetime import date, datetime
+
+from reports import bind_report
+from rollups import split_range
+
+
+def test_range_ending_today_reads_past_days_from_rollups_and_today_raw():
+    assert split_range(date(2026, 3, 1), date(2026, 3, 10), today=date(2026, 3, 10)) == \
+        (date(2026, 3, 1), date(2026, 3, 10), datetime(2026, 3, 10), datetime(2026, 3, 11))
+
+
+def test_range_in_the_past_is_all_rollups():
+    rollup_from, rollup_to, raw_from, raw_to = split_range(date(2026, 1, 1), date(2026, 1, 31),
+                                                           today=date(2026, 3, 10))
+    assert (rollup_from, rollup_to) == (date(2026, 1, 1), date(2026, 2, 1))
+    assert raw_from == raw_to == datetime(2026, 2, 1)
+
+
+def test_range_in_the_future_is_all_raw():
+    rollup_from, rollup_to, raw_from, raw_to = split_range(date(2026, 4, 1), date(2026, 4, 5),
+                                                           today=date(2026, 3, 10))
+    assert rollup_from == rollup_to == date(2026, 4, 1)
+    assert (raw_from, raw_to) == (datetime(2026, 4, 1), datetime(2026, 4, 6))
+
+
+def test_single_day_today_is_all_raw():
+    day = date(2026, 3, 10)
+    rollup_from, rollup_to, raw_from, raw_to = split_range(day, day, today=day)
+    assert rollup_from == rollup_to
+    assert (raw_from, raw_to) == (datetime(2026, 3, 10), datetime(2026, 3, 11))
+
+
+def test_halves_meet_without_a_gap_or_overlap():
+    for today in (date(2026, 2, 27), date(2026, 3, 1), date(2026, 3, 15), date(2026, 4, 2)):
+        rollup_from, rollup_to, raw_from, raw_to = split_range(date(2026, 3, 1), date(2026, 3, 31), today=today)
+        assert datetime.combine(rollup_to, datetime.min.time()) == raw_from
+        assert rollup_from == date(2026, 3, 1) and raw_to == datetime(2026, 4, 1)
+
+
+def test_rollup_reports_bind_the_split():
+    sql, params = bind_report("Detailed Restaurant Order Breakdown", date(2026, 3, 1), date(2026, 3, 31),
+                              "All Departments")
+    assert len(params) == 4 and sql.count("?") == 4
+    assert params[0] == date(2026, 3, 1)
+    assert params[3] == datetime(2026, 4, 1)
@@ -0,0 +1,121 @@
+from contextlib import contextmanager
+
+import pytest
+
+from schema_catalog import CATALOG_BATCH, ROWS_SQL, VERSION_SQL, SchemaCatalog, label_column
+
+COLUMNS = [
+    ("Guests", "GuestID", "int", 4, 0, 1, 0, 0),
+    ("Guests", "FullName", "nvarchar", 100, 0, 0, 0, 0),
+    ("Guests", "Stamp", "timestamp", 8, 0, 0, 0, 0),
+    ("Stays", "GuestID", "int", 4, 0, 0, 0, 0),
+    ("Stays", "Night", "date", 3, 0, 0, 0, 0),
+    ("Stays", "Total", "money", 8, 1, 0, 1, 0),
+]
+
+
+class FakePool:
+    # Answers the catalog batch, the version probe, the row counts and the
+    # dropdown query from the lists below
+    def __init__(self):
+        self.version = ("2026-03-01", 5)
+        self.columns = list(COLUMNS)
+        self.rows = [("Guests", 3), ("Stays", 12)]
+        self.guests = [(1, "Ayesha"), (2, "Bilal")]
+        self.executed = []
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        self.executed.append(sql)
+        if sql == CATALOG_BATCH:
+            self.sets = [[self.version], self.columns, [("Stays", "GuestID"), ("Stays", "Night"), ("Guests", "GuestID")],
+                         [("Stays", "GuestID", "Guests", "GuestID")], self.rows]
+        elif sql == VERSION_SQL:
+            self.sets = [[self.version]]
+        elif sql == ROWS_SQL:
+            self.sets = [self.rows]
+        else:
+            self.sets = [self.guests]
+
+    def fetchone(self):
+        return self.sets[0][0]
+
+    def fetchall(self):
+        return self.sets[0]
+
+    def nextset(self):
+        self.sets.pop(0)
+        return bool(self.sets)
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+def test_keys_and_columns_come_from_the_catalog(pool):
+    cat = SchemaCatalog(pool)
+    assert cat.tables() == ["Guests", "Stays"]
+    stays = cat.table("Stays")
+    assert stays['pk'] == ["GuestID", "Night"] and stays['rows'] == 12
+    assert stays['fks'] == {"GuestID": ("Guests", "GuestID")}
+    # nvarchar lengths are stored in bytes
+    assert cat.table("Guests")['columns'][1]['max_len'] == 50
+    assert [c['name'] for c in cat.editable_columns("Guests")] == ["FullName"]
+    assert [c['name'] for c in cat.editable_columns("Stays")] == ["GuestID", "Night"]
+    assert cat.editable_columns("Nope") == []
+
+
+def test_reload_only_when_the_schema_version_moves(pool):
+    cat = SchemaCatalog(pool, check_every=0, rows_every=3600)
+    cat.tables()
+    cat.tables()
+    assert cat.loads == 1 and pool.executed[-1] == VERSION_SQL
+    pool.version = ("2026-03-02", 6)
+    pool.columns.append(("Stays", "Notes", "varchar", 200, 1, 0, 0, 0))
+    assert [c['name'] for c in cat.table("Stays")['columns']][-1] == "Notes"
+    assert cat.loads == 2
+
+
+def test_row_estimates_refresh_on_their_own_schedule(pool):
+    cat = SchemaCatalog(pool, check_every=3600, rows_every=0)
+    cat.tables()
+    pool.rows = [("Guests", 4), ("Stays", 12), ("Dropped", 1)]
+    assert cat.table("Guests")['rows'] == 4
+    assert cat.loads == 1 and pool.executed[-1] == ROWS_SQL
+
+
+def test_invalidate_forces_a_full_reload(pool):
+    cat = SchemaCatalog(pool, check_every=3600, rows_every=3600)
+    cat.tables()
+    cat.invalidate()
+    cat.tables()
+    assert cat.loads == 2
+
+
+def test_fk_dropdown_is_cached_until_the_table_changes(pool):
+    cat = SchemaCatalog(pool, check_every=3600, rows_every=3600)
+    assert cat.lookup("Stays", "GuestID") == [(1, "1 · Ayesha"), (2, "2 · Bilal")]
+    assert "ORDER BY [FullName]" in pool.executed[-1]
+    pool.guests = [(1, "Ayesha")]
+    assert len(cat.lookup("Stays", "GuestID")) == 2
+    cat.changed("Guests")
+    assert cat.lookup("Stays", "GuestID") == [(1, "1 · Ayesha")]
+    assert cat.lookup("Stays", "Night") is None
+
+
+def test_large_reference_tables_get_no_dropdown(pool):
+    cat = SchemaCatalog(pool, lookup_limit=2)
+    assert cat.lookup("Stays", "GuestID") is None
+
+
+def test_label_prefers_a_name_column():
+    entry = {'columns': [{'name': 'Code', 'type': 'char'}, {'name': 'OutletName', 'type': 'varchar'}]}
+    assert label_column(entry, 'OutletID') == 'OutletName'
+    assert label_column({'columns': []}, 'OutletID') is None
@@ -0,0 +1,96 @@
+import pytest
+
+from search_index import GUEST, INQUIRY, SearchIndex, phone_digits, query_terms
+
+
+@pytest.fixture
+def index():
+    ix = SearchIndex()
+    ix.add_many([
+        (GUEST, 1, "Ayesha Khan", "+92 300-1234567", "ayesha@example.com", "35202-1234567-1"),
+        (GUEST, 2, "Bilal Ahmed", "0321 7654321", None, None),
+        (GUEST, 3, "Khalid Mahmood", None, None, None),
+        (INQUIRY, 1, "José Álvarez", "0092 333 1112223", None, None),
+        (INQUIRY, 2, "Ayesha Siddiqui", "0300-9998887", None, None),
+    ])
+    return ix
+
+
+def ids(results):
+    return [(source, row_id) for source, row_id, _ in results]
+
+
+def test_phone_numbers_fold_to_one_form():
+    assert phone_digits("+92 300-1234567") == phone_digits("0092300 1234567") == "03001234567"
+    assert query_terms("0300 1234567") == ["03001234567"]
+
+
+def test_name_words_match_in_any_order(index):
+    total, results = index.search("khan ayesha")
+    assert total == 1 and ids(results) == [(GUEST, 1)]
+
+
+def test_two_letters_match_word_starts_only(index):
+    _, results = index.search("kh")
+    assert set(ids(results)) == {(GUEST, 1), (GUEST, 3)}
+
+
+def test_whole_word_ranks_above_a_word_inside_another(index):
+    index.add(GUEST, 4, "Mehkhan Ali")
+    _, results = index.search("khan")
+    assert ids(results)[0] == (GUEST, 1)
+    assert (GUEST, 4) in ids(results)
+
+
+def test_phone_fragment_and_formats_find_the_record(index):
+    assert ids(index.search("0300 1234567")[1]) == [(GUEST, 1)]
+    assert ids(index.search("7654321")[1]) == [(GUEST, 2)]
+    assert ids(index.search("+92 333 1112223")[1]) == [(INQUIRY, 1)]
+
+
+def test_accents_and_case_are_ignored(index):
+    assert ids(index.search("JOSE alvarez")[1]) == [(INQUIRY, 1)]
+
+
+def test_email_and_identity_are_searchable(index):
+    assert ids(index.search("ayesha@example.com")[1]) == [(GUEST, 1)]
+    assert ids(index.search("3520212345671")[1]) == [(GUEST, 1)]
+
+
+def test_source_filter(index):
+    total, results = index.search("ayesha", source=INQUIRY)
+    assert total == 1 and ids(results) == [(INQUIRY, 2)]
+
+
+def test_paging_splits_the_ranked_list(index):
+    total, first = index.search("ayesha", limit=1)
+    _, second = index.search("ayesha", limit=1, offset=1)
+    assert total == 2
+    assert set(ids(first + second)) == {(GUEST, 1), (INQUIRY, 2)}
+
+
+def test_too_short_or_unknown_terms_find_nothing(index):
+    assert index.search("a") == (0, [])
+    assert index.search("zzz") == (0, [])
+
+
+def test_updated_record_is_found_by_its_new_text_only(index):
+    index.add(GUEST, 2, "Bilal Qureshi", "0321 7654321")
+    assert index.search("ahmed") == (0, [])
+    assert ids(index.search("qureshi")[1]) == [(GUEST, 2)]
+    assert len(index) == 5 and index.dead == 1
+
+
+def test_unchanged_record_is_not_rewritten(index):
+    index.add(GUEST, 3, "Khalid Mahmood")
+    assert index.dead == 0
+
+
+def test_removed_record_disappears_and_compaction_drops_it(index):
+    index.remove(GUEST, 3)
+    index.remove(GUEST, 2)
+    assert index.search("khalid") == (0, [])
+    assert index.ids(GUEST) == {1}
+    assert index.compact()
+    assert index.dead == 0 and len(index) == 3
+    assert ids(index.search("ayesha khan")[1]) == [(GUEST, 1)]
@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+from sql_console import ConsoleRunner
+
+
+class FakeCursor:
+    # Commands are ";"-separated: "SELECT n" returns n rows, "UPDATE n"
+    # affects n rows, "SLEEP" blocks until the cursor is cancelled
+    def __init__(self, conn):
+        self.conn = conn
+        self.sets = []
+        self.cancelled = threading.Event()
+
+    def execute(self, sql, params=()):
+        self.conn.executed.append(sql)
+        if sql == "SELECT @@SPID":
+            self.sets = [('rows', [(55,)])]
+            return
+        if sql.startswith(("EXEC", "SET")):
+            self.sets = []
+            return
+        self.sets = []
+        for stmt in sql.split(";"):
+            verb, _, n = stmt.strip().partition(" ")
+            if verb == "SLEEP":
+                if self.cancelled.wait(5):
+                    raise RuntimeError("Operation canceled")
+            elif verb == "SELECT":
+                self.sets.append(('rows', [(i,) for i in range(int(n))]))
+            else:
+                self.sets.append(('count', int(n)))
+
+    @property
+    def description(self):
+        return [('n',)] if self.sets and self.sets[0][0] == 'rows' else None
+
+    @property
+    def rowcount(self):
+        return self.sets[0][1] if self.sets and self.sets[0][0] == 'count' else -1
+
+    def fetchmany(self, n):
+        rows = self.sets[0][1]
+        batch, self.sets[0] = rows[:n], ('rows', rows[n:])
+        return batch
+
+    def fetchone(self):
+        return self.fetchmany(1)[0]
+
+    def nextset(self):
+        self.sets = self.sets[1:]
+        return bool(self.sets)
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.timeout = None
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+        self.cursors = []
+
+    def cursor(self):
+        cur = FakeCursor(self)
+        self.cursors.append(cur)
+        return cur
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def conns():
+    return []
+
+
+@pytest.fixture
+def runner(conns):
+    def connect():
+        conns.append(FakeConnection())
+        return conns[-1]
+    return ConsoleRunner(connect, workers=1, max_rows=4, batch=2)
+
+
+def finish(job):
+    deadline = time.monotonic() + 5
+    while job.active and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not job.active
+    return job
+
+
+def test_command_under_the_cap_is_committed(runner, conns):
+    job = finish(runner.submit("UPDATE 2; SELECT 3", "admin"))
+    assert job.status == 'done'
+    assert job.rowcounts == [2]
+    assert job.results == [{'columns': ['n'], 'rows': [(0,), (1,), (2,)], 'truncated': False}]
+    assert (conns[0].commits, conns[0].rollbacks, conns[0].closed) == (1, 0, True)
+
+
+def test_result_of_exactly_the_cap_is_not_cut_short(runner, conns):
+    job = finish(runner.submit("SELECT 4", "admin"))
+    assert job.status == 'done'
+    assert job.rows == 4 and not job.results[0]['truncated']
+    assert conns[0].commits == 1
+
+
+def test_cap_cuts_the_batch_short_and_rolls_it_back(runner, conns):
+    job = finish(runner.submit("UPDATE 3; SELECT 10; UPDATE 2", "admin"))
+    assert job.status == 'truncated'
+    assert job.rows == 4 and job.results[0]['truncated']
+    # The UPDATE after the capped result was never reached, the one before is undone
+    assert job.rowcounts == [3]
+    assert (conns[0].commits, conns[0].rollbacks) == (0, 1)
+    assert conns[0].cursors[0].cancelled.is_set()
+
+
+def test_statement_past_its_deadline_times_out(runner, conns):
+    job = finish(runner.submit("SLEEP", "admin", timeout=0.1))
+    assert job.status == 'timed out'
+    assert conns[0].timeout == 0.1
+    assert (conns[0].commits, conns[0].rollbacks) == (0, 1)
+
+
+def test_cancel_stops_a_running_statement(runner, conns):
+    job = runner.submit("SLEEP", "admin")
+    deadline = time.monotonic() + 5
+    while job._cursor is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    job.cancel()
+    assert finish(job).status == 'cancelled'
+
+
+def test_estimate_compile_is_bounded_by_the_timeout(runner, conns):
+    t = time.perf_counter()
+    with pytest.raises(RuntimeError):
+        runner.estimate("SLEEP", timeout=0.1)
+    assert time.perf_counter() - t < 2
+    assert conns[0].timeout == 0.1
+    assert conns[0].executed[0] == "SET SHOWPLAN_XML ON"
+    assert conns[0].closed
@@ -0,0 +1,55 @@
+import pytest
+
+from table_pager import fetch_page, quote_ident, read_frame
+
+
+class FakeCursor:
+    def __init__(self, rows, columns=("ID", "Name")):
+        self.rows = list(rows)
+        self.description = [(c,) for c in columns]
+        self.executed = []
+        self.fetches = 0
+
+    def execute(self, sql, params=()):
+        self.executed.append((sql, params))
+
+    def fetchmany(self, n):
+        self.fetches += 1
+        batch, self.rows = self.rows[:n], self.rows[n:]
+        return batch
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+def test_identifiers_are_bracketed_and_escaped():
+    assert quote_ident("Guests") == "[Guests]"
+    assert quote_ident("odd]name") == "[odd]]name]"
+
+
+def test_frame_is_built_batch_by_batch():
+    cur = FakeCursor([(i, f"n{i}") for i in range(5)])
+    df = read_frame(cur, batch_size=2)
+    assert list(df["ID"]) == [0, 1, 2, 3, 4]
+    assert cur.fetches == 4
+
+
+def test_empty_result_keeps_its_columns():
+    assert list(read_frame(FakeCursor([])).columns) == ["ID", "Name"]
+
+
+@pytest.mark.parametrize("kwargs, fragment, params", [
+    ({}, "SELECT TOP (?) [ID], [Name] FROM [Guests] ORDER BY [ID]", (50,)),
+    ({"after": 120}, "WHERE [ID] > ? ORDER BY [ID]", (50, 120)),
+    ({"offset": 500}, "ORDER BY [ID] OFFSET ? ROWS FETCH NEXT ? ROWS ONLY", (500, 50)),
+])
+def test_next_pages_use_the_key_and_jumps_use_offset(kwargs, fragment, params):
+    cur = FakeCursor([])
+    fetch_page(FakeConnection(cur), "Guests", "ID", columns=["Name"], **kwargs)
+    sql, sent = cur.executed[0]
+    assert fragment in sql and sent == params